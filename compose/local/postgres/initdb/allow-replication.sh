@@ -0,0 +1,8 @@
+#!/bin/bash
+
+set -o errexit
+set -o nounset
+
+# Let the local replica (docker compose --profile replica) stream from this
+# server. Runs once, when the data volume is initialized.
+echo "host replication all all scram-sha-256" >> "${PGDATA}/pg_hba.conf"
@@ -1,13 +1,28 @@
 from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from la_mamadura.training.api.views import ExerciseSetViewSet
+from la_mamadura.training.api.views import ExerciseViewSet
+from la_mamadura.training.api.views import SyncView
+from la_mamadura.training.api.views import TrainingSessionTemplateViewSet
+from la_mamadura.training.api.views import TrainingSessionViewSet
+from la_mamadura.training.api.views import WeightViewSet
 from la_mamadura.users.api.views import UserViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("exercises", ExerciseViewSet)
+router.register("sessions", TrainingSessionViewSet)
+router.register("sets", ExerciseSetViewSet)
+router.register("templates", TrainingSessionTemplateViewSet)
+router.register("weights", WeightViewSet)
 
 
 app_name = "api"
-urlpatterns = router.urls
+urlpatterns = [
+    *router.urls,
+    path("sync/", SyncView.as_view(), name="sync"),
+]
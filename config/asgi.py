@@ -0,0 +1,28 @@
+# ruff: noqa
+"""
+ASGI config for La Mamadura project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Served by uvicorn, so long-lived responses like the server-sent events of
+la_mamadura/training/live.py don't hold a worker each.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# la_mamadura directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "la_mamadura"))
+
+# If DJANGO_SETTINGS_MODULE is unset, default to the local settings
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+application = get_asgi_application()
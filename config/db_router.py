@@ -0,0 +1,110 @@
+"""
+Routing of read-only requests to the PostgreSQL read replicas.
+
+Everything goes to ``default`` unless a view opts in with
+``ReplicaReadMixin``: its GET requests then read from one of
+``settings.DATABASE_REPLICAS``, picked once for the whole request, without
+opening a request transaction. A user
+who just wrote something keeps reading from the primary for
+``DATABASE_REPLICA_STICKY_SECONDS`` so they always see their own writes.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+from django.template.response import SimpleTemplateResponse
+from django.views import View
+
+PRIMARY_COOKIE_NAME = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica: ContextVar[str | None] = ContextVar("replica", default=None)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Read from one of the replicas, the same one for every query of the block
+    so they all see the same replication point.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    token = _replica.set(random.choice(replicas) if replicas else None)  # noqa: S311
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def is_pinned_to_primary(request):
+    try:
+        pinned_until = float(request.COOKIES.get(PRIMARY_COOKIE_NAME, 0))
+    except ValueError:
+        return False
+    return pinned_until > time.time()
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin the client to the primary for a while after any write request, so
+    the replica lag never hides a user's own changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and settings.DATABASE_REPLICAS:
+            sticky_seconds = settings.DATABASE_REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE_NAME,
+                str(time.time() + sticky_seconds),
+                max_age=sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ReplicaReadMixin(View):
+    """
+    Serve safe requests of an idempotent view from a read replica, without
+    the ATOMIC_REQUESTS transaction on the primary.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or is_pinned_to_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            # Lazy querysets are evaluated while rendering the template.
+            if (
+                isinstance(response, SimpleTemplateResponse)
+                and not response.is_rendered
+            ):
+                response.render()
+        return response
@@ -49,7 +49,7 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 # DATABASES = {"default": env.db("DATABASE_URL")}
-DATABASES = {
+DATABASES: dict[str, dict] = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": "postgres_db",
@@ -60,6 +60,21 @@ DATABASES = {
     },
 }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas of "default", one alias per host. Only views using
+# config.db_router.ReplicaReadMixin read from them.
+DATABASE_REPLICAS = []
+for number, host in enumerate(env.list("DATABASE_REPLICA_HOSTS", default=[]), 1):
+    alias = f"replica{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "ATOMIC_REQUESTS": False,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["config.db_router.PrimaryReplicaRouter"]
+# Seconds a client keeps reading from the primary after a write request.
+DATABASE_REPLICA_STICKY_SECONDS = env.int("DATABASE_REPLICA_STICKY_SECONDS", default=10)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -156,6 +171,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.db_router.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -371,3 +387,83 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Training
+# ------------------------------------------------------------------------------
+# Run ExerciseRecord as a PostgreSQL range-partitioned table, "month" or "year".
+# Empty keeps a plain table. See la_mamadura/training/partitions.py
+TRAINING_EXERCISE_RECORD_PARTITIONING = env(
+    "DJANGO_EXERCISE_RECORD_PARTITIONING",
+    default="",
+)
+# How many intervals ahead of today the partitions are pre-created.
+TRAINING_EXERCISE_RECORD_PARTITIONS_AHEAD = env.int(
+    "DJANGO_EXERCISE_RECORD_PARTITIONS_AHEAD",
+    default=3,
+)
+# Sets older than this many days are moved to the compressed archive, 0 disables
+# archival. See la_mamadura/training/archive.py
+TRAINING_ARCHIVE_AFTER_DAYS = env.int("DJANGO_TRAINING_ARCHIVE_AFTER_DAYS", default=730)
+# Users per chunk (and Celery task) of a training statistics recomputation.
+# See la_mamadura/training/statistics.py
+TRAINING_STATISTICS_CHUNK_SIZE = env.int(
+    "DJANGO_TRAINING_STATISTICS_CHUNK_SIZE",
+    default=100,
+)
+# Prefix of the Redis sorted sets holding the exercise leaderboards.
+# See la_mamadura/training/leaderboards.py
+TRAINING_LEADERBOARD_KEY_PREFIX = env(
+    "DJANGO_TRAINING_LEADERBOARD_KEY_PREFIX",
+    default="training:leaderboard",
+)
+# Delta sync re-sends the rows changed this many seconds before the client's
+# token, covering transactions that committed late. See
+# la_mamadura/training/sync.py
+TRAINING_SYNC_OVERLAP_SECONDS = env.int(
+    "DJANGO_TRAINING_SYNC_OVERLAP_SECONDS",
+    default=60,
+)
+# Tombstones and idempotency keys are kept this many days. Clients with older
+# tokens are told to download everything again.
+TRAINING_SYNC_RETENTION_DAYS = env.int(
+    "DJANGO_TRAINING_SYNC_RETENTION_DAYS",
+    default=90,
+)
+# Prefix of the Redis pub/sub channels of the live session updates, and the
+# seconds between keepalives of their idle streams.
+# See la_mamadura/training/live.py
+TRAINING_LIVE_CHANNEL_PREFIX = env(
+    "DJANGO_TRAINING_LIVE_CHANNEL_PREFIX",
+    default="training:live",
+)
+TRAINING_LIVE_KEEPALIVE_SECONDS = env.int(
+    "DJANGO_TRAINING_LIVE_KEEPALIVE_SECONDS",
+    default=15,
+)
+# Outbox events applied per transaction when draining the training outbox.
+# See la_mamadura/training/outbox.py
+TRAINING_OUTBOX_BATCH_SIZE = env.int(
+    "DJANGO_TRAINING_OUTBOX_BATCH_SIZE",
+    default=500,
+)
+# Prefix of the Redis keys debouncing the users' outbox drains and counting
+# them, and the seconds a user's writes are coalesced into one drain (0 leaves
+# the events to the periodic drain). See la_mamadura/training/outbox.py
+TRAINING_OUTBOX_KEY_PREFIX = env(
+    "DJANGO_TRAINING_OUTBOX_KEY_PREFIX",
+    default="training:outbox",
+)
+TRAINING_OUTBOX_DEBOUNCE_SECONDS = env.int(
+    "DJANGO_TRAINING_OUTBOX_DEBOUNCE_SECONDS",
+    default=30,
+)
+# Entries and seconds each process keeps the small, hot training data for, and
+# the Redis channel invalidating them. See la_mamadura/training/local_cache.py
+TRAINING_LOCAL_CACHE_SIZE = env.int("DJANGO_TRAINING_LOCAL_CACHE_SIZE", default=1024)
+TRAINING_LOCAL_CACHE_TIMEOUT = env.int(
+    "DJANGO_TRAINING_LOCAL_CACHE_TIMEOUT",
+    default=5 * 60,
+)
+TRAINING_LOCAL_CACHE_CHANNEL = env(
+    "DJANGO_TRAINING_LOCAL_CACHE_CHANNEL",
+    default="training:local-cache",
+)
@@ -15,7 +15,46 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Which container this process runs in: "web", "worker" or "beat". Each kind
+# gets its own connection pool sizing, see docker-compose.production.yml.
+DJANGO_PROCESS_TYPE = env("DJANGO_PROCESS_TYPE", default="web")
+# (min_size, max_size, timeout) of the psycopg pool of each process, per alias.
+# The web containers run gunicorn with uvicorn workers, where each concurrent
+# request runs its sync code in a thread of its own: size the pool for the
+# requests a worker serves at once (the live session streams give their
+# connection back before streaming), times WEB_CONCURRENCY workers within the
+# server's max_connections. Prefork Celery children run one task at a time, so
+# they rarely need more than one connection per alias. See
+# la_mamadura/training/management/commands/benchmark_db_connections.py --asgi
+DATABASE_POOL_DEFAULTS = {
+    "web": (2, 8, 10),
+    "worker": (1, 2, 30),
+    "beat": (1, 1, 30),
+}
+if env.bool("DJANGO_DATABASE_POOL", default=True):
+    pool_prefix = f"DJANGO_DATABASE_POOL_{DJANGO_PROCESS_TYPE.upper()}"
+    min_size, max_size, timeout = DATABASE_POOL_DEFAULTS[DJANGO_PROCESS_TYPE]
+    DATABASE_POOL_OPTIONS = {
+        "min_size": env.int(f"{pool_prefix}_MIN_SIZE", default=min_size),
+        "max_size": env.int(f"{pool_prefix}_MAX_SIZE", default=max_size),
+        # Seconds to wait for a free connection before failing the request.
+        "timeout": env.float(f"{pool_prefix}_TIMEOUT", default=timeout),
+        # Close connections idle for longer, and recycle every connection
+        # after max_lifetime so server-side memory does not pile up.
+        "max_idle": env.float("DJANGO_DATABASE_POOL_MAX_IDLE", default=300),
+        "max_lifetime": env.float("DJANGO_DATABASE_POOL_MAX_LIFETIME", default=3600),
+    }
+    for database in DATABASES.values():
+        # Pooled connections cannot be persistent; CONN_HEALTH_CHECKS makes the
+        # pool check each connection before handing it out.
+        database["CONN_MAX_AGE"] = 0
+        database["CONN_HEALTH_CHECKS"] = env.bool(
+            "DJANGO_DATABASE_POOL_HEALTH_CHECKS",
+            default=True,
+        )
+        database.setdefault("OPTIONS", {})["pool"] = {**DATABASE_POOL_OPTIONS}
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -3,6 +3,7 @@ With these settings, tests run faster.
 """
 
 from .base import *  # noqa: F403
+from .base import DATABASES
 from .base import TEMPLATES
 from .base import env
 
@@ -36,3 +37,14 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 MEDIA_URL = "http://media.testserver/"
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Replica aliases mirror "default" under test; keep the routing itself off so
+# tests do not have to declare every replica in their databases. The tests of
+# the routing turn it on with the alias of the replica compose profile.
+DATABASES["replica1"] = {
+    **DATABASES["default"],
+    "ATOMIC_REQUESTS": False,
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_REPLICAS = []
+# The tests drain the training outbox themselves, without enqueuing tasks.
+TRAINING_OUTBOX_DEBOUNCE_SECONDS = 0
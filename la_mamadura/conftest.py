@@ -1,5 +1,6 @@
 import pytest
 
+from la_mamadura.training.local_cache import local
 from la_mamadura.users.models import User
 from la_mamadura.users.tests.factories import UserFactory
 
@@ -9,6 +10,12 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _local_cache():
+    # The rows cached by a test are rolled back after it.
+    local.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
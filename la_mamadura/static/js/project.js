@@ -1 +1,41 @@
 /* Project specific Javascript goes here. */
+
+// Selects of tables too big to list (RemoteSearchSelect) render their
+// selected option only: a search box above them fetches the matching options
+// as the user types.
+document.addEventListener("DOMContentLoaded", () => {
+  for (const select of document.querySelectorAll("select[data-search-url]")) {
+    const search = document.createElement("input");
+    search.type = "search";
+    search.className = "form-control mb-1";
+    search.placeholder = "🔎";
+    select.before(search);
+
+    let timeout;
+    const fetchOptions = async () => {
+      const url = new URL(select.dataset.searchUrl, window.location.origin);
+      url.searchParams.set("q", search.value);
+      const response = await fetch(url);
+      if (!response.ok) {
+        return;
+      }
+      const {results} = await response.json();
+      const selected = select.selectedOptions[0];
+      for (const option of [...select.options]) {
+        if (option.value && option !== selected) {
+          option.remove();
+        }
+      }
+      for (const result of results) {
+        if (String(result.id) !== selected?.value) {
+          select.add(new Option(result.text, result.id));
+        }
+      }
+    };
+    search.addEventListener("input", () => {
+      clearTimeout(timeout);
+      timeout = setTimeout(fetchOptions, 250);
+    });
+    search.addEventListener("focus", fetchOptions, {once: true});
+  }
+});
@@ -1,42 +1,161 @@
 from django.contrib import admin
+from django.db.models import Count
+from django.db.models import Q
 
 from .models import Exercise
 from .models import ExerciseRecord
+from .models import ExerciseStatistics
+from .models import ExerciseTemplate
 from .models import Muscle
 from .models import MuscularGroup
+from .models import StatisticsRecomputation
 from .models import SubMuscle
-from .models import TrainingSessionTemplate
+from .models import Team
+from .models import TemplateAssignment
 from .models import TrainingSessionRecord
-from .models import ExerciseTemplate
+from .models import TrainingSessionTemplate
+from .models import Weight
+from .paginators import EstimatedCountPaginator
+from .tasks import resume_statistics_recomputation
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for the per-user tables that grow without bound:
+    planner-estimated pagination, no full-table count, date ranges instead
+    of a date hierarchy scanning the table for its years and months, and
+    autocomplete widgets instead of selects rendering every related row.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_filter = [("date", admin.DateFieldListFilter)]
+    ordering = ["-date", "-id"]
+    list_per_page = 50
 
 
 @admin.register(SubMuscle)
-class SubMuscleAdmin(admin.ModelAdmin): ...
+class SubMuscleAdmin(admin.ModelAdmin):
+    search_fields = ["name"]
 
 
 @admin.register(Muscle)
-class MuscleAdmin(admin.ModelAdmin): ...
+class MuscleAdmin(admin.ModelAdmin):
+    search_fields = ["name"]
+    autocomplete_fields = ["submuscles"]
 
 
 @admin.register(MuscularGroup)
-class MuscularGroupAdmin(admin.ModelAdmin): ...
+class MuscularGroupAdmin(admin.ModelAdmin):
+    search_fields = ["name"]
+    autocomplete_fields = ["muscles"]
 
 
 @admin.register(Exercise)
-class ExerciseAdmin(admin.ModelAdmin): ...
+class ExerciseAdmin(admin.ModelAdmin):
+    list_display = ["name", "load_units"]
+    list_filter = ["load_units"]
+    search_fields = ["name"]
+    autocomplete_fields = ["submuscles", "muscles", "muscular_group"]
 
 
 @admin.register(TrainingSessionTemplate)
-class TrainingSessionAdmin(admin.ModelAdmin): ...
+class TrainingSessionAdmin(admin.ModelAdmin):
+    list_display = ["name", "user"]
+    list_select_related = ["user"]
+    search_fields = ["name"]
+    autocomplete_fields = ["user"]
 
 
 @admin.register(TrainingSessionRecord)
-class TrainingSessionRecordAdmin(admin.ModelAdmin): ...
+class TrainingSessionRecordAdmin(LargeTableAdmin):
+    list_display = ["id", "user", "date"]
+    list_select_related = ["user"]
+    search_fields = ["=user__email"]
+    autocomplete_fields = ["user"]
 
 
 @admin.register(ExerciseRecord)
-class ExerciseRecordAdmin(admin.ModelAdmin): ...
+class ExerciseRecordAdmin(LargeTableAdmin):
+    list_display = ["id", "exercise", "user", "date", "load", "repetitions"]
+    list_select_related = ["exercise", "user"]
+    list_filter = [*LargeTableAdmin.list_filter, "exercise"]
+    search_fields = ["=user__email"]
+    autocomplete_fields = ["user", "exercise", "training_session"]
 
 
 @admin.register(ExerciseTemplate)
-class ExerciseTemplateAdmin(admin.ModelAdmin): ...
+class ExerciseTemplateAdmin(admin.ModelAdmin):
+    list_display = ["template", "exercise", "sets"]
+    list_select_related = ["template", "exercise"]
+    search_fields = ["template__name", "exercise__name"]
+    autocomplete_fields = ["template", "exercise"]
+
+
+@admin.register(Weight)
+class WeightAdmin(LargeTableAdmin):
+    list_display = ["id", "user", "date", "weight"]
+    list_select_related = ["user"]
+    search_fields = ["=user__email"]
+    autocomplete_fields = ["user"]
+
+
+@admin.register(ExerciseStatistics)
+class ExerciseStatisticsAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_display = [
+        "user",
+        "exercise",
+        "best_load",
+        "best_estimated_1rm",
+        "set_count",
+        "last_date",
+    ]
+    list_select_related = ["user", "exercise"]
+    search_fields = ["=user__email", "exercise__name"]
+    autocomplete_fields = ["user", "exercise"]
+
+
+@admin.register(StatisticsRecomputation)
+class StatisticsRecomputationAdmin(admin.ModelAdmin):
+    list_display = ["started_at", "status", "progress", "finished_at"]
+    list_filter = ["status"]
+    readonly_fields = ["status", "chunk_size", "started_at", "finished_at"]
+    actions = ["resume"]
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                n_chunks=Count("chunks"),
+                n_done=Count("chunks", filter=Q(chunks__done=True)),
+            )
+        )
+
+    @admin.display(description="Progress")
+    def progress(self, obj):
+        return f"{obj.n_done}/{obj.n_chunks} chunks"
+
+    @admin.action(description="Resume the pending chunks")
+    def resume(self, request, queryset):
+        for recomputation in queryset.filter(
+            status=StatisticsRecomputation.STATUS_RUNNING,
+        ):
+            resume_statistics_recomputation.delay(recomputation.pk)
+
+
+class TemplateAssignmentInline(admin.TabularInline):
+    model = TemplateAssignment
+    autocomplete_fields = ["template"]
+    extra = 0
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ["name", "coach"]
+    list_select_related = ["coach"]
+    search_fields = ["name"]
+    autocomplete_fields = ["coach", "athletes"]
+    inlines = [TemplateAssignmentInline]
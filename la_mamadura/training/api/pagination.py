@@ -0,0 +1,111 @@
+import json
+
+from django.db.models import F
+from django.db.models.fields.tuple_lookups import Tuple
+from django.db.models.fields.tuple_lookups import TupleGreaterThan
+from django.db.models.fields.tuple_lookups import TupleLessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on the whole ``ordering`` key, compared as a row, e.g.
+    ``WHERE (date, id) < (%s, %s)``: pages are index range scans, with no
+    OFFSET on ties as DRF's cursor, which only keys on ``ordering[0]``.
+    The ordering is fixed and all of its fields go the same way.
+    """
+
+    def _get_position_from_instance(self, instance, ordering):
+        return json.dumps(
+            [
+                instance._meta.get_field(field.lstrip("-")).value_to_string(instance)  # noqa: SLF001
+                for field in ordering
+            ],
+        )
+
+    def _key(self, queryset, position):
+        names = [field.lstrip("-") for field in self.ordering]
+        try:
+            values = json.loads(position)
+            return [
+                queryset.model._meta.get_field(name).to_python(value)  # noqa: SLF001
+                for name, value in zip(names, values, strict=True)
+            ]
+        except (TypeError, ValueError) as error:
+            raise NotFound(self.invalid_cursor_message) from error
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None
+        if self.cursor is not None and self.cursor.position is not None:
+            position = str(self.cursor.position)
+
+        descending = self.ordering[0].startswith("-")
+        if reverse:
+            queryset = queryset.order_by(
+                *(field[1:] if descending else f"-{field}" for field in self.ordering),
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            lookup = TupleLessThan if reverse != descending else TupleGreaterThan
+            queryset = queryset.filter(
+                lookup(
+                    Tuple(*(F(field.lstrip("-")) for field in self.ordering)),
+                    self._key(queryset, position),
+                ),
+            )
+
+        # One more row tells whether there is a page after this one.
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1],
+                self.ordering,
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = following_position is not None
+            self.next_position = position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = position is not None
+            self.next_position = following_position
+            self.previous_position = position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class DateCursorPagination(KeysetCursorPagination):
+    """
+    Newest first, paginated on ``(date, id)`` so pages are index range scans
+    that stay stable while the user keeps logging.
+    """
+
+    ordering = ("-date", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class NameCursorPagination(KeysetCursorPagination):
+    ordering = ("name", "id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
@@ -0,0 +1,59 @@
+"""
+Compact formats for history-shaped responses, picked with the ``Accept``
+header or ``?format=``:
+
+* ``columnar``: JSON with each list of rows turned into one array per field,
+  so the field names aren't repeated on every row.
+* ``msgpack``: MessagePack, binary and cheaper to encode and parse.
+"""
+
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def to_columns(data):
+    """
+    Turn every list of rows in ``data`` into a dict of field -> values.
+    Empty lists have no fields and stay lists.
+    """
+    if isinstance(data, dict):
+        return {key: to_columns(value) for key, value in data.items()}
+    if isinstance(data, list) and data and all(isinstance(row, dict) for row in data):
+        fields = dict.fromkeys(field for row in data for field in row)
+        return {field: [row.get(field) for row in data] for field in fields}
+    return data
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = "application/vnd.lamamadura.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columns(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as exc:
+            msg = f"MessagePack parse error - {exc}"
+            raise ParseError(msg) from exc
@@ -0,0 +1,233 @@
+from functools import cached_property
+
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from la_mamadura.training.archive import archived_session_sets
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseTemplate
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.models import TrainingSessionTemplate
+from la_mamadura.training.models import Weight
+
+
+class SparseFieldsMixin(serializers.Serializer):
+    """
+    Lets reads ask for some fields only, e.g. ``?fields=date,load,repetitions``.
+    Unknown names are ignored, and nested serializers render in full.
+    """
+
+    @cached_property
+    def requested_fields(self):
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        fields = request.query_params.get("fields")
+        if parent is not None or not fields:
+            return None
+        return {name.strip() for name in fields.split(",")}
+
+    @property
+    def _readable_fields(self):
+        requested = self.requested_fields
+        for field in super()._readable_fields:
+            if requested is None or field.field_name in requested:
+                yield field
+
+
+class ExerciseSerializer(serializers.ModelSerializer[Exercise]):
+    class Meta:
+        model = Exercise
+        fields = [
+            "id",
+            "name",
+            "load_units",
+            "description",
+            "muscular_group",
+            "muscles",
+            "submuscles",
+            "image_url",
+        ]
+
+
+class ExerciseSetSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer[ExerciseRecord],
+):
+    exercise_name = serializers.CharField(source="exercise.name", read_only=True)
+    # Archived sets are read-only, see ``la_mamadura.training.archive``.
+    archived = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = ExerciseRecord
+        fields = [
+            "id",
+            "training_session",
+            "exercise",
+            "exercise_name",
+            "date",
+            "load",
+            "repetitions",
+            "notes",
+            "updated_at",
+            "archived",
+        ]
+        # A set is dated by its session.
+        read_only_fields = ["date"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        field = self.fields.get("training_session")
+        if request is not None and isinstance(field, serializers.RelatedField):
+            field.queryset = TrainingSessionRecord.objects.filter(
+                user_id=request.user.pk,
+            )
+
+
+class TrainingSessionSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer[TrainingSessionRecord],
+):
+    class Meta:
+        model = TrainingSessionRecord
+        fields = [
+            "id",
+            "date",
+            "status",
+            "set_count",
+            "completed_set_count",
+            "exercise_count",
+            "total_volume",
+            "version",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "status",
+            "set_count",
+            "completed_set_count",
+            "exercise_count",
+            "total_volume",
+            "version",
+        ]
+
+
+class TrainingSessionDetailSerializer(TrainingSessionSerializer):
+    sets = serializers.SerializerMethodField()
+
+    class Meta(TrainingSessionSerializer.Meta):
+        fields = [*TrainingSessionSerializer.Meta.fields, "sets"]
+
+    @extend_schema_field(ExerciseSetSerializer(many=True))
+    def get_sets(self, session):
+        # The hot sets are prefetched, the archived ones are not in the table.
+        records = sorted(
+            [*session.exercise_record.all(), *archived_session_sets(session)],
+            key=lambda record: (record.exercise.name, record.pk),
+        )
+        return ExerciseSetSerializer(records, many=True, context=self.context).data
+
+
+class BatchSetSerializer(serializers.ModelSerializer[ExerciseRecord]):
+    id = serializers.IntegerField(required=False)
+    # Checked for the whole batch at once by ExerciseSetBatchSerializer.
+    exercise = serializers.IntegerField(source="exercise_id")
+
+    class Meta:
+        model = ExerciseRecord
+        fields = ["id", "exercise", "load", "repetitions", "notes"]
+
+
+class ExerciseSetBatchSerializer(serializers.Serializer):
+    """
+    A session's sets to create (without ``id``) or update (with the ``id``
+    of one of the session's sets).
+    """
+
+    sets = BatchSetSerializer(many=True, allow_empty=False)
+
+    def validate_sets(self, sets):
+        session = self.context["session"]
+        ids = [data["id"] for data in sets if "id" in data]
+        if len(ids) != len(set(ids)):
+            msg = "A set can only be updated once per batch."
+            raise serializers.ValidationError(msg)
+        existing = set(
+            session.exercise_record.filter(pk__in=ids)
+            .order_by()
+            .values_list("pk", flat=True),
+        )
+        if unknown := sorted(set(ids) - existing):
+            msg = f"Sets {unknown} are not in this session."
+            raise serializers.ValidationError(msg)
+
+        exercise_ids = {data["exercise_id"] for data in sets}
+        found = set(
+            Exercise.objects.filter(pk__in=exercise_ids).values_list("pk", flat=True),
+        )
+        if unknown := sorted(exercise_ids - found):
+            msg = f"Exercises {unknown} do not exist."
+            raise serializers.ValidationError(msg)
+        return sets
+
+
+class ExerciseTemplateSerializer(serializers.ModelSerializer[ExerciseTemplate]):
+    exercise_name = serializers.CharField(source="exercise.name", read_only=True)
+
+    class Meta:
+        model = ExerciseTemplate
+        fields = ["id", "exercise", "exercise_name", "sets"]
+
+
+class TrainingSessionTemplateSerializer(
+    serializers.ModelSerializer[TrainingSessionTemplate],
+):
+    exercises = ExerciseTemplateSerializer(
+        source="exercise_template",
+        many=True,
+        read_only=True,
+    )
+
+    class Meta:
+        model = TrainingSessionTemplate
+        fields = ["id", "name", "notes", "user", "exercises", "updated_at"]
+
+
+class WeightSerializer(SparseFieldsMixin, serializers.ModelSerializer[Weight]):
+    class Meta:
+        model = Weight
+        fields = ["id", "date", "weight", "updated_at"]
+
+
+class SyncOperationSerializer(serializers.Serializer):
+    """
+    An offline write. Sets of a session created in the same or an earlier
+    upload refer to it with ``training_session_key``, the key of its create
+    operation, instead of ``training_session``.
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+    key = serializers.CharField(max_length=64)
+    entity = serializers.ChoiceField(choices=["sessions", "sets", "weights"])
+    action = serializers.ChoiceField(choices=[CREATE, UPDATE, DELETE])
+    id = serializers.IntegerField(required=False)
+    # DRF moves declared fields off the class: this does not shadow .data.
+    data = serializers.DictField(required=False, default=dict)  # type: ignore[assignment]
+
+    def validate(self, attrs):
+        if attrs["action"] != self.CREATE and "id" not in attrs:
+            msg = "Updates and deletes need the id of the row."
+            raise serializers.ValidationError(msg)
+        return attrs
+
+
+class SyncUploadSerializer(serializers.Serializer):
+    operations = SyncOperationSerializer(many=True, allow_empty=False)
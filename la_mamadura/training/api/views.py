@@ -0,0 +1,389 @@
+from django.db.models import Prefetch
+from django.db.models import Q
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from drf_spectacular.utils import inline_serializer
+from rest_framework import serializers
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from la_mamadura.training.archive import archived_session_sets
+from la_mamadura.training.batch import save_session_sets
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseTemplate
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.models import TrainingSessionTemplate
+from la_mamadura.training.models import Weight
+from la_mamadura.training.sync import InvalidSyncTokenError
+from la_mamadura.training.sync import applied_result
+from la_mamadura.training.sync import changes_window
+from la_mamadura.training.sync import deleted_since
+from la_mamadura.training.sync import make_token
+from la_mamadura.training.sync import run_once
+
+from .pagination import DateCursorPagination
+from .pagination import NameCursorPagination
+from .renderers import ColumnarJSONRenderer
+from .renderers import MessagePackParser
+from .renderers import MessagePackRenderer
+from .serializers import ExerciseSerializer
+from .serializers import ExerciseSetBatchSerializer
+from .serializers import ExerciseSetSerializer
+from .serializers import SyncOperationSerializer
+from .serializers import SyncUploadSerializer
+from .serializers import TrainingSessionDetailSerializer
+from .serializers import TrainingSessionSerializer
+from .serializers import TrainingSessionTemplateSerializer
+from .serializers import WeightSerializer
+
+FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    str,
+    description="Comma separated fields to return, e.g. date,load,repetitions.",
+)
+
+
+class HistoryFormatsMixin(APIView):
+    """
+    Training data endpoints, which can also answer in columnar JSON or
+    MessagePack and take MessagePack uploads, see ``renderers``.
+    """
+
+    renderer_classes = [
+        *APIView.renderer_classes,
+        ColumnarJSONRenderer,
+        MessagePackRenderer,
+    ]
+    parser_classes = [*APIView.parser_classes, MessagePackParser]
+
+
+class ExerciseViewSet(ReadOnlyModelViewSet):
+    serializer_class = ExerciseSerializer
+    queryset = Exercise.objects.prefetch_related(
+        "muscular_group",
+        "muscles",
+        "submuscles",
+    )
+    pagination_class = NameCursorPagination
+
+
+class TrainingSessionTemplateViewSet(ReadOnlyModelViewSet):
+    serializer_class = TrainingSessionTemplateSerializer
+    queryset = TrainingSessionTemplate.objects.prefetch_related(
+        Prefetch(
+            "exercise_template",
+            queryset=ExerciseTemplate.objects.select_related("exercise").order_by(
+                "id",
+            ),
+        ),
+    )
+    pagination_class = NameCursorPagination
+
+    def get_queryset(self):
+        # Shared templates and the user's own.
+        return self.queryset.filter(Q(user__isnull=True) | Q(user=self.request.user))
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter("training_session", int),
+            OpenApiParameter("exercise", int),
+            FIELDS_PARAMETER,
+        ],
+    ),
+)
+class ExerciseSetViewSet(HistoryFormatsMixin, ModelViewSet):
+    serializer_class = ExerciseSetSerializer
+    queryset = ExerciseRecord.objects.select_related("exercise")
+    pagination_class = DateCursorPagination
+
+    def get_queryset(self):
+        assert self.request.user.is_authenticated  # type guard
+        queryset = self.queryset.filter(user=self.request.user)
+        for param in ("training_session", "exercise"):
+            value = self.request.query_params.get(param)
+            if value and value.isdigit():
+                queryset = queryset.filter(**{f"{param}_id": value})
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        # The sets of an archived session are not all in the table: list
+        # them whole, the archived ones included.
+        session_id = request.query_params.get("training_session")
+        session = None
+        if session_id and session_id.isdigit():
+            session = TrainingSessionRecord.objects.filter(
+                pk=session_id,
+                user=request.user,
+            ).first()
+        if session is None:
+            return super().list(request, *args, **kwargs)
+        exercise_id = request.query_params.get("exercise")
+        archived = archived_session_sets(
+            session,
+            int(exercise_id) if exercise_id and exercise_id.isdigit() else None,
+        )
+        if not archived:
+            return super().list(request, *args, **kwargs)
+        records = sorted(
+            [*self.get_queryset(), *archived],
+            key=lambda record: (record.date, record.pk),
+            reverse=True,
+        )
+        return Response(
+            {
+                "next": None,
+                "previous": None,
+                "results": self.get_serializer(records, many=True).data,
+            },
+        )
+
+    def perform_create(self, serializer):
+        session = serializer.validated_data["training_session"]
+        serializer.save(user=self.request.user, date=session.date)
+
+    def perform_update(self, serializer):
+        session = serializer.validated_data.get(
+            "training_session",
+            serializer.instance.training_session,
+        )
+        serializer.save(date=session.date)
+
+
+@extend_schema_view(list=extend_schema(parameters=[FIELDS_PARAMETER]))
+class TrainingSessionViewSet(HistoryFormatsMixin, ModelViewSet):
+    queryset = TrainingSessionRecord.objects.all()
+    pagination_class = DateCursorPagination
+
+    def get_queryset(self):
+        assert self.request.user.is_authenticated  # type guard
+        queryset = self.queryset.filter(user=self.request.user)
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "exercise_record",
+                    queryset=ExerciseRecord.objects.select_related(
+                        "exercise",
+                    ).order_by("exercise__name", "id"),
+                ),
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return TrainingSessionDetailSerializer
+        return TrainingSessionSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @extend_schema(
+        request=ExerciseSetBatchSerializer,
+        responses={status.HTTP_200_OK: ExerciseSetSerializer(many=True)},
+        description=(
+            "Create (without id) or update (with id) many sets of the session "
+            "in one transaction."
+        ),
+    )
+    @action(detail=True, methods=["post"], url_path="sets/batch")
+    def batch_sets(self, request, pk=None):
+        session = self.get_object()
+        serializer = ExerciseSetBatchSerializer(
+            data=request.data,
+            context={**self.get_serializer_context(), "session": session},
+        )
+        serializer.is_valid(raise_exception=True)
+        saved = save_session_sets(session, serializer.validated_data["sets"])
+        records = ExerciseRecord.objects.select_related("exercise").in_bulk(
+            [record.pk for record in saved],
+        )
+        return Response(
+            ExerciseSetSerializer(
+                [records[record.pk] for record in saved],
+                many=True,
+                context=self.get_serializer_context(),
+            ).data,
+        )
+
+
+@extend_schema_view(list=extend_schema(parameters=[FIELDS_PARAMETER]))
+class WeightViewSet(HistoryFormatsMixin, ModelViewSet):
+    serializer_class = WeightSerializer
+    queryset = Weight.objects.all()
+    pagination_class = DateCursorPagination
+
+    def get_queryset(self):
+        assert self.request.user.is_authenticated  # type guard
+        return self.queryset.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+SYNC_ENTITIES = {
+    "sessions": (TrainingSessionRecord, TrainingSessionSerializer),
+    "sets": (ExerciseRecord, ExerciseSetSerializer),
+    "weights": (Weight, WeightSerializer),
+    "templates": (TrainingSessionTemplate, TrainingSessionTemplateSerializer),
+}
+
+
+class SyncView(HistoryFormatsMixin, APIView):
+    """
+    Delta sync for offline clients, see ``la_mamadura.training.sync``.
+    """
+
+    def get_changed_querysets(self, since):
+        user = self.request.user
+        assert user.is_authenticated  # type guard
+        querysets = {
+            "sessions": TrainingSessionRecord.objects.filter(user=user),
+            "sets": ExerciseRecord.objects.filter(user=user).select_related(
+                "exercise",
+            ),
+            "weights": Weight.objects.filter(user=user),
+            "templates": TrainingSessionTemplateViewSet.queryset.filter(
+                Q(user__isnull=True) | Q(user=user),
+            ),
+        }
+        for name, queryset in querysets.items():
+            if since is not None:
+                queryset = queryset.filter(updated_at__gt=since)  # noqa: PLW2901
+            querysets[name] = queryset.order_by("updated_at", "id")
+        return querysets
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("token", str, description="Last sync token."),
+            FIELDS_PARAMETER,
+        ],
+        responses=inline_serializer(
+            "SyncChanges",
+            {
+                "token": serializers.CharField(),
+                "reset": serializers.BooleanField(),
+                "changed": serializers.DictField(),
+                "deleted": serializers.DictField(
+                    child=serializers.ListField(child=serializers.IntegerField()),
+                ),
+            },
+        ),
+        description=(
+            "The rows changed and deleted since the token, everything without "
+            "one. With reset, drop the local copy before applying the changes."
+        ),
+    )
+    def get(self, request):
+        try:
+            since, reset = changes_window(request.query_params.get("token"))
+        except InvalidSyncTokenError as error:
+            raise ValidationError({"token": [str(error)]}) from error
+        # Issued before reading, so concurrent writes are sent next time.
+        token = make_token()
+        context = {"request": request}
+        changed = {
+            name: SYNC_ENTITIES[name][1](queryset, many=True, context=context).data
+            for name, queryset in self.get_changed_querysets(since).items()
+        }
+        deleted = {}
+        if since is not None:
+            deleted_ids = deleted_since(request.user, since)
+            for name, (model, _serializer) in SYNC_ENTITIES.items():
+                ids = deleted_ids.get(model._meta.label_lower)  # noqa: SLF001
+                if ids:
+                    deleted[name] = ids
+        return Response(
+            {"token": token, "reset": reset, "changed": changed, "deleted": deleted},
+        )
+
+    @extend_schema(
+        request=SyncUploadSerializer,
+        responses=inline_serializer(
+            "SyncResults",
+            {
+                "results": serializers.ListField(
+                    child=inline_serializer(
+                        "SyncResult",
+                        {
+                            "key": serializers.CharField(),
+                            "status": serializers.ChoiceField(
+                                ["applied", "duplicate", "invalid", "not_found"],
+                            ),
+                            "id": serializers.IntegerField(required=False),
+                            "errors": serializers.DictField(required=False),
+                        },
+                    ),
+                ),
+            },
+        ),
+        description=(
+            "Apply offline writes in order. Each one runs once per idempotency "
+            "key, retried uploads get the first result back as duplicate."
+        ),
+    )
+    def post(self, request):
+        upload = SyncUploadSerializer(data=request.data)
+        upload.is_valid(raise_exception=True)
+        results = []
+        for operation in upload.validated_data["operations"]:
+            result, duplicate = run_once(
+                request.user,
+                operation["key"],
+                lambda operation=operation: self.apply(operation),
+            )
+            if duplicate:
+                result = {**result, "status": "duplicate"}
+            results.append({"key": operation["key"], **result})
+        return Response({"results": results})
+
+    def apply(self, operation):
+        user = self.request.user
+        model, serializer_class = SYNC_ENTITIES[operation["entity"]]
+        data = dict(operation["data"])
+        if "training_session_key" in data:
+            created = applied_result(user, data.pop("training_session_key"))
+            if created is None:
+                return {
+                    "status": "invalid",
+                    "errors": {"training_session_key": ["Unknown key."]},
+                }
+            data["training_session"] = created["id"]
+
+        instance = None
+        if operation["action"] != SyncOperationSerializer.CREATE:
+            manager = model._default_manager  # noqa: SLF001
+            instance = manager.filter(user=user, pk=operation["id"]).first()
+            if instance is None:
+                if operation["action"] == SyncOperationSerializer.DELETE:
+                    # Already gone, which is what the client wanted.
+                    return {"status": "applied", "id": operation["id"]}
+                return {"status": "not_found", "errors": {"id": ["Not found."]}}
+            if operation["action"] == SyncOperationSerializer.DELETE:
+                instance.delete()
+                return {"status": "applied", "id": operation["id"]}
+
+        serializer = serializer_class(
+            instance,
+            data=data,
+            partial=instance is not None,
+            context={"request": self.request},
+        )
+        if not serializer.is_valid():
+            return {"status": "invalid", "errors": serializer.errors}
+        extra = {} if instance else {"user": user}
+        if model is ExerciseRecord:
+            session = serializer.validated_data.get(
+                "training_session",
+                getattr(instance, "training_session", None),
+            )
+            extra["date"] = session.date
+        saved = serializer.save(**extra)
+        return {"status": "applied", "id": saved.pk}
@@ -0,0 +1,393 @@
+"""
+Cold-storage archival of old ``ExerciseRecord`` rows.
+
+Sets older than ``TRAINING_ARCHIVE_AFTER_DAYS`` are moved out of the hot
+table into ``ExerciseRecordArchive``: one zlib-compressed columnar blob per
+user, exercise and year. The hot table and its indexes only hold recent
+history, while ``exercise_history`` and ``session_sets`` merge both stores so
+long-range charts and old sessions keep working. Archived sets are read-only:
+they follow their session when it moves to another day, and go away with it.
+"""
+
+import datetime
+import json
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseRecordArchive
+from la_mamadura.training.models import TrainingSessionRecord
+
+FORMAT_VERSION = 1
+COLUMNS = ("id", "date", "load", "repetitions", "training_session_id", "notes")
+
+_archiving = ContextVar("archiving", default=False)
+
+
+@contextmanager
+def archiving():
+    """
+    Mark the sets deleted in the block as moved to the archive rather than
+    deleted by the user: the data derived from them (session summaries,
+    caches, outbox events, sync tombstones, live updates) stays untouched.
+    """
+    token = _archiving.set(True)
+    try:
+        yield
+    finally:
+        _archiving.reset(token)
+
+
+def is_archiving():
+    return _archiving.get()
+
+
+class HistoryEntry(NamedTuple):
+    id: int
+    date: datetime.date
+    load: float
+    repetitions: int
+    training_session_id: int
+    notes: str | None
+    archived: bool
+
+
+def pack_entries(entries):
+    """
+    Serialize entries as one JSON array per column, compressed.
+    """
+    columns: dict[str, list] = {column: [] for column in COLUMNS}
+    for entry in entries:
+        for column in COLUMNS:
+            columns[column].append(getattr(entry, column))
+    columns["date"] = [day.toordinal() for day in columns["date"]]
+    payload = {"v": FORMAT_VERSION, **columns}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 9)
+
+
+def unpack_entries(data):
+    payload = json.loads(zlib.decompress(bytes(data)))
+    dates = [datetime.date.fromordinal(day) for day in payload["date"]]
+    return [
+        HistoryEntry(
+            id=pk,
+            date=day,
+            load=load,
+            repetitions=repetitions,
+            training_session_id=session_id,
+            notes=notes,
+            archived=True,
+        )
+        for pk, day, load, repetitions, session_id, notes in zip(
+            payload["id"],
+            dates,
+            payload["load"],
+            payload["repetitions"],
+            payload["training_session_id"],
+            payload["notes"],
+            strict=True,
+        )
+    ]
+
+
+def archive_horizon():
+    """
+    Sets dated before this day are archived, None if archival is disabled.
+    """
+    days = settings.TRAINING_ARCHIVE_AFTER_DAYS
+    if not days:
+        return None
+    return timezone.localdate() - datetime.timedelta(days=days)
+
+
+def may_have_archived_sets(day):
+    """
+    Whether a session dated ``day`` may have archived sets: they are all
+    dated before the horizon, see ``move_archived_session``.
+    """
+    horizon = archive_horizon()
+    if horizon is None:
+        # Archival may have been enabled before.
+        return True
+    return TrainingSessionRecord._meta.get_field("date").to_python(day) < horizon  # noqa: SLF001
+
+
+def _hot_entry(values):
+    return HistoryEntry(**values, archived=False)
+
+
+def _save_archive(archive, entries):
+    """
+    Repack ``archive`` with ``entries``, deleting it once empty.
+    """
+    if not entries:
+        archive.delete()
+        return
+    entries.sort(key=lambda entry: (entry.date, entry.id))
+    archive.data = pack_entries(entries)
+    archive.n_records = len(entries)
+    archive.first_date = entries[0].date
+    archive.last_date = entries[-1].date
+    archive.save()
+
+
+def _add_to_archives(user_id, groups):
+    """
+    Add ``(exercise_id, year) -> entries`` to the user's archives, replacing
+    the archived entries with the same ids.
+    """
+    if not groups:
+        return
+    archives = {
+        (archive.exercise_id, archive.year): archive
+        for archive in ExerciseRecordArchive.objects.filter(
+            user_id=user_id,
+            exercise_id__in={exercise_id for exercise_id, _ in groups},
+            year__in={year for _, year in groups},
+        ).select_for_update()
+    }
+    for (exercise_id, year), entries in groups.items():
+        archive = archives.get((exercise_id, year))
+        if archive is not None:
+            ids = {entry.id for entry in entries}
+            entries.extend(
+                entry
+                for entry in unpack_entries(archive.data)
+                if entry.id not in ids
+            )
+        else:
+            archive = ExerciseRecordArchive(
+                user_id=user_id,
+                exercise_id=exercise_id,
+                year=year,
+            )
+        _save_archive(archive, entries)
+
+
+def _day_archives(user_id, day):
+    # A session's sets are dated by it.
+    return ExerciseRecordArchive.objects.filter(
+        user_id=user_id,
+        first_date__lte=day,
+        last_date__gte=day,
+    )
+
+
+def move_archived_session(user_id, session_id, day, new_day=None):
+    """
+    Move the user's archived sets of the session dated ``day`` to
+    ``new_day``, back into the table if it is past the horizon, or delete
+    them without one. Returns the ids of their exercises.
+    """
+    if not may_have_archived_sets(day):
+        return set()
+    exercise_ids = set()
+    moved: defaultdict[tuple[int, int], list[HistoryEntry]] = defaultdict(list)
+    with transaction.atomic():
+        for archive in (
+            _day_archives(user_id, day).select_for_update().order_by("pk")
+        ):
+            entries = unpack_entries(archive.data)
+            kept = [
+                entry for entry in entries if entry.training_session_id != session_id
+            ]
+            if len(kept) == len(entries):
+                continue
+            exercise_ids.add(archive.exercise_id)
+            if new_day is not None:
+                moved[archive.exercise_id, new_day.year].extend(
+                    entry._replace(date=new_day)
+                    for entry in entries
+                    if entry.training_session_id == session_id
+                )
+            _save_archive(archive, kept)
+        if not moved:
+            return exercise_ids
+        if may_have_archived_sets(new_day):
+            _add_to_archives(user_id, moved)
+            return exercise_ids
+        ExerciseRecord.objects.bulk_create(
+            ExerciseRecord(
+                id=entry.id,
+                user_id=user_id,
+                exercise_id=exercise_id,
+                training_session_id=session_id,
+                date=entry.date,
+                load=entry.load,
+                repetitions=entry.repetitions,
+                notes=entry.notes,
+            )
+            for (exercise_id, _year), entries in moved.items()
+            for entry in entries
+        )
+        # The session's sets can be edited again.
+        TrainingSessionRecord.objects.filter(pk=session_id).update(
+            version=F("version") + 1,
+        )
+    return exercise_ids
+
+
+def archive_user_records(user_id, before):
+    """
+    Move the user's sets dated before ``before`` into the archive. Returns
+    the number of archived sets.
+    """
+    with transaction.atomic():
+        records = ExerciseRecord.objects.filter(
+            user_id=user_id,
+            date__lt=before,
+        ).select_for_update()
+        groups = defaultdict(list)
+        for values in records.order_by().values("exercise_id", *COLUMNS):
+            exercise_id = values.pop("exercise_id")
+            groups[exercise_id, values["date"].year].append(_hot_entry(values))
+        if not groups:
+            return 0
+        session_ids = {
+            entry.training_session_id
+            for entries in groups.values()
+            for entry in entries
+        }
+        _add_to_archives(user_id, groups)
+
+        # Archived sets still count towards their session's summary, but
+        # their renders lose the edit links.
+        with archiving():
+            n_archived, _ = records.delete()
+        TrainingSessionRecord.objects.filter(pk__in=session_ids).update(
+            version=F("version") + 1,
+        )
+    return n_archived
+
+
+def archive_exercise_records(before=None):
+    """
+    Archive every user's sets older than ``before`` (default: the configured
+    horizon), one transaction per user.
+    """
+    before = before or archive_horizon()
+    if before is None:
+        return 0
+    user_ids = (
+        ExerciseRecord.objects.filter(date__lt=before)
+        .order_by()
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    return sum(archive_user_records(user_id, before) for user_id in user_ids)
+
+
+def archived_session_entries(user_id, session_id, day, exercise_id=None):
+    """
+    ``(exercise_id, HistoryEntry)`` of the archived sets of the user's
+    session dated ``day`` (of ``exercise_id`` only, if given).
+    """
+    if not may_have_archived_sets(day):
+        return []
+    archives = _day_archives(user_id, day)
+    if exercise_id is not None:
+        archives = archives.filter(exercise_id=exercise_id)
+    return [
+        (archive_exercise_id, entry)
+        for archive_exercise_id, data in archives.values_list("exercise_id", "data")
+        for entry in unpack_entries(data)
+        if entry.training_session_id == session_id
+    ]
+
+
+def archived_session_sets(session, exercise_id=None):
+    """
+    The archived sets of ``session`` (of ``exercise_id`` only, if given), as
+    unsaved ``ExerciseRecord``s with their exercise and ``archived`` set.
+    """
+    entries = archived_session_entries(
+        session.user_id,
+        session.pk,
+        session.date,
+        exercise_id,
+    )
+    if not entries:
+        return []
+    exercises = Exercise.objects.in_bulk({pk for pk, _entry in entries})
+    records = []
+    for archive_exercise_id, entry in entries:
+        record = ExerciseRecord(
+            id=entry.id,
+            user_id=session.user_id,
+            exercise=exercises[archive_exercise_id],
+            training_session=session,
+            date=entry.date,
+            load=entry.load,
+            repetitions=entry.repetitions,
+            notes=entry.notes,
+        )
+        record.archived = True
+        records.append(record)
+    return records
+
+
+def session_sets(session, exercise_id=None):
+    """
+    The sets of ``session`` (of ``exercise_id`` only, if given), hot and
+    archived alike, as ``ExerciseRecord``s with their exercise, sorted by
+    date and id.
+    """
+    records = session.exercise_record.select_related("exercise")
+    if exercise_id is not None:
+        records = records.filter(exercise_id=exercise_id)
+    return sorted(
+        [*records.order_by(), *archived_session_sets(session, exercise_id)],
+        key=lambda record: (record.date, record.pk),
+    )
+
+
+def exercise_history(user, exercise_ids, start=None, end=None):
+    """
+    The user's sets of ``exercise_ids`` between ``start`` and ``end``
+    (inclusive, both optional), hot and archived alike. Returns a dict of
+    exercise id -> list of ``HistoryEntry`` sorted by date.
+    """
+    exercise_ids = list(exercise_ids)
+    history: dict[int, list[HistoryEntry]] = {
+        exercise_id: [] for exercise_id in exercise_ids
+    }
+
+    archives = ExerciseRecordArchive.objects.filter(
+        user=user,
+        exercise_id__in=exercise_ids,
+    )
+    if start is not None:
+        archives = archives.filter(last_date__gte=start)
+    if end is not None:
+        archives = archives.filter(first_date__lte=end)
+    for exercise_id, data in archives.order_by("year").values_list(
+        "exercise_id",
+        "data",
+    ):
+        history[exercise_id].extend(
+            entry
+            for entry in unpack_entries(data)
+            if (start is None or entry.date >= start)
+            and (end is None or entry.date <= end)
+        )
+
+    records = ExerciseRecord.objects.filter(user=user, exercise_id__in=exercise_ids)
+    if start is not None:
+        records = records.filter(date__gte=start)
+    if end is not None:
+        records = records.filter(date__lte=end)
+    for values in records.order_by("date", "id").values("exercise_id", *COLUMNS):
+        history[values.pop("exercise_id")].append(_hot_entry(values))
+
+    for entries in history.values():
+        entries.sort(key=lambda entry: (entry.date, entry.id))
+    return history
@@ -0,0 +1,68 @@
+"""
+Writing many sets of a session at once.
+
+Bulk operations skip the model signals, so ``save_session_sets`` does what
+they would have done once per batch instead of once per set: refresh the
+session summary (and with it the calendar), bump the user's training data
+version, record the outbox events of the sets and publish them to the
+session's live watchers.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from la_mamadura.training.cache import bump_user_training_version
+from la_mamadura.training.live import publish_sets
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.outbox import record_set_changes
+from la_mamadura.training.summaries import refresh_session_summaries
+
+SET_FIELDS = ("exercise_id", "load", "repetitions", "notes")
+
+
+def save_session_sets(session, sets):
+    """
+    Create the ``sets`` without an ``id`` and update the ones with the id of
+    one of the session's sets, in one transaction. ``sets`` are dicts of
+    ``SET_FIELDS`` (plus ``id``). Returns the saved sets in the same order.
+    """
+    with transaction.atomic():
+        existing = (
+            session.exercise_record.order_by()
+            .select_for_update()
+            .in_bulk([data["id"] for data in sets if data.get("id")])
+        )
+        exercise_ids = {record.exercise_id for record in existing.values()}
+        to_create = []
+        to_update = []
+        saved = []
+        for data in sets:
+            fields = {field: data[field] for field in SET_FIELDS if field in data}
+            if data.get("id"):
+                record = existing[data["id"]]
+                for field, value in fields.items():
+                    setattr(record, field, value)
+                to_update.append(record)
+                exercise_ids.add(record.exercise_id)
+            else:
+                record = ExerciseRecord(
+                    user_id=session.user_id,
+                    training_session=session,
+                    date=session.date,
+                    **fields,
+                )
+                to_create.append(record)
+            saved.append(record)
+
+        if to_update:
+            # bulk_update doesn't touch the auto_now fields.
+            updated_at = timezone.now()
+            for record in to_update:
+                record.updated_at = updated_at
+            ExerciseRecord.objects.bulk_update(to_update, [*SET_FIELDS, "updated_at"])
+        ExerciseRecord.objects.bulk_create(to_create)
+        refresh_session_summaries([session.pk])
+        bump_user_training_version(session.user_id)
+        record_set_changes(session.user_id, exercise_ids, created=to_create)
+        publish_sets(session.pk, saved)
+    return saved
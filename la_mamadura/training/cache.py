@@ -0,0 +1,166 @@
+"""
+Versioning of cached per-user training data.
+
+Cache keys derived from a user's sets embed ``user_training_version``, which
+is bumped whenever one of their sets or bodyweights changes (see
+``la_mamadura.training.signals``), so stale entries are never read again and
+simply expire.
+
+The expensive statistics are read through ``get_or_refresh`` instead, under a
+key that doesn't change with the data: the entry carries the version it was
+computed for, and outlives its timeout by a grace period. An outdated or
+expired entry is recomputed by the one request that takes its lock (an atomic
+``cache.add``, a ``SET NX`` on the Redis cache), while the others keep serving
+it. The lock holds a token of its own, and is released with an atomic
+compare-and-delete, so a computation outliving it doesn't release the lock
+another request took since. Entries are also recomputed
+early, with a probability growing as their expiry nears and with their
+computation time, so the popular ones rarely expire at all and never all at
+once.
+"""
+
+import contextlib
+import math
+import random
+import time
+import uuid
+
+import redis
+from django.core.cache import cache
+
+# Seconds a recomputation holds the lock at most.
+REFRESH_LOCK_TIMEOUT = 60
+# Seconds a request waits for another to compute a missing entry.
+REFRESH_WAIT = 2
+
+
+def _user_version_key(user_id):
+    return f"training:user-version:{user_id}"
+
+
+def cache_version(key):
+    """
+    The version counter stored under ``key``, for the keys of entries to
+    drop at once with ``bump_cache_version``.
+    """
+    version = cache.get(key)
+    if version is None:
+        # A fresh value, not 1, so an evicted version can't collide with keys
+        # cached under an older one.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def user_training_version(user_id):
+    return cache_version(_user_version_key(user_id))
+
+
+def user_training_versions(user_ids):
+    """
+    User id -> ``user_training_version`` of many users in one cache round
+    trip.
+    """
+    keys = {_user_version_key(user_id): user_id for user_id in user_ids}
+    versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+    for user_id in set(keys.values()) - versions.keys():
+        versions[user_id] = user_training_version(user_id)
+    return versions
+
+
+def bump_user_training_version(user_id):
+    bump_cache_version(_user_version_key(user_id))
+
+
+def _refresh_lock_key(key):
+    return f"{key}:refresh-lock"
+
+
+@contextlib.contextmanager
+def _refresh_lock(key):
+    """
+    Take the refresh lock of ``key`` for the block, yielding whether this
+    request holds it.
+    """
+    lock_key = _refresh_lock_key(key)
+    if hasattr(cache, "lock"):
+        # django-redis: redis-py's lock releases with a Lua script deleting
+        # the key only if it still holds the lock's token.
+        lock = cache.lock(lock_key, timeout=REFRESH_LOCK_TIMEOUT)
+        try:
+            taken = lock.acquire(blocking=False)
+        except redis.RedisError:
+            # As the cache, fail like a lock held by another request.
+            taken = False
+        try:
+            yield taken
+        finally:
+            if taken:
+                # Raises LockNotOwnedError once expired.
+                with contextlib.suppress(redis.RedisError):
+                    lock.release()
+        return
+
+    # The other backends are local to the process, see config.settings.
+    token = uuid.uuid4().hex
+    taken = cache.add(lock_key, token, REFRESH_LOCK_TIMEOUT)
+    try:
+        yield taken
+    finally:
+        if taken and cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def _expires_early(expires, delta, beta):
+    # Probabilistic early expiration (XFetch): the earlier the more
+    # expensive the computation. 1 - random() is in (0, 1].
+    return time.time() - delta * beta * math.log(1 - random.random()) >= expires  # noqa: S311
+
+
+def _wait_for_entry(key, version):
+    deadline = time.monotonic() + REFRESH_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None and entry[1] == version:
+            return entry
+    return None
+
+
+def get_or_refresh(key, compute, timeout, version=None, beta=1.0):
+    """
+    The value cached under ``key`` for ``version``, serving it stale while
+    one request refreshes it with ``compute``. Entries are fresh for
+    ``timeout`` seconds and can be served stale for as long again. Greater
+    ``beta`` recompute earlier.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, entry_version, expires, delta = entry
+        if entry_version == version and not _expires_early(expires, delta, beta):
+            return value
+    with _refresh_lock(key) as taken:
+        if not taken:
+            if entry is not None:
+                return value
+            # Nothing to serve: wait for the refresh, then compute it ourselves.
+            entry = _wait_for_entry(key, version)
+            if entry is not None:
+                return entry[0]
+            return compute()
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        cache.set(
+            key,
+            (value, version, time.time() + timeout, delta),
+            timeout * 2,
+        )
+    return value
@@ -0,0 +1,230 @@
+"""
+Per-user training calendar: training days, their volume and the streaks.
+
+``TrainingCalendar`` keeps a user's history as two day arrays starting at
+their first training day, one byte of session count and one float32 of volume
+per day, so a multi-year history is a few kilobytes. Session changes patch
+only the touched days (see ``la_mamadura.training.signals`` and
+``la_mamadura.training.summaries``) and recompute the streaks from the array,
+so reading a heatmap or a streak is one cached row instead of a scan over the
+sessions. Calendars are built on their first use.
+
+The cached calendar is keyed on a version bumped once a write commits, so a
+read racing the write can only fill an entry under the old version, which is
+never read again. Days more than ``MAX_YEARS`` before today, or a year after
+it, are left out: a mistyped year must not size the arrays.
+"""
+
+import datetime
+from array import array
+from dataclasses import dataclass
+from dataclasses import field
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Sum
+from django.utils import timezone
+
+from la_mamadura.training.cache import bump_cache_version
+from la_mamadura.training.cache import cache_version
+from la_mamadura.training.models import TrainingCalendar
+from la_mamadura.training.models import TrainingSessionRecord
+
+MAX_SESSIONS_PER_DAY = 255
+MAX_YEARS = 20
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Maps each session count byte to whether the user trained that day.
+_TRAINED = bytes([0] + [1] * 255)
+
+
+def _version_key(user_id):
+    return f"training:calendar-version:{user_id}"
+
+
+def _cache_key(user_id, version):
+    return f"training:calendar:{user_id}:{version}"
+
+
+def _day_range():
+    today = timezone.localdate()
+    return (
+        today - datetime.timedelta(days=366 * MAX_YEARS),
+        today + datetime.timedelta(days=366),
+    )
+
+
+@dataclass
+class Calendar:
+    first_day: datetime.date | None = None
+    sessions: bytes = b""
+    volumes: array = field(default_factory=lambda: array("f"))
+    longest_streak: int = 0
+    last_streak: int = 0
+
+    @property
+    def last_day(self):
+        if self.first_day is None:
+            return None
+        return self.first_day + datetime.timedelta(days=len(self.sessions) - 1)
+
+    def current_streak(self, today):
+        """
+        The streak still alive on ``today``: the last one, if it ended today
+        or yesterday.
+        """
+        if self.last_day is None or (today - self.last_day).days > 1:
+            return 0
+        return self.last_streak
+
+    def day(self, day):
+        """
+        ``(sessions, volume)`` of a day.
+        """
+        if self.first_day is None:
+            return 0, 0
+        index = (day - self.first_day).days
+        if not 0 <= index < len(self.sessions):
+            return 0, 0
+        return self.sessions[index], self.volumes[index]
+
+    def days(self, start, end):
+        """
+        ``(day, sessions, volume)`` for every day from ``start`` to ``end``.
+        """
+        day = start
+        while day <= end:
+            yield (day, *self.day(day))
+            day += datetime.timedelta(days=1)
+
+
+def _streaks(sessions):
+    """
+    Longest and last runs of consecutive training days.
+    """
+    runs = [len(run) for run in sessions.translate(_TRAINED).split(b"\x00")]
+    return max(runs, default=0), runs[-1] if runs else 0
+
+
+def _write(calendar, first_day, sessions, volumes):
+    # Keep the arrays between the first and last training days.
+    start = len(sessions) - len(sessions.lstrip(b"\x00"))
+    end = len(sessions.rstrip(b"\x00"))
+    sessions = bytes(sessions[start:end])
+    calendar.first_day = (
+        first_day + datetime.timedelta(days=start) if sessions else None
+    )
+    calendar.sessions = sessions
+    calendar.volumes = volumes[start:end].tobytes()
+    calendar.longest_streak, calendar.last_streak = _streaks(sessions)
+    calendar.save()
+    version_key = _version_key(calendar.user_id)
+    transaction.on_commit(lambda: bump_cache_version(version_key))
+
+
+def _day_totals(user_id, **filters):
+    return {
+        row["date"]: (min(row["n_sessions"], MAX_SESSIONS_PER_DAY), row["volume"])
+        for row in TrainingSessionRecord.objects.filter(
+            user_id=user_id,
+            date__range=_day_range(),
+            **filters,
+        )
+        .order_by()
+        .values("date")
+        .annotate(n_sessions=Count("id"), volume=Sum("total_volume"))
+    }
+
+
+def rebuild_calendar(user_id):
+    """
+    Build a user's calendar from all their sessions.
+    """
+    totals = _day_totals(user_id)
+    with transaction.atomic(savepoint=False):
+        calendar, _ = TrainingCalendar.objects.select_for_update().get_or_create(
+            user_id=user_id,
+        )
+        if not totals:
+            _write(calendar, None, bytearray(), array("f"))
+            return calendar
+        first_day = min(totals)
+        n_days = (max(totals) - first_day).days + 1
+        sessions = bytearray(n_days)
+        volumes = array("f", bytes(4 * n_days))
+        for day, (n_sessions, volume) in totals.items():
+            index = (day - first_day).days
+            sessions[index] = n_sessions
+            volumes[index] = volume or 0
+        _write(calendar, first_day, sessions, volumes)
+    return calendar
+
+
+def refresh_calendar_days(user_id, days):
+    """
+    Recompute the given days of a user's calendar from their sessions.
+    """
+    # Unsaved defaults are datetimes, stored as the date they fall on.
+    date_field = TrainingSessionRecord._meta.get_field("date")  # noqa: SLF001
+    start, end = _day_range()
+    days = {date_field.to_python(day) for day in days if day is not None}
+    days = {day for day in days if start <= day <= end}
+    if not days:
+        return
+    with transaction.atomic(savepoint=False):
+        calendar = (
+            TrainingCalendar.objects.select_for_update().filter(user_id=user_id).first()
+        )
+        if calendar is None:
+            rebuild_calendar(user_id)
+            return
+
+        totals = _day_totals(user_id, date__in=days)
+        first_day = min(days)
+        last_day = max(days)
+        if calendar.first_day is not None:
+            first_day = min(first_day, calendar.first_day)
+            last_day = max(
+                last_day,
+                calendar.first_day + datetime.timedelta(len(calendar.sessions) - 1),
+            )
+        n_days = (last_day - first_day).days + 1
+        sessions = bytearray(n_days)
+        volumes = array("f", bytes(4 * n_days))
+        if calendar.first_day is not None:
+            offset = (calendar.first_day - first_day).days
+            old_sessions = bytes(calendar.sessions)
+            sessions[offset : offset + len(old_sessions)] = old_sessions
+            old_volumes = array("f", bytes(calendar.volumes))
+            volumes[offset : offset + len(old_volumes)] = old_volumes
+        for day in days:
+            n_sessions, volume = totals.get(day, (0, 0))
+            index = (day - first_day).days
+            sessions[index] = n_sessions
+            volumes[index] = volume or 0
+        _write(calendar, first_day, sessions, volumes)
+
+
+def get_calendar(user_id):
+    """
+    A user's ``Calendar``, from the cache when possible.
+    """
+    # The version is read first: a write committing after it bumps it.
+    key = _cache_key(user_id, cache_version(_version_key(user_id)))
+    calendar = cache.get(key)
+    if calendar is not None:
+        return calendar
+
+    row = TrainingCalendar.objects.filter(user_id=user_id).first()
+    if row is None:
+        row = rebuild_calendar(user_id)
+    calendar = Calendar(
+        first_day=row.first_day,
+        sessions=bytes(row.sessions),
+        volumes=array("f", bytes(row.volumes)),
+        longest_streak=row.longest_streak,
+        last_streak=row.last_streak,
+    )
+    cache.set(key, calendar, CACHE_TIMEOUT)
+    return calendar
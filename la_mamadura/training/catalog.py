@@ -0,0 +1,104 @@
+"""
+Choices of the training forms.
+
+The exercise catalog, the muscular group facets and the template lists are
+read on most pages and rarely changed, and go through the two-tier
+``la_mamadura.training.local_cache``. A user's training sessions are too many
+to list: their selects are ``RemoteSearchSelect``s searching them with
+``search_training_sessions``, whose results are cached under the user's
+training data version.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import CharField
+from django.db.models import Q
+from django.db.models.functions import Cast
+
+from la_mamadura.training import local_cache
+from la_mamadura.training.cache import user_training_version
+from la_mamadura.training.closure import muscular_group_facets
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.models import TrainingSessionTemplate
+
+CACHE_TIMEOUT = 60 * 60 * 24
+SEARCH_RESULTS = 20
+
+EXERCISES = "exercises"
+FACETS = "facets"
+TEMPLATES = "templates"
+
+
+def exercise_choices():
+    """
+    ``(id, name)`` of every exercise, by name.
+    """
+    return local_cache.get_or_set(
+        EXERCISES,
+        "all",
+        lambda: list(Exercise.objects.order_by("name").values_list("id", "name")),
+        CACHE_TIMEOUT,
+    )
+
+
+def cached_muscular_group_facets():
+    """
+    ``muscular_group_facets`` of all the exercises.
+    """
+    return local_cache.get_or_set(
+        FACETS,
+        "all",
+        lambda: list(muscular_group_facets()),
+        CACHE_TIMEOUT,
+    )
+
+
+def template_choices(user_id):
+    """
+    ``(id, name)`` of the templates the user can train from: the shared ones
+    and their own.
+    """
+    return local_cache.get_or_set(
+        TEMPLATES,
+        user_id,
+        lambda: list(
+            TrainingSessionTemplate.objects.filter(
+                Q(user__isnull=True) | Q(user_id=user_id),
+            )
+            .order_by("name", "id")
+            .values_list("id", "name"),
+        ),
+        CACHE_TIMEOUT,
+    )
+
+
+def _search_training_sessions(user_id, query):
+    sessions = (
+        TrainingSessionRecord.objects.filter(user_id=user_id)
+        .select_related("user")
+        .order_by("-date", "-id")
+    )
+    if query:
+        sessions = sessions.annotate(day=Cast("date", CharField())).filter(
+            Q(day__contains=query) | Q(template__name__icontains=query),
+        )
+    return [
+        {"id": session.pk, "text": str(session)}
+        for session in sessions[:SEARCH_RESULTS]
+    ]
+
+
+def search_training_sessions(user_id, query):
+    """
+    ``{"id", "text"}`` of the user's latest training sessions whose date or
+    template matches ``query``.
+    """
+    digest = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+    key = f"training:session-search:{user_id}:{user_training_version(user_id)}:{digest}"
+    results = cache.get(key)
+    if results is None:
+        results = _search_training_sessions(user_id, query)
+        cache.set(key, results, CACHE_TIMEOUT)
+    return results
@@ -0,0 +1,140 @@
+"""
+Maintenance of the exercise -> muscle hierarchy closure table.
+
+``Exercise`` is tagged with submuscles, muscles and muscular groups, and the
+taxonomy itself nests submuscles into muscles and muscles into muscular
+groups. Instead of walking those five M2M tables on every filter, the
+``ExerciseMuscleClosure`` table stores every node an exercise reaches, so
+"exercises for chest" is a single indexed lookup.
+"""
+
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Q
+
+from la_mamadura.training.models import ExerciseMuscleClosure
+from la_mamadura.training.models import MuscularGroup
+
+
+def _closure_rows(exercise_ids, apps):
+    exercise_model = apps.get_model("training", "Exercise")
+    muscle_model = apps.get_model("training", "Muscle")
+    group_model = apps.get_model("training", "MuscularGroup")
+    closure_model = apps.get_model("training", "ExerciseMuscleClosure")
+
+    # The taxonomy is tiny, read it whole once.
+    muscles_of_submuscle = defaultdict(set)
+    for muscle_id, submuscle_id in muscle_model.submuscles.through.objects.values_list(
+        "muscle_id",
+        "submuscle_id",
+    ):
+        muscles_of_submuscle[submuscle_id].add(muscle_id)
+
+    groups_of_muscle = defaultdict(set)
+    for group_id, muscle_id in group_model.muscles.through.objects.values_list(
+        "musculargroup_id",
+        "muscle_id",
+    ):
+        groups_of_muscle[muscle_id].add(group_id)
+
+    def tags(through, column):
+        tagged = defaultdict(set)
+        qs = through.objects.all()
+        if exercise_ids is not None:
+            qs = qs.filter(exercise_id__in=exercise_ids)
+        for exercise_id, target_id in qs.values_list("exercise_id", column):
+            tagged[exercise_id].add(target_id)
+        return tagged
+
+    direct_submuscles = tags(exercise_model.submuscles.through, "submuscle_id")
+    direct_muscles = tags(exercise_model.muscles.through, "muscle_id")
+    direct_groups = tags(exercise_model.muscular_group.through, "musculargroup_id")
+
+    tagged_exercises = {*direct_submuscles, *direct_muscles, *direct_groups}
+    rows: list[ExerciseMuscleClosure] = []
+    for exercise_id in tagged_exercises:
+        submuscles = direct_submuscles[exercise_id]
+        muscles = set(direct_muscles[exercise_id])
+        for submuscle_id in submuscles:
+            muscles |= muscles_of_submuscle[submuscle_id]
+        groups = set(direct_groups[exercise_id])
+        for muscle_id in muscles:
+            groups |= groups_of_muscle[muscle_id]
+
+        rows.extend(
+            closure_model(
+                exercise_id=exercise_id,
+                submuscle_id=submuscle_id,
+                direct=True,
+            )
+            for submuscle_id in submuscles
+        )
+        rows.extend(
+            closure_model(
+                exercise_id=exercise_id,
+                muscle_id=muscle_id,
+                direct=muscle_id in direct_muscles[exercise_id],
+            )
+            for muscle_id in muscles
+        )
+        rows.extend(
+            closure_model(
+                exercise_id=exercise_id,
+                muscular_group_id=group_id,
+                direct=group_id in direct_groups[exercise_id],
+            )
+            for group_id in groups
+        )
+    return rows
+
+
+def rebuild_exercise_closure(exercise_ids=None, *, apps=global_apps):
+    """
+    Recompute the closure rows of ``exercise_ids`` (all exercises if None).
+
+    ``apps`` allows running it from a data migration with historical models.
+    """
+    closure_model = apps.get_model("training", "ExerciseMuscleClosure")
+
+    if exercise_ids is not None:
+        exercise_ids = set(exercise_ids)
+        if not exercise_ids:
+            return 0
+
+    with transaction.atomic():
+        stale = closure_model.objects.all()
+        if exercise_ids is not None:
+            stale = stale.filter(exercise_id__in=exercise_ids)
+        stale.delete()
+        rows = _closure_rows(exercise_ids, apps)
+        closure_model.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def exercises_reaching(**targets):
+    """
+    Ids of the exercises whose closure touches any of the given nodes, e.g.
+    ``exercises_reaching(muscle__in=[1, 2])``.
+    """
+    return set(
+        ExerciseMuscleClosure.objects.filter(**targets).values_list(
+            "exercise_id",
+            flat=True,
+        ),
+    )
+
+
+def muscular_group_facets(exercises=None):
+    """
+    MuscularGroups annotated with ``n_exercises``, the number of exercises
+    (restricted to the ``exercises`` queryset if given) reaching them.
+    """
+    condition = Q()
+    if exercises is not None:
+        condition = Q(exercise_closure__exercise__in=exercises.values("pk"))
+    return MuscularGroup.objects.annotate(
+        n_exercises=Count("exercise_closure", filter=condition),
+    ).order_by("name")
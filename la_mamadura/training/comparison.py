@@ -0,0 +1,120 @@
+"""
+Side by side progress series of several exercises.
+
+All the exercises' sets are read at once with ``exercise_history`` (one
+query for the hot sets and one for the archives), reduced to the best value
+of each training day, aligned on a shared date axis and downsampled to a
+bounded number of points, so overlaying squat, bench and deadlift is a single
+request.
+"""
+
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+from la_mamadura.training.archive import exercise_history
+from la_mamadura.training.statistics import estimated_one_rep_max
+
+if TYPE_CHECKING:
+    import datetime
+
+LOAD = "load"
+E1RM = "e1rm"
+METRICS = (LOAD, E1RM)
+# Percentage of the best value of the series, or of the best estimated 1RM.
+PERCENT_OF_PR = "pr"
+PERCENT_OF_E1RM = "e1rm"
+NORMALIZATIONS = (PERCENT_OF_PR, PERCENT_OF_E1RM)
+
+DEFAULT_MAX_POINTS = 200
+
+
+def _set_value(entry, metric):
+    if not entry.repetitions or not entry.load:
+        return None
+    if metric == E1RM:
+        return estimated_one_rep_max(entry.load, entry.repetitions)
+    return entry.load
+
+
+def daily_bests(entries, metric):
+    """
+    Day -> best value of the metric among the day's completed sets.
+    """
+    bests: dict[datetime.date, float] = {}
+    for entry in entries:
+        value = _set_value(entry, metric)
+        if value is not None and value > bests.get(entry.date, float("-inf")):
+            bests[entry.date] = value
+    return bests
+
+
+def _normalized(bests, entries, normalize):
+    """
+    Daily bests as a percentage of the best of the series (``pr``) or of the
+    best estimated 1RM (``e1rm``).
+    """
+    if normalize == PERCENT_OF_E1RM:
+        reference = max(daily_bests(entries, E1RM).values(), default=0)
+    else:
+        reference = max(bests.values(), default=0)
+    if not reference:
+        return bests
+    return {day: round(100 * value / reference, 1) for day, value in bests.items()}
+
+
+def downsample(dates, columns, max_points):
+    """
+    Merge consecutive dates into at most ``max_points`` buckets, keeping the
+    last date of each bucket and the best value of each column in it.
+    """
+    if len(dates) <= max_points:
+        return dates, columns
+    bounds = [len(dates) * i // max_points for i in range(max_points + 1)]
+    buckets = list(pairwise(bounds))
+    sampled_dates = [dates[end - 1] for _start, end in buckets]
+    sampled_columns = [
+        [
+            max(
+                (value for value in column[start:end] if value is not None),
+                default=None,
+            )
+            for start, end in buckets
+        ]
+        for column in columns
+    ]
+    return sampled_dates, sampled_columns
+
+
+def comparison_series(  # noqa: PLR0913
+    user,
+    exercises,
+    metric=LOAD,
+    normalize=None,
+    start=None,
+    end=None,
+    max_points=DEFAULT_MAX_POINTS,
+):
+    """
+    Aligned series of the user's daily best ``metric`` for ``exercises``.
+
+    Returns ``(dates, [(exercise, values)])`` where every values list matches
+    ``dates`` and holds None on the days the exercise wasn't trained.
+    """
+    history = exercise_history(
+        user,
+        [exercise.id for exercise in exercises],
+        start,
+        end,
+    )
+    series = []
+    for exercise in exercises:
+        entries = history[exercise.id]
+        bests = daily_bests(entries, metric)
+        if normalize:
+            bests = _normalized(bests, entries, normalize)
+        series.append(bests)
+
+    dates = sorted(set().union(*series))
+    columns = [[bests.get(day) for day in dates] for bests in series]
+    dates, columns = downsample(dates, columns, max_points)
+    return dates, list(zip(exercises, columns, strict=True))
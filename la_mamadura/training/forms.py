@@ -1,17 +1,70 @@
+from collections.abc import Callable
+
+from django.forms import BaseForm
 from django.forms import ModelForm
 from django.forms import TextInput
-from django.forms import ModelChoiceField
+from django.forms import ChoiceField
+from django.forms import DateField
 from django.forms import Form
+from django.forms import IntegerField
+from django.forms import ModelChoiceField
+from django.forms import ModelMultipleChoiceField
+from django.forms import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Q
+from django.urls import reverse_lazy
 
 
+from la_mamadura.training import comparison
+from la_mamadura.training.catalog import exercise_choices
+from la_mamadura.training.catalog import template_choices
 from la_mamadura.training.models import Exercise
 from la_mamadura.training.models import ExerciseRecord
 from la_mamadura.training.models import TrainingSessionRecord
 from la_mamadura.training.models import ExerciseTemplate
 from la_mamadura.training.models import TrainingSessionTemplate
 from la_mamadura.training.models import Weight
+from la_mamadura.training.widgets import RemoteSearchSelect
+
+
+def _cached_choices(field, choices):
+    """
+    Render ``field`` with the ``choices()`` instead of querying its queryset,
+    which still validates the submitted value. They are only read to render
+    the field.
+    """
+    if field.empty_label is None:
+        field.choices = choices
+    else:
+        field.choices = lambda: [("", field.empty_label), *choices()]
+
+
+class CachedChoicesMixin(BaseForm):
+    """
+    Render the ``cached_choices`` fields, field name -> choice provider from
+    ``la_mamadura.training.catalog``, with their provider's choices.
+    """
+
+    cached_choices: dict[str, Callable] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, choices in self.cached_choices.items():
+            _cached_choices(self.fields[name], choices)
+
+
+def _user_templates(field, user):
+    """
+    Let ``field`` choose among the shared templates and the user's own only.
+    """
+    field.queryset = TrainingSessionTemplate.objects.filter(
+        Q(user__isnull=True) | Q(user_id=user.id),
+    )
+    _cached_choices(field, lambda: template_choices(user.id))
+
+
+def _training_session_widget():
+    return RemoteSearchSelect(reverse_lazy("training:training_session_search"))
 
 
 class CreateTrainingRecordForm(ModelForm):
@@ -23,16 +76,21 @@ class CreateTrainingRecordForm(ModelForm):
         }
 
 
-class CreateExcerciseRecordForm(ModelForm):
+class CreateExcerciseRecordForm(CachedChoicesMixin, ModelForm):
+    cached_choices = {"exercise": exercise_choices}
+
     class Meta:
         model = ExerciseRecord
         exclude = ["user"]
         widgets = {
             "date": TextInput(attrs={"type": "date"}),
+            "training_session": _training_session_widget(),
         }
 
 
-class CreateExcerciseRecordFromTrainingForm(ModelForm):
+class CreateExcerciseRecordFromTrainingForm(CachedChoicesMixin, ModelForm):
+    cached_choices = {"exercise": exercise_choices}
+
     class Meta:
         model = ExerciseRecord
         exclude = ["user", "training_session", "date"]
@@ -41,26 +99,42 @@ class CreateExcerciseRecordFromTrainingForm(ModelForm):
         }
 
 
-class UpdateExerciseRecord(ModelForm):
+class UpdateExerciseRecord(CachedChoicesMixin, ModelForm):
+    cached_choices = {"exercise": exercise_choices}
+
     class Meta:
         model = ExerciseRecord
         exclude = ["user"]
         widgets = {
             "date": TextInput(attrs={"type": "date"}),
+            "training_session": _training_session_widget(),
         }
 
 
+class UpdateExerciseSetForm(ModelForm):
+    class Meta:
+        model = ExerciseRecord
+        fields = ["load", "repetitions", "notes"]
+
+
 class CreateExerciseForm(ModelForm):
     class Meta:
         model = Exercise
         fields = "__all__"
 
 
-class CreateExerciseTemplateForm(ModelForm):
+class CreateExerciseTemplateForm(CachedChoicesMixin, ModelForm):
+    cached_choices = {"exercise": exercise_choices}
+
     class Meta:
         model = ExerciseTemplate
         fields = "__all__"
 
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop("user")
+        super().__init__(*args, **kwargs)
+        _user_templates(self.fields["template"], user)
+
 
 class CreateTrainingSessionTemplateForm(ModelForm):
     class Meta:
@@ -77,9 +151,7 @@ class CreateTrainingFromTemplateForm(Form):
         user = kwargs.pop("user", None)
         super().__init__(*args, **kwargs)
         if user:
-            self.fields["template"].queryset = TrainingSessionTemplate.objects.filter(
-                Q(user__isnull=True) | Q(user__id=user.id)
-            )
+            _user_templates(self.fields["template"], user)
 
 
 class CreateWeightRecordForm(ModelForm):
@@ -89,3 +161,46 @@ class CreateWeightRecordForm(ModelForm):
         widgets = {
             "date": TextInput(attrs={"type": "date"}),
         }
+
+
+class ExerciseComparisonForm(Form):
+    max_exercises = 8
+
+    exercise = ModelMultipleChoiceField(
+        queryset=Exercise.objects.order_by("name"),
+        label=_("Exercises"),
+    )
+    metric = ChoiceField(
+        choices=[
+            (comparison.LOAD, _("Load")),
+            (comparison.E1RM, _("Estimated 1RM")),
+        ],
+        required=False,
+        label=_("Metric"),
+    )
+    normalize = ChoiceField(
+        choices=[
+            ("", _("Absolute")),
+            (comparison.PERCENT_OF_PR, _("% of PR")),
+            (comparison.PERCENT_OF_E1RM, _("% of estimated 1RM")),
+        ],
+        required=False,
+        label=_("Normalize"),
+    )
+    start = DateField(required=False, label=_("From"))
+    end = DateField(required=False, label=_("To"))
+    points = IntegerField(
+        min_value=2,
+        max_value=1000,
+        required=False,
+        label=_("Points"),
+    )
+
+    def clean_exercise(self):
+        exercises = self.cleaned_data["exercise"]
+        if len(exercises) > self.max_exercises:
+            raise ValidationError(
+                _("Compare at most %(max)d exercises."),
+                params={"max": self.max_exercises},
+            )
+        return exercises
@@ -0,0 +1,323 @@
+"""
+Cross-user exercise leaderboards kept in Redis sorted sets.
+
+Every exercise has one sorted set per metric, scored by each user's best:
+``load`` and ``e1rm`` (Epley estimated one repetition maximum), absolute and
+relative to the user's latest bodyweight (``load:bw`` and ``e1rm:bw``). Only
+the exercises loaded in kg have the last three: a time or a distance has no
+1RM and is not comparable with a bodyweight. New sets raise the scores with
+``ZADD GT``; edits and deletions recompute the user's bests for the exercise.
+Top-N and rank queries are O(log n).
+
+``manage.py rebuild_leaderboards`` recomputes every board from the database.
+Redis errors are logged and never fail the training writes.
+"""
+
+import functools
+import logging
+from collections import defaultdict
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import F
+from django.db.models import FloatField
+from django.db.models import Max
+from django.db.models import When
+
+from la_mamadura.training.archive import exercise_history
+from la_mamadura.training.archive import unpack_entries
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseRecordArchive
+from la_mamadura.training.models import Weight
+from la_mamadura.training.statistics import estimated_one_rep_max
+
+logger = logging.getLogger(__name__)
+
+LOAD = "load"
+E1RM = "e1rm"
+METRICS = (LOAD, E1RM)
+RELATIVE_SUFFIX = ":bw"
+BOARDS = (*METRICS, *(f"{metric}{RELATIVE_SUFFIX}" for metric in METRICS))
+
+# Same formula as la_mamadura.training.statistics.estimated_one_rep_max.
+ESTIMATED_1RM = Case(
+    When(repetitions=1, then=F("load")),
+    default=F("load") * (1 + F("repetitions") / 30.0),
+    output_field=FloatField(),
+)
+
+
+@functools.cache
+def get_redis():
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def board_key(exercise_id, board):
+    return f"{settings.TRAINING_LEADERBOARD_KEY_PREFIX}:{exercise_id}:{board}"
+
+
+def latest_bodyweight(user_id):
+    return (
+        Weight.objects.filter(user_id=user_id, weight__gt=0)
+        .order_by("-date", "-id")
+        .values_list("weight", flat=True)
+        .first()
+    )
+
+
+def exercise_boards(load_units):
+    """
+    The boards of an exercise loaded in ``load_units``.
+    """
+    return BOARDS if load_units == Exercise.LOAD_UNITS_KG else (LOAD,)
+
+
+def kg_exercise_ids(exercise_ids):
+    return set(
+        Exercise.objects.filter(
+            pk__in=exercise_ids,
+            load_units=Exercise.LOAD_UNITS_KG,
+        ).values_list("pk", flat=True),
+    )
+
+
+def _scores(bests, bodyweight, *, kg):
+    """
+    Board -> score for a user's ``{metric: best}`` on an exercise, loaded in
+    kg or not.
+    """
+    if not kg:
+        return {LOAD: bests[LOAD]} if bests[LOAD] > 0 else {}
+    scores = {metric: best for metric, best in bests.items() if best > 0}
+    if bodyweight:
+        for metric, best in list(scores.items()):
+            scores[f"{metric}{RELATIVE_SUFFIX}"] = best / bodyweight
+    return scores
+
+
+def _best_of_sets(sets):
+    """
+    Metric -> best of ``(load, repetitions)`` sets.
+    """
+    return {
+        LOAD: max((load for load, repetitions in sets if repetitions), default=0),
+        E1RM: max(
+            (estimated_one_rep_max(load, repetitions) for load, repetitions in sets),
+            default=0,
+        ),
+    }
+
+
+def _on_commit(func):
+    """
+    Run the update after the surrounding transaction commits, and only log
+    Redis failures.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        def run():
+            try:
+                func(*args, **kwargs)
+            except redis.RedisError:
+                logger.exception("Could not update the training leaderboards.")
+
+        transaction.on_commit(run)
+
+    return wrapper
+
+
+@_on_commit
+def record_sets(user_id, exercise_id, sets):
+    """
+    Raise the user's scores with newly logged ``(load, repetitions)`` sets.
+    """
+    scores = _scores(
+        _best_of_sets(sets),
+        latest_bodyweight(user_id),
+        kg=bool(kg_exercise_ids([exercise_id])),
+    )
+    if not scores:
+        return
+    member = str(user_id)
+    pipeline = get_redis().pipeline(transaction=False)
+    for board, score in scores.items():
+        pipeline.zadd(board_key(exercise_id, board), {member: score}, gt=True)
+    pipeline.execute()
+
+
+def _write_user_scores(pipeline, user_id, exercise_id, scores):
+    """
+    Set the user's scores, removing them from the boards missing in
+    ``scores``.
+    """
+    member = str(user_id)
+    for board in BOARDS:
+        key = board_key(exercise_id, board)
+        if board in scores:
+            pipeline.zadd(key, {member: scores[board]})
+        else:
+            pipeline.zrem(key, member)
+
+
+@_on_commit
+def refresh_user_exercise(user_id, exercise_id):
+    """
+    Recompute the user's scores on an exercise from all their sets, archived
+    ones included, after a set was edited or deleted.
+    """
+    entries = exercise_history(user_id, [exercise_id])[exercise_id]
+    bests = _best_of_sets([(entry.load, entry.repetitions) for entry in entries])
+    pipeline = get_redis().pipeline(transaction=False)
+    _write_user_scores(
+        pipeline,
+        user_id,
+        exercise_id,
+        _scores(
+            bests,
+            latest_bodyweight(user_id),
+            kg=bool(kg_exercise_ids([exercise_id])),
+        ),
+    )
+    pipeline.execute()
+
+
+def user_exercise_ids(user_id):
+    hot = ExerciseRecord.objects.filter(user_id=user_id).values_list(
+        "exercise_id",
+        flat=True,
+    )
+    archived = ExerciseRecordArchive.objects.filter(user_id=user_id).values_list(
+        "exercise_id",
+        flat=True,
+    )
+    return set(hot.order_by().distinct()) | set(archived)
+
+
+@_on_commit
+def refresh_user_relative_scores(user_id):
+    """
+    Rescale the user's bodyweight-relative scores after a bodyweight change.
+    """
+    exercise_ids = list(kg_exercise_ids(user_exercise_ids(user_id)))
+    if not exercise_ids:
+        return
+    client = get_redis()
+    pipeline = client.pipeline(transaction=False)
+    for exercise_id in exercise_ids:
+        for metric in METRICS:
+            pipeline.zscore(board_key(exercise_id, metric), str(user_id))
+    absolute = iter(pipeline.execute())
+
+    bodyweight = latest_bodyweight(user_id)
+    pipeline = client.pipeline(transaction=False)
+    for exercise_id in exercise_ids:
+        bests = {metric: next(absolute) or 0 for metric in METRICS}
+        _write_user_scores(
+            pipeline,
+            user_id,
+            exercise_id,
+            _scores(bests, bodyweight, kg=True),
+        )
+    pipeline.execute()
+
+
+@_on_commit
+def remove_user(user_id, exercise_ids):
+    pipeline = get_redis().pipeline(transaction=False)
+    for exercise_id in exercise_ids:
+        for board in BOARDS:
+            pipeline.zrem(board_key(exercise_id, board), str(user_id))
+    pipeline.execute()
+
+
+def top(exercise_id, board=LOAD, n=10):
+    """
+    The ``n`` best ``(user_id, score)`` of a board.
+    """
+    return [
+        (int(member), score)
+        for member, score in get_redis().zrevrange(
+            board_key(exercise_id, board),
+            0,
+            n - 1,
+            withscores=True,
+        )
+    ]
+
+
+def rank(exercise_id, user_id, board=LOAD):
+    """
+    The user's 1-based rank and score on a board, ``(None, None)`` if the
+    user is not on it.
+    """
+    pipeline = get_redis().pipeline(transaction=False)
+    pipeline.zrevrank(board_key(exercise_id, board), str(user_id))
+    pipeline.zscore(board_key(exercise_id, board), str(user_id))
+    position, score = pipeline.execute()
+    if position is None:
+        return None, None
+    return position + 1, score
+
+
+def rebuild_leaderboards():
+    """
+    Recompute every board from the hot and archived sets. Returns the number
+    of boards written.
+    """
+    bests: defaultdict[tuple[int, int], dict[str, float]] = defaultdict(
+        lambda: {LOAD: 0, E1RM: 0},
+    )
+    for user_id, exercise_id, best_load, best_e1rm in (
+        ExerciseRecord.objects.filter(repetitions__gt=0, load__gt=0)
+        .order_by()
+        .values("user_id", "exercise_id")
+        .annotate(best_load=Max("load"), best_e1rm=Max(ESTIMATED_1RM))
+        .values_list("user_id", "exercise_id", "best_load", "best_e1rm")
+    ):
+        bests[user_id, exercise_id] = {LOAD: best_load, E1RM: best_e1rm}
+    for user_id, exercise_id, data in ExerciseRecordArchive.objects.values_list(
+        "user_id",
+        "exercise_id",
+        "data",
+    ).iterator(chunk_size=100):
+        best = bests[user_id, exercise_id]
+        for entry in unpack_entries(data):
+            if entry.repetitions and entry.load > 0:
+                best[LOAD] = max(best[LOAD], entry.load)
+                best[E1RM] = max(
+                    best[E1RM],
+                    estimated_one_rep_max(entry.load, entry.repetitions),
+                )
+
+    bodyweights = dict(
+        Weight.objects.filter(weight__gt=0)
+        .order_by("user_id", "-date", "-id")
+        .distinct("user_id")
+        .values_list("user_id", "weight"),
+    )
+    kg = kg_exercise_ids({exercise_id for _user_id, exercise_id in bests})
+    boards: defaultdict[tuple[int, str], dict[str, float]] = defaultdict(dict)
+    for (user_id, exercise_id), user_bests in bests.items():
+        for board, score in _scores(
+            user_bests,
+            bodyweights.get(user_id),
+            kg=exercise_id in kg,
+        ).items():
+            boards[exercise_id, board][str(user_id)] = score
+
+    client = get_redis()
+    stale_keys = set(client.scan_iter(f"{settings.TRAINING_LEADERBOARD_KEY_PREFIX}:*"))
+    pipeline = client.pipeline(transaction=True)
+    for (exercise_id, board), scores in boards.items():
+        key = board_key(exercise_id, board)
+        pipeline.delete(key)
+        pipeline.zadd(key, scores)
+        stale_keys.discard(key.encode())
+    if stale_keys:
+        pipeline.delete(*stale_keys)
+    pipeline.execute()
+    return len(boards)
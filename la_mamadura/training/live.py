@@ -0,0 +1,102 @@
+"""
+Live updates of a training session for every device watching it.
+
+Set writes publish a compact delta on the session's Redis channel once their
+transaction commits, and ``session_events`` streams the channel as
+server-sent events. A delta carries the saved sets, the ids of the deleted
+ones and the set counts of the session's exercises, enough for the session page
+to patch its accordion without fetching anything. The stream is an async
+generator on ``redis.asyncio``, so under the ASGI server an open stream costs
+a coroutine and a Redis connection, not a worker. Redis errors are logged and
+never fail the training writes.
+"""
+
+import json
+import logging
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Q
+
+from la_mamadura.training.leaderboards import get_redis
+from la_mamadura.training.models import ExerciseRecord
+
+logger = logging.getLogger(__name__)
+
+# Milliseconds browsers wait before reconnecting a dropped stream.
+RECONNECT_DELAY = 3000
+
+
+def channel(session_id):
+    return f"{settings.TRAINING_LIVE_CHANNEL_PREFIX}:{session_id}"
+
+
+def _exercise_counts(session_id):
+    rows = (
+        ExerciseRecord.objects.filter(training_session_id=session_id)
+        .order_by()
+        .values("exercise_id")
+        .annotate(
+            n_sets=Count("id"),
+            n_done=Count("id", filter=~Q(load=0) & ~Q(repetitions=0)),
+        )
+    )
+    return {
+        row["exercise_id"]: {"sets": row["n_sets"], "done": row["n_done"]}
+        for row in rows
+    }
+
+
+def publish_sets(session_id, saved=(), deleted=()):
+    """
+    Tell the session's watchers about its ``saved`` and ``deleted`` sets,
+    after the surrounding transaction commits.
+    """
+    delta = {
+        "sets": [
+            {
+                "id": record.pk,
+                "exercise": record.exercise_id,
+                "load": record.load,
+                "repetitions": record.repetitions,
+                "notes": record.notes,
+            }
+            for record in saved
+        ],
+        "deleted": [record.pk for record in deleted],
+    }
+
+    def publish():
+        try:
+            delta["exercises"] = _exercise_counts(session_id)
+            get_redis().publish(channel(session_id), json.dumps(delta))
+        except redis.RedisError:
+            logger.exception("Could not publish the training session changes.")
+
+    transaction.on_commit(publish)
+
+
+async def session_events(session_id):
+    """
+    Server-sent events of a session's deltas, with a comment line every
+    ``TRAINING_LIVE_KEEPALIVE_SECONDS`` so proxies keep idle streams open.
+    """
+    client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(channel(session_id))
+        yield f"retry: {RECONNECT_DELAY}\n\n"
+        while True:
+            message = await pubsub.get_message(
+                timeout=settings.TRAINING_LIVE_KEEPALIVE_SECONDS,
+            )
+            if message is None:
+                yield ": keepalive\n\n"
+            elif message["type"] == "message":
+                yield f"event: sets\ndata: {message['data'].decode()}\n\n"
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
@@ -0,0 +1,190 @@
+"""
+Two-tier cache of small, hot, read-mostly data: the exercise catalog, the
+muscle taxonomy facets, the users' template lists.
+
+``get_or_set`` looks in a per-process LRU first, bounded in size and age by
+``TRAINING_LOCAL_CACHE_SIZE`` and ``TRAINING_LOCAL_CACHE_TIMEOUT``, then in the
+shared Django cache, and only then computes the value, so most lookups never
+leave the worker. ``invalidate``, called from the signals of the source rows
+(see ``la_mamadura.training.signals``), drops the value from both tiers and,
+once the change commits, tells every process to drop its local copy through
+the ``TRAINING_LOCAL_CACHE_CHANNEL`` Redis channel. Each process listens to
+it on a daemon thread started on its first lookup. A missed message, while
+Redis is unreachable, is bounded by the local timeout.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from la_mamadura.training.leaderboards import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Seconds the listener waits before subscribing again after a Redis error.
+RESUBSCRIBE_DELAY = 5
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread-safe LRU of ``(namespace, key)`` -> value, whose entries expire
+    ``timeout`` seconds after they are set.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key, default=None):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[(namespace, key)]
+                return default
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[(namespace, key)] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace, key=None):
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local = LocalCache(
+    settings.TRAINING_LOCAL_CACHE_SIZE,
+    settings.TRAINING_LOCAL_CACHE_TIMEOUT,
+)
+
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def _handle_message(data):
+    message = json.loads(data)
+    local.invalidate(message["namespace"], message["key"])
+
+
+def _listen():
+    while True:
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(settings.TRAINING_LOCAL_CACHE_CHANNEL)
+            for message in pubsub.listen():
+                if message["type"] == "message":
+                    _handle_message(message["data"])
+        except redis.RedisError:
+            logger.exception("Lost the local cache invalidation channel.")
+            time.sleep(RESUBSCRIBE_DELAY)
+            # Whatever changed while we weren't subscribed.
+            local.clear()
+
+
+def _ensure_listener():
+    global _listener_pid  # noqa: PLW0603
+    # Forked workers don't inherit the thread, so there is one per process.
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid != os.getpid():
+            threading.Thread(
+                target=_listen,
+                name="training-local-cache",
+                daemon=True,
+            ).start()
+            _listener_pid = os.getpid()
+
+
+def _generation_key(namespace):
+    return f"training:local:{namespace}:generation"
+
+
+def _shared_key(namespace, key):
+    generation = cache.get(_generation_key(namespace))
+    if generation is None:
+        cache.add(_generation_key(namespace), time.time_ns(), None)
+        generation = cache.get(_generation_key(namespace))
+    return f"training:local:{namespace}:{generation}:{key}"
+
+
+def get_or_set(namespace, key, compute, timeout):
+    """
+    The value of ``key`` in ``namespace``, from the process' LRU, then from
+    the shared cache (where it is kept ``timeout`` seconds), then from
+    ``compute``.
+    """
+    if settings.TRAINING_LOCAL_CACHE_SIZE > 0:
+        _ensure_listener()
+    value = local.get(namespace, key, _MISSING)
+    if value is not _MISSING:
+        return value
+    shared_key = _shared_key(namespace, key)
+    value = cache.get(shared_key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(shared_key, value, timeout)
+    local.set(namespace, key, value)
+    return value
+
+
+def _drop(namespace, key):
+    local.invalidate(namespace, key)
+    if key is None:
+        cache.set(_generation_key(namespace), time.time_ns(), None)
+    else:
+        cache.delete(_shared_key(namespace, key))
+
+
+def _publish(namespace, key):
+    _drop(namespace, key)
+    try:
+        get_redis().publish(
+            settings.TRAINING_LOCAL_CACHE_CHANNEL,
+            json.dumps({"namespace": namespace, "key": key}),
+        )
+    except redis.RedisError:
+        logger.exception("Could not publish the local cache invalidation.")
+
+
+def invalidate(namespace, key=None):
+    """
+    Drop ``key`` (the whole ``namespace`` if None) from both tiers now, and
+    from every process' LRU once the surrounding transaction commits.
+    """
+    # Dropped now for this transaction's reads, and again after the commit
+    # in case another request cached the old value in between.
+    _drop(namespace, key)
+    transaction.on_commit(lambda: _publish(namespace, key))
@@ -0,0 +1,153 @@
+"""
+Each simulated request runs the session list query and then ends like a
+request does (``close_old_connections``), so persistent, per-request and pooled
+connections can be compared, e.g.:
+
+    docker compose -f docker-compose.production.yml run --rm django \\
+        python manage.py benchmark_db_connections --concurrency 16
+    docker compose -f docker-compose.production.yml run --rm celeryworker \\
+        python manage.py benchmark_db_connections --concurrency 4
+
+With ``--asgi`` the requests run the way the ASGI server runs the sync
+views: concurrently on one event loop, each in a thread of its own.
+"""
+
+import asyncio
+import itertools
+import statistics
+import threading
+import time
+
+import psycopg
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db import connection
+from django.db import connections
+
+from la_mamadura.training.models import TrainingSessionRecord
+
+CONNECTION_COUNT_SQL = """
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database()
+    AND backend_type = 'client backend'
+    AND pid <> pg_backend_pid()
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark database access under concurrency with this process's "
+        "connection settings. Run it in the django and celeryworker containers "
+        "to compare their connection counts and latencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help="Run the requests like the ASGI server of the web containers.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        n_requests = options["requests"]
+        database = settings.DATABASES["default"]
+        self.stdout.write(
+            f"Process type: {getattr(settings, 'DJANGO_PROCESS_TYPE', 'web')}"
+            f"{' (ASGI)' if options['asgi'] else ''}, "
+            f"CONN_MAX_AGE: {database.get('CONN_MAX_AGE', 0)}, "
+            f"pool: {database.get('OPTIONS', {}).get('pool') or 'off'}",
+        )
+
+        backend_pids: set[int] = set()
+        latencies = []
+        request_numbers = itertools.count()
+
+        def client():
+            try:
+                while next(request_numbers) < n_requests:
+                    latencies.append(self.simulate_request(backend_pids))
+            finally:
+                connections.close_all()
+
+        async def asgi_client():
+            while next(request_numbers) < n_requests:
+                # Django's ASGI handler runs each request's sync code in a
+                # thread of its own.
+                async with ThreadSensitiveContext():
+                    latencies.append(
+                        await sync_to_async(self.simulate_request)(backend_pids),
+                    )
+
+        async def asgi_clients():
+            await asyncio.gather(*(asgi_client() for _ in range(concurrency)))
+
+        clients = [threading.Thread(target=client) for _ in range(concurrency)]
+        monitor = ConnectionMonitor()
+        monitor.start()
+        started = time.perf_counter()
+        if options["asgi"]:
+            asyncio.run(asgi_clients())
+        else:
+            for thread in clients:
+                thread.start()
+            for thread in clients:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        monitor.stop()
+
+        latencies.sort()
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"Requests: {n_requests} with concurrency {concurrency} in "
+            f"{elapsed:.2f}s ({n_requests / elapsed:.0f} req/s)\n"
+            f"Latency ms: p50 {percentiles[49]:.2f}, p95 {percentiles[94]:.2f}, "
+            f"p99 {percentiles[98]:.2f}, max {latencies[-1]:.2f}\n"
+            f"Server connections: peak {monitor.peak}, "
+            f"{len(backend_pids)} opened during the run",
+        )
+
+    def simulate_request(self, backend_pids):
+        """
+        Run the session list query and end like a request does, returning its
+        latency in milliseconds.
+        """
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            backend_pids.add(cursor.fetchone()[0])
+        list(TrainingSessionRecord.objects.order_by("-date", "-id")[:20])
+        close_old_connections()
+        return (time.perf_counter() - started) * 1000
+
+
+class ConnectionMonitor(threading.Thread):
+    """
+    Sample the server's client connections on a connection of its own.
+    """
+
+    interval = 0.05
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = 0
+        self._stopped = threading.Event()
+        params = connections["default"].get_connection_params()
+        self._connection = psycopg.connect(**params, autocommit=True)
+
+    def run(self):
+        with self._connection as monitor_connection:
+            while not self._stopped.is_set():
+                row = monitor_connection.execute(CONNECTION_COUNT_SQL).fetchone()
+                assert row is not None  # type guard
+                self.peak = max(self.peak, row[0])
+                self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from la_mamadura.training.outbox import COALESCED
+from la_mamadura.training.outbox import SCHEDULED
+from la_mamadura.training.outbox import drain_metrics
+
+
+class Command(BaseCommand):
+    help = "Show how many training outbox drains were enqueued and coalesced."
+
+    def handle(self, *args, **options):
+        metrics = drain_metrics()
+        writes = metrics[SCHEDULED] + metrics[COALESCED]
+        ratio = metrics[COALESCED] / writes if writes else 0
+        self.stdout.write(f"Drains enqueued: {metrics[SCHEDULED]}")
+        self.stdout.write(f"Writes coalesced: {metrics[COALESCED]} ({ratio:.0%})")
+        self.stdout.write(f"Events pending: {metrics['pending']}")
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from la_mamadura.training.partitions import INTERVALS
+from la_mamadura.training.partitions import ensure_partitions
+from la_mamadura.training.partitions import get_interval
+from la_mamadura.training.partitions import partition_table
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the ExerciseRecord table to a range-partitioned table and "
+        "create the upcoming partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            choices=INTERVALS,
+            help="Defaults to TRAINING_EXERCISE_RECORD_PARTITIONING.",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"] or get_interval()
+        if interval is None:
+            msg = "Set TRAINING_EXERCISE_RECORD_PARTITIONING or pass --interval."
+            raise CommandError(msg)
+
+        if partition_table(interval):
+            self.stdout.write(f"Partitioned ExerciseRecord by {interval}.")
+        created = ensure_partitions(interval=interval)
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {len(created)} upcoming partitions."),
+        )
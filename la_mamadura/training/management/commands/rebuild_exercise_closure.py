@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from la_mamadura.training.closure import rebuild_exercise_closure
+
+
+class Command(BaseCommand):
+    help = "Rebuild the exercise -> muscle hierarchy closure table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "exercise_ids",
+            nargs="*",
+            type=int,
+            help="Only rebuild these exercises (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        exercise_ids = options["exercise_ids"] or None
+        n_rows = rebuild_exercise_closure(exercise_ids)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {n_rows} closure rows."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from la_mamadura.training.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = "Recompute the exercise leaderboards in Redis from the database."
+
+    def handle(self, *args, **options):
+        n_boards = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {n_boards} leaderboards."))
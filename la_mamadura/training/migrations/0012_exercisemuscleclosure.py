@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0011_alter_exerciserecord_load'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseMuscleClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('direct', models.BooleanField(default=False)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='muscle_closure', to='training.exercise')),
+                ('muscle', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exercise_closure', to='training.muscle')),
+                ('muscular_group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exercise_closure', to='training.musculargroup')),
+                ('submuscle', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exercise_closure', to='training.submuscle')),
+            ],
+            options={
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('muscle__isnull', True), ('muscular_group__isnull', True), ('submuscle__isnull', False)), models.Q(('muscle__isnull', False), ('muscular_group__isnull', True), ('submuscle__isnull', True)), models.Q(('muscle__isnull', True), ('muscular_group__isnull', False), ('submuscle__isnull', True)), _connector='OR'), name='exercise_closure_single_target'), models.UniqueConstraint(condition=models.Q(('submuscle__isnull', False)), fields=('submuscle', 'exercise'), name='exercise_closure_unique_submuscle'), models.UniqueConstraint(condition=models.Q(('muscle__isnull', False)), fields=('muscle', 'exercise'), name='exercise_closure_unique_muscle'), models.UniqueConstraint(condition=models.Q(('muscular_group__isnull', False)), fields=('muscular_group', 'exercise'), name='exercise_closure_unique_muscular_group')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:09
+
+from django.db import migrations
+
+from la_mamadura.training.closure import rebuild_exercise_closure
+
+
+def populate_closure(apps, schema_editor):
+    rebuild_exercise_closure(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0012_exercisemuscleclosure'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_closure, migrations.RunPython.noop),
+    ]
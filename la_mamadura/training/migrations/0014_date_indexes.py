@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:11
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        ('training', '0013_populate_exercisemuscleclosure'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='exerciserecord',
+            index=models.Index(fields=['date', 'id'], name='exerciserecord_date_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='trainingsessionrecord',
+            index=models.Index(fields=['date', 'id'], name='trainingsession_date_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='weight',
+            index=models.Index(fields=['date', 'id'], name='weight_date_id_idx'),
+        ),
+    ]
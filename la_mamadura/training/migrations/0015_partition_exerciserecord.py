@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:20
+
+from django.db import migrations
+
+from la_mamadura.training.partitions import partition_table
+
+PARTITIONS_TASK_NAME = "Create exercise record partitions"
+
+
+def partition_exercise_records(apps, schema_editor):
+    # No-op unless TRAINING_EXERCISE_RECORD_PARTITIONING is set. Deployments
+    # enabling it later run `manage.py partition_exercise_records`.
+    partition_table(connection=schema_editor.connection)
+
+
+def schedule_partition_creation(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="0",
+        hour="3",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+    PeriodicTask.objects.get_or_create(
+        name=PARTITIONS_TASK_NAME,
+        defaults={
+            "task": "la_mamadura.training.tasks.create_exercise_record_partitions",
+            "crontab": schedule,
+        },
+    )
+
+
+def unschedule_partition_creation(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=PARTITIONS_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+        ('training', '0014_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_exercise_records, migrations.RunPython.noop),
+        migrations.RunPython(schedule_partition_creation, unschedule_partition_creation),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0015_partition_exerciserecord'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseRecordArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Year')),
+                ('n_records', models.PositiveIntegerField(default=0, verbose_name='Records')),
+                ('first_date', models.DateField(verbose_name='First date')),
+                ('last_date', models.DateField(verbose_name='Last date')),
+                ('data', models.BinaryField(verbose_name='Data')),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_record_archive', to='training.exercise', verbose_name='Exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_record_archive', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'exercise', 'year'), name='exercise_record_archive_unique_year')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:14
+
+from django.db import migrations
+
+ARCHIVAL_TASK_NAME = "Archive old exercise records"
+
+
+def schedule_archival(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="30",
+        hour="3",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+    PeriodicTask.objects.get_or_create(
+        name=ARCHIVAL_TASK_NAME,
+        defaults={
+            "task": "la_mamadura.training.tasks.archive_old_exercise_records",
+            "crontab": schedule,
+        },
+    )
+
+
+def unschedule_archival(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=ARCHIVAL_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+        ('training', '0016_exerciserecordarchive'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_archival, unschedule_archival),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+BACKFILL_SUMMARIES = """
+UPDATE training_trainingsessionrecord AS s
+SET set_count = a.set_count,
+    exercise_count = a.exercise_count,
+    completed_set_count = a.completed_set_count,
+    total_volume = a.total_volume,
+    status = CASE
+        WHEN a.completed_set_count = 0 THEN 'pending'
+        WHEN a.completed_set_count = a.set_count THEN 'finished'
+        ELSE 'started'
+    END
+FROM (
+    SELECT training_session_id,
+           count(*) AS set_count,
+           count(DISTINCT exercise_id) AS exercise_count,
+           count(*) FILTER (WHERE repetitions > 0 AND load <> 0) AS completed_set_count,
+           coalesce(sum(load * repetitions), 0) AS total_volume
+    FROM training_exerciserecord
+    GROUP BY training_session_id
+) AS a
+WHERE s.id = a.training_session_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0017_schedule_exercise_record_archival'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='completed_set_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Completed sets'),
+        ),
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='exercise_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Exercises'),
+        ),
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='set_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Sets'),
+        ),
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('started', 'Started'), ('finished', 'Finished')], default='pending', editable=False, max_length=16, verbose_name='Status'),
+        ),
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='total_volume',
+            field=models.FloatField(default=0, editable=False, verbose_name='Total volume'),
+        ),
+        migrations.RunSQL(BACKFILL_SUMMARIES, migrations.RunSQL.noop),
+    ]
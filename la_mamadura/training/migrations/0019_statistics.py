@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:21
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0018_trainingsessionrecord_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsRecomputation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('finished', 'Finished')], default='running', max_length=16, verbose_name='Status')),
+                ('chunk_size', models.PositiveIntegerField(verbose_name='Chunk size')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Started at')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished at')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatisticsRecomputationChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_user_id', models.BigIntegerField(verbose_name='First user id')),
+                ('last_user_id', models.BigIntegerField(verbose_name='Last user id')),
+                ('done', models.BooleanField(default=False, verbose_name='Done')),
+                ('n_statistics', models.PositiveIntegerField(default=0, verbose_name='Statistics')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished at')),
+                ('recomputation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='training.statisticsrecomputation', verbose_name='Recomputation')),
+            ],
+            options={
+                'ordering': ['first_user_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExerciseStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('set_count', models.PositiveIntegerField(default=0, verbose_name='Sets')),
+                ('total_volume', models.FloatField(default=0, verbose_name='Total volume')),
+                ('best_load', models.FloatField(default=0, verbose_name='Best load')),
+                ('best_load_date', models.DateField(blank=True, null=True, verbose_name='Best load date')),
+                ('best_estimated_1rm', models.FloatField(default=0, verbose_name='Best estimated 1RM')),
+                ('first_date', models.DateField(verbose_name='First date')),
+                ('last_date', models.DateField(verbose_name='Last date')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Computed at')),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_statistics', to='training.exercise', verbose_name='Exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_statistics', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name_plural': 'Exercise statistics',
+                'constraints': [models.UniqueConstraint(fields=('user', 'exercise'), name='exercise_statistics_unique_user_exercise')],
+            },
+        ),
+    ]
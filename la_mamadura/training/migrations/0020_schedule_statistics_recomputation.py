@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:26
+
+from django.db import migrations
+
+RECOMPUTATION_TASK_NAME = "Recompute training statistics"
+
+
+def schedule_recomputation(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="0",
+        hour="4",
+        day_of_week="1",
+        day_of_month="*",
+        month_of_year="*",
+    )
+    PeriodicTask.objects.get_or_create(
+        name=RECOMPUTATION_TASK_NAME,
+        defaults={
+            "task": "la_mamadura.training.tasks.recompute_training_statistics",
+            "crontab": schedule,
+        },
+    )
+
+
+def unschedule_recomputation(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=RECOMPUTATION_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+        ('training', '0019_statistics'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_recomputation, unschedule_recomputation),
+    ]
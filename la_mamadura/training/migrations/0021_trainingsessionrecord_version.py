@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0020_schedule_statistics_recomputation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0021_trainingsessionrecord_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exerciserecord',
+            index=models.Index(fields=['user', 'exercise', '-date', '-training_session'], include=('id', 'load', 'repetitions'), name='exerciserecord_last_time_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0022_exerciserecord_last_time_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_day', models.DateField(blank=True, null=True, verbose_name='First day')),
+                ('sessions', models.BinaryField(default=bytes, verbose_name='Sessions')),
+                ('volumes', models.BinaryField(default=bytes, verbose_name='Volumes')),
+                ('longest_streak', models.PositiveIntegerField(default=0, verbose_name='Longest streak')),
+                ('last_streak', models.PositiveIntegerField(default=0, verbose_name='Last streak')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='training_calendar', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+        ),
+    ]
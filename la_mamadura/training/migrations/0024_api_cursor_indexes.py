@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0023_trainingcalendar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exerciserecord',
+            index=models.Index(fields=['user', '-date', '-id'], name='exerciserecord_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainingsessionrecord',
+            index=models.Index(fields=['user', '-date', '-id'], name='trainingsession_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weight',
+            index=models.Index(fields=['user', '-date', '-id'], name='weight_user_date_idx'),
+        ),
+    ]
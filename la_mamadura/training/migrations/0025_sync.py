@@ -0,0 +1,97 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0024_api_cursor_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, verbose_name='Idempotency key')),
+                ('result', models.JSONField(verbose_name='Result')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created at')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=64, verbose_name='Model')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Deleted at')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='exerciserecord',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+        migrations.AddField(
+            model_name='trainingsessionrecord',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+        migrations.AddField(
+            model_name='trainingsessiontemplate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+        migrations.AddField(
+            model_name='weight',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+        migrations.AddIndex(
+            model_name='exerciserecord',
+            index=models.Index(fields=['user', 'updated_at'], name='exerciserecord_user_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainingsessionrecord',
+            index=models.Index(fields=['user', 'updated_at'], name='trainingsession_user_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainingsessiontemplate',
+            index=models.Index(fields=['updated_at'], name='trainingtemplate_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weight',
+            index=models.Index(fields=['user', 'updated_at'], name='weight_user_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='syncoperation',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_operations', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AddField(
+            model_name='synctombstone',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sync_tombstones', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AddIndex(
+            model_name='syncoperation',
+            index=models.Index(fields=['created_at'], name='syncoperation_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='syncoperation',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='sync_operation_unique_user_key'),
+        ),
+        migrations.AddIndex(
+            model_name='synctombstone',
+            index=models.Index(fields=['user', 'deleted_at'], name='synctombstone_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='synctombstone',
+            index=models.Index(fields=['deleted_at'], name='synctombstone_deleted_idx'),
+        ),
+    ]
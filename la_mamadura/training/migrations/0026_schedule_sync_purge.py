@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:55
+
+from django.db import migrations
+
+PURGE_TASK_NAME = "Purge old sync records"
+
+
+def schedule_purge(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="30",
+        hour="3",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+    PeriodicTask.objects.get_or_create(
+        name=PURGE_TASK_NAME,
+        defaults={
+            "task": "la_mamadura.training.tasks.purge_old_sync_records",
+            "crontab": schedule,
+        },
+    )
+
+
+def unschedule_purge(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=PURGE_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+        ('training', '0025_sync'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_purge, unschedule_purge),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:50
+
+from django.db import migrations
+
+DRAIN_TASK_NAME = "Drain the training outbox"
+
+
+def schedule_drain(apps, schema_editor):
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=10, period="seconds")
+    PeriodicTask.objects.get_or_create(
+        name=DRAIN_TASK_NAME,
+        defaults={
+            "task": "la_mamadura.training.tasks.drain_training_outbox",
+            "interval": schedule,
+        },
+    )
+
+
+def unschedule_drain(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=DRAIN_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+        ('training', '0028_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_drain, unschedule_drain),
+    ]
@@ -1,3 +1,5 @@
+import datetime
+
 from django.db import models
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -63,13 +65,24 @@ class MuscularGroup(models.Model):
         return self.name
 
 
+class ExerciseQuerySet(models.QuerySet):
+    def targeting(self, area):
+        """
+        Exercises that reach ``area`` (a SubMuscle, Muscle or MuscularGroup)
+        directly or through the muscle hierarchy.
+        """
+        lookup = ExerciseMuscleClosure.target_field_for(area)
+        return self.filter(**{f"muscle_closure__{lookup}": area})
+
+
 class Exercise(models.Model):
     """
     Defines an exercise such as bench press.
     """
 
+    LOAD_UNITS_KG = "KG"
     LOAD_UNITS = (
-        ("KG", "kg"),
+        (LOAD_UNITS_KG, "kg"),
         ("KM", "km"),
         ("M", "m"),
         ("MINUTES", "min"),
@@ -103,6 +116,8 @@ class Exercise(models.Model):
     image = models.ImageField(verbose_name=_("Image"), blank=True, null=True)
     image_url = models.URLField(verbose_name=_("Image URL"), blank=True, null=True)
 
+    objects = ExerciseQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -112,11 +127,119 @@ class Exercise(models.Model):
         ]
 
 
+class ExerciseMuscleClosure(models.Model):
+    """
+    Denormalized closure of the muscle hierarchy reached by an exercise.
+
+    Each row links an exercise to one SubMuscle, Muscle or MuscularGroup,
+    either tagged on the exercise (``direct``) or reached through
+    ``Muscle.submuscles`` and ``MuscularGroup.muscles``. Kept in sync by
+    ``la_mamadura.training.signals``.
+    """
+
+    exercise = models.ForeignKey(
+        Exercise,
+        on_delete=models.CASCADE,
+        related_name="muscle_closure",
+    )
+    submuscle = models.ForeignKey(
+        SubMuscle,
+        on_delete=models.CASCADE,
+        related_name="exercise_closure",
+        blank=True,
+        null=True,
+    )
+    muscle = models.ForeignKey(
+        Muscle,
+        on_delete=models.CASCADE,
+        related_name="exercise_closure",
+        blank=True,
+        null=True,
+    )
+    muscular_group = models.ForeignKey(
+        MuscularGroup,
+        on_delete=models.CASCADE,
+        related_name="exercise_closure",
+        blank=True,
+        null=True,
+    )
+    direct = models.BooleanField(default=False)
+
+    TARGET_FIELDS = {
+        SubMuscle: "submuscle",
+        Muscle: "muscle",
+        MuscularGroup: "muscular_group",
+    }
+
+    @classmethod
+    def target_field_for(cls, area) -> str:
+        try:
+            return cls.TARGET_FIELDS[type(area)]
+        except KeyError:
+            msg = f"{area!r} is not a SubMuscle, Muscle or MuscularGroup."
+            raise TypeError(msg) from None
+
+    def __str__(self):
+        return f"{self.exercise_id} -> {self.submuscle_id or self.muscle_id or self.muscular_group_id}"  # noqa: E501
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(
+                        submuscle__isnull=False,
+                        muscle__isnull=True,
+                        muscular_group__isnull=True,
+                    )
+                    | models.Q(
+                        submuscle__isnull=True,
+                        muscle__isnull=False,
+                        muscular_group__isnull=True,
+                    )
+                    | models.Q(
+                        submuscle__isnull=True,
+                        muscle__isnull=True,
+                        muscular_group__isnull=False,
+                    )
+                ),
+                name="exercise_closure_single_target",
+            ),
+            models.UniqueConstraint(
+                fields=["submuscle", "exercise"],
+                condition=models.Q(submuscle__isnull=False),
+                name="exercise_closure_unique_submuscle",
+            ),
+            models.UniqueConstraint(
+                fields=["muscle", "exercise"],
+                condition=models.Q(muscle__isnull=False),
+                name="exercise_closure_unique_muscle",
+            ),
+            models.UniqueConstraint(
+                fields=["muscular_group", "exercise"],
+                condition=models.Q(muscular_group__isnull=False),
+                name="exercise_closure_unique_muscular_group",
+            ),
+        ]
+
+
 class TrainingSessionRecord(models.Model):
     """
     Registers a training session
+
+    The summary columns are denormalized from the session's ExerciseRecords
+    and maintained by ``la_mamadura.training.summaries``, which also bumps
+    ``version`` on every change to the sets so it can key cached renders.
     """
 
+    STATUS_PENDING = "pending"
+    STATUS_STARTED = "started"
+    STATUS_FINISHED = "finished"
+    STATUSES = (
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_STARTED, _("Started")),
+        (STATUS_FINISHED, _("Finished")),
+    )
+
     user = models.ForeignKey(
         User,
         verbose_name=_("User"),
@@ -124,10 +247,79 @@ class TrainingSessionRecord(models.Model):
         related_name="training_exercise_record",
     )
     date = models.DateField(verbose_name=_("Date"), default=now, blank=True)
+    # The template the session was created from, for the coach dashboard.
+    template = models.ForeignKey(
+        "TrainingSessionTemplate",
+        verbose_name=_("Template"),
+        on_delete=models.SET_NULL,
+        related_name="training_sessions",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
+    set_count = models.PositiveIntegerField(
+        verbose_name=_("Sets"),
+        default=0,
+        editable=False,
+    )
+    exercise_count = models.PositiveIntegerField(
+        verbose_name=_("Exercises"),
+        default=0,
+        editable=False,
+    )
+    completed_set_count = models.PositiveIntegerField(
+        verbose_name=_("Completed sets"),
+        default=0,
+        editable=False,
+    )
+    total_volume = models.FloatField(
+        verbose_name=_("Total volume"),
+        default=0,
+        editable=False,
+    )
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=16,
+        choices=STATUSES,
+        default=STATUS_PENDING,
+        editable=False,
+    )
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version"),
+        default=0,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
+
+    # The date the session was loaded with, set by from_db.
+    loaded_date: datetime.date | None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the training calendar notice a session moved to another day.
+        instance.loaded_date = instance.__dict__.get("date")
+        return instance
 
     def __str__(self):
         return f"{self.user.name} - {self.date}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="trainingsession_date_id_idx"),
+            # Cursor pagination of the API, newest first.
+            models.Index(
+                fields=["user", "-date", "-id"],
+                name="trainingsession_user_date_idx",
+            ),
+            # Delta sync, see la_mamadura.training.sync.
+            models.Index(
+                fields=["user", "updated_at"],
+                name="trainingsession_user_upd_idx",
+            ),
+        ]
+
 
 class ExerciseRecord(models.Model):
     """
@@ -158,12 +350,308 @@ class ExerciseRecord(models.Model):
     )
 
     notes = models.TextField(verbose_name=_("Notes"), blank=True, null=True)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
+
+    # The session and exercise the set was loaded with, set by from_db.
+    loaded_training_session_id: int | None
+    loaded_exercise_id: int | None
+    # Set on the read-only sets rebuilt from the archive.
+    archived = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the session summaries notice a set moved to another session,
+        # and the derived data a set moved to another exercise.
+        instance.loaded_training_session_id = instance.__dict__.get(
+            "training_session_id",
+        )
+        instance.loaded_exercise_id = instance.__dict__.get("exercise_id")
+        return instance
 
     def __str__(self) -> str:
         return f"{self.exercise} - {self.date}: {self.load} {self.exercise.load_units} x {self.repetitions}"  # noqa: E501
 
     class Meta:
         ordering = ["exercise__name", "date"]
+        indexes = [
+            models.Index(fields=["date", "id"], name="exerciserecord_date_id_idx"),
+            models.Index(
+                fields=["user", "-date", "-id"],
+                name="exerciserecord_user_date_idx",
+            ),
+            models.Index(
+                fields=["user", "updated_at"],
+                name="exerciserecord_user_upd_idx",
+            ),
+            # Covers the "last time" lookup, la_mamadura.training.performance.
+            models.Index(
+                fields=["user", "exercise", "-date", "-training_session"],
+                include=["id", "load", "repetitions"],
+                name="exerciserecord_last_time_idx",
+            ),
+        ]
+
+
+class ExerciseRecordArchive(models.Model):
+    """
+    Cold storage for old ExerciseRecords: one compressed columnar blob per
+    user, exercise and year. See ``la_mamadura.training.archive``.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        related_name="exercise_record_archive",
+    )
+    exercise = models.ForeignKey(
+        Exercise,
+        verbose_name=_("Exercise"),
+        on_delete=models.CASCADE,
+        related_name="exercise_record_archive",
+    )
+    year = models.PositiveSmallIntegerField(verbose_name=_("Year"))
+    n_records = models.PositiveIntegerField(verbose_name=_("Records"), default=0)
+    first_date = models.DateField(verbose_name=_("First date"))
+    last_date = models.DateField(verbose_name=_("Last date"))
+    data = models.BinaryField(verbose_name=_("Data"))
+
+    def __str__(self):
+        return f"{self.exercise_id} - {self.year}: {self.n_records} records"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "exercise", "year"],
+                name="exercise_record_archive_unique_year",
+            ),
+        ]
+
+
+class ExerciseStatistics(models.Model):
+    """
+    Statistics of a user's whole history of an exercise, archived sets
+    included. Derived from the sets by ``la_mamadura.training.statistics``.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        related_name="exercise_statistics",
+    )
+    exercise = models.ForeignKey(
+        Exercise,
+        verbose_name=_("Exercise"),
+        on_delete=models.CASCADE,
+        related_name="exercise_statistics",
+    )
+    set_count = models.PositiveIntegerField(verbose_name=_("Sets"), default=0)
+    total_volume = models.FloatField(verbose_name=_("Total volume"), default=0)
+    best_load = models.FloatField(verbose_name=_("Best load"), default=0)
+    best_load_date = models.DateField(
+        verbose_name=_("Best load date"),
+        blank=True,
+        null=True,
+    )
+    best_estimated_1rm = models.FloatField(
+        verbose_name=_("Best estimated 1RM"),
+        default=0,
+    )
+    first_date = models.DateField(verbose_name=_("First date"))
+    last_date = models.DateField(verbose_name=_("Last date"))
+    computed_at = models.DateTimeField(verbose_name=_("Computed at"), default=now)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.exercise_id}: {self.best_load}"
+
+    class Meta:
+        verbose_name_plural = _("Exercise statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "exercise"],
+                name="exercise_statistics_unique_user_exercise",
+            ),
+        ]
+
+
+class StatisticsRecomputation(models.Model):
+    """
+    A full recomputation of ``ExerciseStatistics``, split into chunks of
+    consecutive users that are recomputed in parallel Celery tasks.
+    """
+
+    STATUS_RUNNING = "running"
+    STATUS_FINISHED = "finished"
+    STATUSES = (
+        (STATUS_RUNNING, _("Running")),
+        (STATUS_FINISHED, _("Finished")),
+    )
+
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=16,
+        choices=STATUSES,
+        default=STATUS_RUNNING,
+    )
+    chunk_size = models.PositiveIntegerField(verbose_name=_("Chunk size"))
+    started_at = models.DateTimeField(verbose_name=_("Started at"), default=now)
+    finished_at = models.DateTimeField(
+        verbose_name=_("Finished at"),
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.started_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
+
+    class Meta:
+        ordering = ["-started_at"]
+
+
+class StatisticsRecomputationChunk(models.Model):
+    """
+    The users with ids between ``first_user_id`` and ``last_user_id``
+    (inclusive) of a recomputation. Done chunks are checkpoints: resuming a
+    recomputation only runs the chunks still pending.
+    """
+
+    recomputation = models.ForeignKey(
+        StatisticsRecomputation,
+        verbose_name=_("Recomputation"),
+        on_delete=models.CASCADE,
+        related_name="chunks",
+    )
+    first_user_id = models.BigIntegerField(verbose_name=_("First user id"))
+    last_user_id = models.BigIntegerField(verbose_name=_("Last user id"))
+    done = models.BooleanField(verbose_name=_("Done"), default=False)
+    n_statistics = models.PositiveIntegerField(
+        verbose_name=_("Statistics"),
+        default=0,
+    )
+    finished_at = models.DateTimeField(
+        verbose_name=_("Finished at"),
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.first_user_id}-{self.last_user_id}"
+
+    class Meta:
+        ordering = ["first_user_id"]
+
+
+class TrainingCalendar(models.Model):
+    """
+    A user's training days as compact day arrays starting at ``first_day``,
+    maintained by ``la_mamadura.training.calendar`` as sessions change.
+    """
+
+    user = models.OneToOneField(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        related_name="training_calendar",
+    )
+    first_day = models.DateField(verbose_name=_("First day"), blank=True, null=True)
+    # One byte per day: the number of sessions that day, capped at 255.
+    sessions = models.BinaryField(verbose_name=_("Sessions"), default=bytes)
+    # One float32 per day: the total volume of that day's sessions.
+    volumes = models.BinaryField(verbose_name=_("Volumes"), default=bytes)
+    longest_streak = models.PositiveIntegerField(
+        verbose_name=_("Longest streak"),
+        default=0,
+    )
+    last_streak = models.PositiveIntegerField(
+        verbose_name=_("Last streak"),
+        default=0,
+    )
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.first_day}"
+
+
+class SyncTombstone(models.Model):
+    """
+    Records a deleted row, so the delta sync can tell offline clients to
+    drop it. Shared rows (without user) are deleted for everyone.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        related_name="sync_tombstones",
+        blank=True,
+        null=True,
+    )
+    model = models.CharField(verbose_name=_("Model"), max_length=64)
+    object_id = models.BigIntegerField(verbose_name=_("Object id"))
+    deleted_at = models.DateTimeField(verbose_name=_("Deleted at"), default=now)
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="synctombstone_user_idx"),
+            models.Index(fields=["deleted_at"], name="synctombstone_deleted_idx"),
+        ]
+
+
+class SyncOperation(models.Model):
+    """
+    An offline write already applied, by its client idempotency key, so a
+    retried upload returns the stored result instead of writing twice.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        related_name="sync_operations",
+    )
+    key = models.CharField(verbose_name=_("Idempotency key"), max_length=64)
+    result = models.JSONField(verbose_name=_("Result"))
+    created_at = models.DateTimeField(verbose_name=_("Created at"), default=now)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.key}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"],
+                name="sync_operation_unique_user_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="syncoperation_created_idx"),
+        ]
+
+
+class OutboxEvent(models.Model):
+    """
+    A training data change whose derived data is still to be updated,
+    written in the transaction of the change and applied by
+    ``la_mamadura.training.outbox``.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        related_name="training_outbox_events",
+    )
+    topic = models.CharField(verbose_name=_("Topic"), max_length=32)
+    payload = models.JSONField(verbose_name=_("Payload"), default=dict)
+    created_at = models.DateTimeField(verbose_name=_("Created at"), default=now)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.topic}"
 
 
 class TrainingSessionTemplate(models.Model):
@@ -190,12 +678,16 @@ class TrainingSessionTemplate(models.Model):
         null=True,
     )
     notes = models.TextField(verbose_name=_("Notes"), blank=True, null=True)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
 
     def __str__(self) -> str:
         return self.name
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["updated_at"], name="trainingtemplate_updated_idx"),
+        ]
 
 
 class ExerciseTemplate(models.Model):
@@ -228,9 +720,79 @@ class Weight(models.Model):
         to=User, on_delete=models.CASCADE, verbose_name=_("User"), related_name="weight"
     )
     date = models.DateField(verbose_name=_("Date"), default=now, blank=True)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
 
     def __str__(self):
         return f"{self.weight} kg"
 
     class Meta:
         ordering = ["date"]
+        indexes = [
+            models.Index(fields=["date", "id"], name="weight_date_id_idx"),
+            models.Index(fields=["user", "-date", "-id"], name="weight_user_date_idx"),
+            models.Index(fields=["user", "updated_at"], name="weight_user_updated_idx"),
+        ]
+
+
+class Team(models.Model):
+    """
+    Athletes followed by a coach on the team dashboard, see
+    ``la_mamadura.training.teams``.
+    """
+
+    name = models.CharField(verbose_name=_("Name"), max_length=255)
+    coach = models.ForeignKey(
+        User,
+        verbose_name=_("Coach"),
+        on_delete=models.CASCADE,
+        related_name="coached_teams",
+    )
+    athletes = models.ManyToManyField(
+        User,
+        verbose_name=_("Athletes"),
+        related_name="teams",
+        blank=True,
+    )
+    # Touched when the athletes or assignments change, keys the dashboard.
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ["name"]
+
+
+class TemplateAssignment(models.Model):
+    """
+    A training session template the team's athletes should train from
+    ``sessions_per_week`` times a week.
+    """
+
+    team = models.ForeignKey(
+        Team,
+        verbose_name=_("Team"),
+        on_delete=models.CASCADE,
+        related_name="assignments",
+    )
+    template = models.ForeignKey(
+        TrainingSessionTemplate,
+        verbose_name=_("Template"),
+        on_delete=models.CASCADE,
+        related_name="assignments",
+    )
+    sessions_per_week = models.PositiveSmallIntegerField(
+        verbose_name=_("Sessions per week"),
+        default=1,
+    )
+
+    def __str__(self):
+        return f"{self.team} - {self.sessions_per_week} x {self.template}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "template"],
+                name="templateassignment_unique_team_template",
+            ),
+        ]
@@ -0,0 +1,245 @@
+"""
+Transactional outbox of the derived training data.
+
+Set and bodyweight writes only insert an ``OutboxEvent`` in their own
+transaction (see ``la_mamadura.training.signals`` and
+``la_mamadura.training.batch``), so logging a set no longer waits on the
+leaderboards or the exercise statistics, and no update is lost: the events
+commit or roll back with the change. New sets are added to the statistics and
+leaderboards as they are, without reading the rest of the user's history;
+edits and deletions are applied coalesced into one full recomputation per
+user and exercise.
+
+Once the write commits, the user's events are drained by a task delayed by
+``TRAINING_OUTBOX_DEBOUNCE_SECONDS``. A Redis key per user, set when the task
+is enqueued and cleared when it starts, debounces the task: the other writes
+of the window only count as coalesced, so a workout of 30 sets enqueues a
+task every window rather than one per set. ``drain_outbox``, run every few
+seconds by Celery beat, applies whatever the debounced tasks missed, in
+batches and in id order, one drainer at a time. ``drain_metrics`` has the
+counts of enqueued and coalesced tasks.
+
+Session summaries, calendars and cache versions are still updated in the
+write's transaction: the pages read them right after it.
+"""
+
+import datetime
+import functools
+import logging
+from collections import defaultdict
+
+import redis
+from celery import current_app
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+
+from la_mamadura.training import leaderboards
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import OutboxEvent
+from la_mamadura.training.statistics import add_user_sets
+from la_mamadura.training.statistics import recompute_user_statistics
+
+logger = logging.getLogger(__name__)
+
+SET_CREATED = "set-created"
+SET_CHANGED = "set"
+BODYWEIGHT_CHANGED = "bodyweight"
+
+DRAIN_USER_TASK = "la_mamadura.training.tasks.drain_user_training_outbox"
+SCHEDULED = "scheduled"
+COALESCED = "coalesced"
+
+# Key of the PostgreSQL advisory lock held by the running drainer.
+_DRAIN_LOCK = 0x6F7574626F78
+
+
+def debounce_key(user_id):
+    return f"{settings.TRAINING_OUTBOX_KEY_PREFIX}:debounce:{user_id}"
+
+
+def metrics_key():
+    return f"{settings.TRAINING_OUTBOX_KEY_PREFIX}:metrics"
+
+
+def _enqueue_user_drain(user_id, countdown):
+    current_app.send_task(DRAIN_USER_TASK, args=[user_id], countdown=countdown)
+
+
+def _debounce_user_drain(user_id):
+    window = settings.TRAINING_OUTBOX_DEBOUNCE_SECONDS
+    try:
+        client = leaderboards.get_redis()
+        # The key outlives the window in case the task is lost.
+        scheduled = client.set(debounce_key(user_id), 1, nx=True, ex=window * 2)
+        client.hincrby(metrics_key(), SCHEDULED if scheduled else COALESCED)
+    except redis.RedisError:
+        logger.exception("Could not debounce the training outbox drain.")
+        return
+    if scheduled:
+        _enqueue_user_drain(user_id, window)
+
+
+def _schedule_user_drain(user_id):
+    """
+    Drain the user's events a debounce window after the surrounding
+    transaction commits, with a zero window leaving them to ``drain_outbox``.
+    """
+    if settings.TRAINING_OUTBOX_DEBOUNCE_SECONDS:
+        transaction.on_commit(functools.partial(_debounce_user_drain, user_id))
+
+
+def record_event(user_id, topic, **payload):
+    OutboxEvent.objects.create(user_id=user_id, topic=topic, payload=payload)
+    _schedule_user_drain(user_id)
+
+
+def _set_created_payload(record):
+    day = ExerciseRecord._meta.get_field("date").to_python(record.date)  # noqa: SLF001
+    return {
+        "exercise_id": record.exercise_id,
+        "date": day.isoformat(),
+        "load": record.load,
+        "repetitions": record.repetitions,
+    }
+
+
+def record_set_changes(user_id, exercise_ids, created=()):
+    """
+    Record changes to the user's sets of ``exercise_ids`` and their newly
+    ``created`` sets.
+    """
+    OutboxEvent.objects.bulk_create(
+        [
+            *(
+                OutboxEvent(
+                    user_id=user_id,
+                    topic=SET_CHANGED,
+                    payload={"exercise_id": exercise_id},
+                )
+                for exercise_id in exercise_ids
+            ),
+            *(
+                OutboxEvent(
+                    user_id=user_id,
+                    topic=SET_CREATED,
+                    payload=_set_created_payload(record),
+                )
+                for record in created
+            ),
+        ],
+    )
+    _schedule_user_drain(user_id)
+
+
+def apply_events(events):
+    """
+    Update the data derived from ``events``: with the new sets alone for the
+    exercises whose sets were only created, from all their sets once per user
+    and exercise for the others, and once per user for the bodyweights.
+    """
+    exercises = defaultdict(set)
+    created = defaultdict(list)
+    bodyweights = set()
+    for event in events:
+        if event.topic == SET_CHANGED:
+            exercises[event.user_id].add(event.payload["exercise_id"])
+        elif event.topic == SET_CREATED:
+            created[event.user_id, event.payload["exercise_id"]].append(event)
+        elif event.topic == BODYWEIGHT_CHANGED:
+            bodyweights.add(event.user_id)
+
+    for user_id, exercise_ids in exercises.items():
+        recompute_user_statistics(user_id, user_id, list(exercise_ids))
+        for exercise_id in exercise_ids:
+            leaderboards.refresh_user_exercise(user_id, exercise_id)
+    for (user_id, exercise_id), created_events in created.items():
+        # Already recomputed from all the sets, the new ones included.
+        if exercise_id in exercises.get(user_id, ()):
+            continue
+        sets = [
+            (
+                event.created_at,
+                datetime.date.fromisoformat(event.payload["date"]),
+                event.payload["load"],
+                event.payload["repetitions"],
+            )
+            for event in created_events
+        ]
+        add_user_sets(user_id, exercise_id, sets)
+        leaderboards.record_sets(
+            user_id,
+            exercise_id,
+            [(load, repetitions) for *_, load, repetitions in sets],
+        )
+    for user_id in bodyweights:
+        leaderboards.refresh_user_relative_scores(user_id)
+
+
+def _apply_and_delete(events):
+    apply_events(events)
+    OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+
+
+def _lock_drain():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [_DRAIN_LOCK])
+        return cursor.fetchone()[0]
+
+
+def drain_outbox(batch_size=None):
+    """
+    Apply and delete the pending events, ``batch_size`` per transaction,
+    unless another drainer is running. Returns the number of events applied.
+    """
+    batch_size = batch_size or settings.TRAINING_OUTBOX_BATCH_SIZE
+    applied = 0
+    while True:
+        with transaction.atomic():
+            if not _lock_drain():
+                return applied
+            # Skipping the events a user's drain is applying.
+            events = list(
+                OutboxEvent.objects.order_by("id").select_for_update(
+                    skip_locked=True,
+                )[:batch_size],
+            )
+            if not events:
+                return applied
+            _apply_and_delete(events)
+        applied += len(events)
+
+
+def drain_user_outbox(user_id):
+    """
+    Apply and delete the user's pending events, in one transaction. Returns
+    the number of events applied.
+    """
+    # Writes from now on schedule the next drain. Those before it committed
+    # their events already, so they are drained here.
+    try:
+        leaderboards.get_redis().delete(debounce_key(user_id))
+    except redis.RedisError:
+        logger.exception("Could not reset the training outbox debounce.")
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.filter(user_id=user_id)
+            .order_by("id")
+            .select_for_update(skip_locked=True),
+        )
+        if events:
+            _apply_and_delete(events)
+    return len(events)
+
+
+def drain_metrics():
+    """
+    Counts of the user drain tasks enqueued and of the writes coalesced into
+    them, and of the events pending.
+    """
+    counts = leaderboards.get_redis().hgetall(metrics_key())
+    return {
+        SCHEDULED: int(counts.get(SCHEDULED.encode(), 0)),
+        COALESCED: int(counts.get(COALESCED.encode(), 0)),
+        "pending": OutboxEvent.objects.count(),
+    }
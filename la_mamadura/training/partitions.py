@@ -0,0 +1,247 @@
+"""
+Declarative range partitioning of ``ExerciseRecord`` by ``date``.
+
+The partitioned layout is opt-in through the
+``TRAINING_EXERCISE_RECORD_PARTITIONING`` setting ("month" or "year"). Once
+the table is partitioned, PostgreSQL prunes partitions for queries filtering
+on ``date`` and vacuum / index maintenance only touch the partitions that
+change. Partitions are created ahead of time by the
+``create_exercise_record_partitions`` Celery task.
+
+PostgreSQL requires the partition key to be part of the primary key, so the
+partitioned table is keyed by ``(id, date)``. Django still treats ``id`` as
+the primary key, which stays unique because it comes from a single sequence.
+Indexes on a partitioned table cannot be built ``CONCURRENTLY``, so later
+migrations touching ``ExerciseRecord`` indexes must use plain ``AddIndex``.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db import transaction
+from django.utils import timezone
+
+from la_mamadura.training.models import ExerciseRecord
+
+MONTH = "month"
+YEAR = "year"
+INTERVALS = (MONTH, YEAR)
+
+
+def get_interval():
+    interval = getattr(settings, "TRAINING_EXERCISE_RECORD_PARTITIONING", "")
+    if interval and interval not in INTERVALS:
+        msg = (
+            "TRAINING_EXERCISE_RECORD_PARTITIONING must be one of "
+            f"{', '.join(INTERVALS)}, not {interval!r}."
+        )
+        raise ValueError(msg)
+    return interval or None
+
+
+def partition_bounds(day, interval):
+    """
+    ``[start, end)`` of the partition holding ``day``.
+    """
+    if interval == YEAR:
+        return datetime.date(day.year, 1, 1), datetime.date(day.year + 1, 1, 1)
+    start = datetime.date(day.year, day.month, 1)
+    if day.month == 12:  # noqa: PLR2004
+        return start, datetime.date(day.year + 1, 1, 1)
+    return start, datetime.date(day.year, day.month + 1, 1)
+
+
+def partition_name(start, interval, table=None):
+    table = table or ExerciseRecord._meta.db_table  # noqa: SLF001
+    if interval == YEAR:
+        return f"{table}_p{start:%Y}"
+    return f"{table}_p{start:%Y_%m}"
+
+
+def default_partition_name(table=None):
+    return f"{table or ExerciseRecord._meta.db_table}_default"  # noqa: SLF001
+
+
+def iter_partition_bounds(first_day, last_day, interval):
+    start, end = partition_bounds(first_day, interval)
+    while start <= last_day:
+        yield start, end
+        start, end = partition_bounds(end, interval)
+
+
+def is_partitioned(connection=default_connection, table=None):
+    table = table or ExerciseRecord._meta.db_table  # noqa: SLF001
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = %s AND c.relnamespace = to_regnamespace(current_schema())
+            """,
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions(connection=default_connection, table=None):
+    table = table or ExerciseRecord._meta.db_table  # noqa: SLF001
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [table],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _create_partition(cursor, table, start, end, interval):
+    """
+    Create a partition detached, move into it any rows that landed in the
+    default partition for its range, then attach it. The temporary CHECK
+    constraint lets ATTACH skip its validation scan.
+    """
+    qn = cursor.db.ops.quote_name
+    name = partition_name(start, interval, table)
+    check = f"{name}_bounds"
+    cursor.execute(
+        f"CREATE TABLE {qn(name)} "
+        f"(LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(name)} ADD CONSTRAINT {qn(check)} "
+        "CHECK (date IS NOT NULL AND date >= %s AND date < %s)",
+        [start, end],
+    )
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(default_partition_name(table))} "  # noqa: S608
+        "WHERE date >= %s AND date < %s RETURNING *) "
+        f"INSERT INTO {qn(name)} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+        "FOR VALUES FROM (%s) TO (%s)",
+        [start, end],
+    )
+    cursor.execute(f"ALTER TABLE {qn(name)} DROP CONSTRAINT {qn(check)}")
+    return name
+
+
+def _horizon(day, interval):
+    """
+    End of the partitions to keep ahead of ``day``.
+    """
+    until = day
+    for _ in range(settings.TRAINING_EXERCISE_RECORD_PARTITIONS_AHEAD):
+        until = partition_bounds(until, interval)[1]
+    return until
+
+
+def ensure_partitions(
+    until=None,
+    since=None,
+    interval=None,
+    connection=default_connection,
+):
+    """
+    Create the missing partitions between ``since`` (default: today) and
+    ``until`` (default: ``TRAINING_EXERCISE_RECORD_PARTITIONS_AHEAD``
+    intervals after today). Returns the names of the created partitions.
+    """
+    interval = interval or get_interval()
+    if interval is None or not is_partitioned(connection):
+        return []
+
+    table = ExerciseRecord._meta.db_table  # noqa: SLF001
+    today = timezone.localdate()
+    since = since or today
+    until = until or _horizon(today, interval)
+
+    existing = existing_partitions(connection, table)
+    created = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for start, end in iter_partition_bounds(since, until, interval):
+            if partition_name(start, interval, table) not in existing:
+                created.append(_create_partition(cursor, table, start, end, interval))
+    return created
+
+
+def partition_table(interval=None, connection=default_connection):
+    """
+    Convert the plain ``ExerciseRecord`` table into a range-partitioned one,
+    copying its rows, indexes and foreign keys. Does nothing if it is already
+    partitioned.
+    """
+    interval = interval or get_interval()
+    if interval is None or connection.vendor != "postgresql":
+        return False
+    if is_partitioned(connection):
+        return False
+
+    table = ExerciseRecord._meta.db_table  # noqa: SLF001
+    old_table = f"{table}_unpartitioned"
+    qn = connection.ops.quote_name
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # Deferred FK checks pending in this transaction would block the DDL.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s "
+            "AND schemaname = current_schema() AND indexname <> %s",
+            [table, f"{table}_pkey"],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT min(date), max(date), max(id) FROM {qn(table)}")  # noqa: S608
+        first_day, last_day, last_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} "
+            f"(LIKE {qn(old_table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS, "
+            "PRIMARY KEY (id, date)) PARTITION BY RANGE (date)",
+        )
+        cursor.execute(
+            f"CREATE TABLE {qn(default_partition_name(table))} "
+            f"PARTITION OF {qn(table)} DEFAULT",
+        )
+
+        # Rows outside this range (typos like year 20024) go to the default
+        # partition.
+        today = timezone.localdate()
+        since = min(first_day or today, today)
+        until = max(last_day or today, _horizon(today, interval))
+        for start, end in iter_partition_bounds(since, until, interval):
+            _create_partition(cursor, table, start, end, interval)
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old_table)}")  # noqa: S608
+        cursor.execute(f"DROP TABLE {qn(old_table)}")
+
+        sequence = f"{table}_id_seq"
+        cursor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ALTER COLUMN id "
+            f"SET DEFAULT nextval('{sequence}')",
+        )
+        if last_id is not None:
+            cursor.execute("SELECT setval(%s, %s)", [sequence, last_id])
+
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}",
+            )
+    return True
@@ -0,0 +1,91 @@
+"""
+"Last time" lookup: the sets a user did in their latest earlier session of
+each exercise, shown and used to pre-fill the sets of a new session.
+
+The latest earlier session of all the exercises of a session is found with
+a single ``DISTINCT ON (exercise_id)`` query served by the
+``exerciserecord_last_time_idx`` covering index. Their sets are cached under
+that session's id and version, which only change when its sets do: the sets
+logged during the current session leave the entries alone.
+"""
+
+import datetime
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.summaries import COMPLETED_SET
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class PreviousSet(NamedTuple):
+    date: datetime.date
+    training_session_id: int
+    load: float
+    repetitions: int
+
+
+def _previous_sessions(user_id, exercise_ids, session):
+    # Exercise id -> (session id, version) of its latest earlier session.
+    latest = (
+        ExerciseRecord.objects.filter(
+            COMPLETED_SET,
+            Q(date__lt=session.date) | Q(training_session_id__lt=session.id),
+            user_id=user_id,
+            exercise_id__in=exercise_ids,
+            date__lte=session.date,
+        )
+        .order_by("exercise_id", "-date", "-training_session_id")
+        .distinct("exercise_id")
+        .values_list("exercise_id", "training_session_id", "training_session__version")
+    )
+    return {
+        exercise_id: (session_id, version)
+        for exercise_id, session_id, version in latest
+    }
+
+
+def previous_sets(user_id, exercise_ids, session):
+    """
+    The completed sets of the user's latest session before ``session`` for
+    each of ``exercise_ids``. Returns a dict of exercise id -> list of
+    ``PreviousSet`` in the order they were logged, empty if there is none.
+    """
+    sets: dict[int, list[PreviousSet]] = {
+        exercise_id: [] for exercise_id in exercise_ids
+    }
+    keys = {
+        f"training:last-time:{exercise_id}:{session_id}:{version}": (
+            exercise_id,
+            session_id,
+        )
+        for exercise_id, (session_id, version) in _previous_sessions(
+            user_id,
+            list(sets),
+            session,
+        ).items()
+    }
+    for key, cached in cache.get_many(keys).items():
+        exercise_id, _session_id = keys.pop(key)
+        sets[exercise_id] = cached
+    if not keys:
+        return sets
+
+    missing = Q()
+    for exercise_id, session_id in keys.values():
+        missing |= Q(exercise_id=exercise_id, training_session_id=session_id)
+    fetched = (
+        ExerciseRecord.objects.filter(COMPLETED_SET, missing)
+        .order_by("exercise_id", "id")
+        .values_list("exercise_id", *PreviousSet._fields)
+    )
+    for exercise_id, *values in fetched:
+        sets[exercise_id].append(PreviousSet(*values))
+    cache.set_many(
+        {key: sets[exercise_id] for key, (exercise_id, _session_id) in keys.items()},
+        CACHE_TIMEOUT,
+    )
+    return sets
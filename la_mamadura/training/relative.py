@@ -0,0 +1,122 @@
+"""
+Bodyweight-relative strength: each set's load over the bodyweight the user
+had that day, and its DOTS score. Only loads in kg are comparable with a
+bodyweight, so the other exercises have none.
+
+The bodyweight of a set is the user's latest ``Weight`` on or before the
+set's date, found with an as-of join: the user's bodyweights are read once,
+sorted by date, and every set is matched with a binary search over them, so
+a whole history costs one query for the sets and one for the bodyweights.
+Results are cached for the user's training data version, which bodyweight
+changes bump too, and refreshed by one request while the others are served
+the previous ones.
+"""
+
+import bisect
+import datetime
+from typing import NamedTuple
+
+from la_mamadura.training.archive import exercise_history
+from la_mamadura.training.cache import get_or_refresh
+from la_mamadura.training.cache import user_training_version
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import Weight
+from la_mamadura.users.models import User
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# DOTS polynomial coefficients, from the constant term up, and the
+# bodyweight range they are defined on.
+DOTS_COEFFICIENTS = {
+    User.SEX_MALE: (
+        (-307.75076, 24.0900756, -0.1918759221, 0.0007391293, -0.000001093),
+        (40, 210),
+    ),
+    User.SEX_FEMALE: (
+        (-57.96288, 13.6175032, -0.1126655495, 0.0005158568, -0.0000010706),
+        (40, 150),
+    ),
+}
+
+
+class RelativeSet(NamedTuple):
+    id: int
+    date: datetime.date
+    load: float
+    repetitions: int
+    bodyweight: float | None
+    relative_load: float | None
+    dots: float | None
+
+
+def dots_score(load, bodyweight, sex):
+    """
+    DOTS score of lifting ``load`` at ``bodyweight``, None when the sex is
+    unknown.
+    """
+    if sex not in DOTS_COEFFICIENTS or not bodyweight:
+        return None
+    coefficients, (lowest, highest) = DOTS_COEFFICIENTS[sex]
+    bodyweight = min(max(bodyweight, lowest), highest)
+    denominator = sum(
+        coefficient * bodyweight**power
+        for power, coefficient in enumerate(coefficients)
+    )
+    return load * 500 / denominator
+
+
+def bodyweights(user_id):
+    """
+    The user's ``(dates, weights)``, sorted by date.
+    """
+    rows = list(
+        Weight.objects.filter(user_id=user_id, weight__gt=0)
+        .order_by("date", "id")
+        .values_list("date", "weight"),
+    )
+    return [day for day, _weight in rows], [weight for _day, weight in rows]
+
+
+def bodyweight_as_of(dates, weights, day):
+    """
+    The latest of the sorted ``weights`` dated on or before ``day``.
+    """
+    index = bisect.bisect_right(dates, day)
+    return weights[index - 1] if index else None
+
+
+def _relative_sets(user, exercise_id):
+    dates, weights = bodyweights(user.pk)
+    sets = []
+    for entry in exercise_history(user, [exercise_id])[exercise_id]:
+        if not entry.repetitions or not entry.load:
+            continue
+        bodyweight = bodyweight_as_of(dates, weights, entry.date)
+        sets.append(
+            RelativeSet(
+                id=entry.id,
+                date=entry.date,
+                load=entry.load,
+                repetitions=entry.repetitions,
+                bodyweight=bodyweight,
+                relative_load=entry.load / bodyweight if bodyweight else None,
+                dots=dots_score(entry.load, bodyweight, user.sex),
+            ),
+        )
+    return sets
+
+
+def relative_sets(user, exercise):
+    """
+    The user's completed sets of an exercise, hot and archived, with the
+    bodyweight of their day, their relative load and DOTS score. Empty for
+    the exercises not loaded in kg.
+    """
+    if exercise.load_units != Exercise.LOAD_UNITS_KG:
+        return []
+    return get_or_refresh(
+        f"training:relative-sets:{user.pk}:{exercise.pk}:{user.sex}",
+        lambda: _relative_sets(user, exercise.pk),
+        CACHE_TIMEOUT,
+        version=user_training_version(user.pk),
+    )
@@ -0,0 +1,408 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from la_mamadura.training import local_cache
+from la_mamadura.training.archive import is_archiving
+from la_mamadura.training.archive import move_archived_session
+from la_mamadura.training.cache import bump_user_training_version
+from la_mamadura.training.calendar import refresh_calendar_days
+from la_mamadura.training.catalog import EXERCISES
+from la_mamadura.training.catalog import FACETS
+from la_mamadura.training.catalog import TEMPLATES
+from la_mamadura.training.closure import exercises_reaching
+from la_mamadura.training.closure import rebuild_exercise_closure
+from la_mamadura.training.leaderboards import remove_user
+from la_mamadura.training.leaderboards import user_exercise_ids
+from la_mamadura.training.live import publish_sets
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseTemplate
+from la_mamadura.training.models import Muscle
+from la_mamadura.training.models import MuscularGroup
+from la_mamadura.training.models import SubMuscle
+from la_mamadura.training.models import Team
+from la_mamadura.training.models import TemplateAssignment
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.models import TrainingSessionTemplate
+from la_mamadura.training.models import Weight
+from la_mamadura.training.outbox import BODYWEIGHT_CHANGED
+from la_mamadura.training.outbox import SET_CHANGED
+from la_mamadura.training.outbox import record_event
+from la_mamadura.training.outbox import record_set_changes
+from la_mamadura.training.summaries import refresh_session_summaries
+from la_mamadura.training.sync import record_tombstone
+from la_mamadura.users.models import User
+
+# Exercise muscle closure
+# ------------------------------------------------------------------------------
+
+
+def _changed_pks(instance, action, pk_set, relation):
+    """
+    Primary keys on the "other" side of an m2m change. ``clear`` does not
+    send ``pk_set``, so the related pks are remembered on ``pre_clear``.
+    """
+    attr = f"_closure_pre_clear_{relation}"
+    if action == "pre_clear":
+        manager = getattr(instance, relation)
+        setattr(instance, attr, set(manager.values_list("pk", flat=True)))
+        return set()
+    if action == "post_clear":
+        return getattr(instance, attr, set())
+    if action in ("post_add", "post_remove"):
+        return set(pk_set or ())
+    return set()
+
+
+@receiver(m2m_changed, sender=Exercise.submuscles.through)
+@receiver(m2m_changed, sender=Exercise.muscles.through)
+@receiver(m2m_changed, sender=Exercise.muscular_group.through)
+def update_closure_on_exercise_tags(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    **kwargs,
+):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            rebuild_exercise_closure([instance.pk])
+        return
+
+    # Reverse side: instance is the SubMuscle/Muscle/MuscularGroup and
+    # pk_set holds exercise ids.
+    exercise_ids = _changed_pks(instance, action, pk_set, "exercise")
+    if exercise_ids:
+        rebuild_exercise_closure(exercise_ids)
+
+
+@receiver(m2m_changed, sender=Muscle.submuscles.through)
+def update_closure_on_muscle_submuscles(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    **kwargs,
+):
+    # Only exercises tagged with the moved submuscles can change.
+    if reverse:
+        submuscle_ids = {instance.pk} if action.startswith("post_") else set()
+    else:
+        submuscle_ids = _changed_pks(instance, action, pk_set, "submuscles")
+    if submuscle_ids:
+        rebuild_exercise_closure(exercises_reaching(submuscle__in=submuscle_ids))
+
+
+@receiver(m2m_changed, sender=MuscularGroup.muscles.through)
+def update_closure_on_group_muscles(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    **kwargs,
+):
+    # Only exercises reaching the moved muscles can change.
+    if reverse:
+        muscle_ids = {instance.pk} if action.startswith("post_") else set()
+    else:
+        muscle_ids = _changed_pks(instance, action, pk_set, "muscles")
+    if muscle_ids:
+        rebuild_exercise_closure(exercises_reaching(muscle__in=muscle_ids))
+
+
+@receiver(pre_delete, sender=SubMuscle)
+@receiver(pre_delete, sender=Muscle)
+def remember_closure_on_taxonomy_delete(sender, instance, **kwargs):
+    # Deleting a node cascades its m2m rows without sending m2m_changed, and
+    # the nodes reached *through* it would be left behind.
+    field = "submuscle" if sender is SubMuscle else "muscle"
+    instance._closure_exercise_ids = exercises_reaching(**{field: instance})  # noqa: SLF001
+
+
+@receiver(post_delete, sender=SubMuscle)
+@receiver(post_delete, sender=Muscle)
+def update_closure_on_taxonomy_delete(sender, instance, **kwargs):
+    rebuild_exercise_closure(getattr(instance, "_closure_exercise_ids", ()))
+
+
+# Training session summaries
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=ExerciseRecord)
+def update_session_summary_on_set_save(sender, instance, **kwargs):
+    refresh_session_summaries(
+        [
+            instance.training_session_id,
+            getattr(instance, "loaded_training_session_id", None),
+        ],
+    )
+    instance.loaded_training_session_id = instance.training_session_id
+
+
+@receiver(post_delete, sender=ExerciseRecord)
+def update_session_summary_on_set_delete(sender, instance, origin=None, **kwargs):
+    if is_archiving():
+        return
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model in (TrainingSessionRecord, User):
+        # The session itself is going away.
+        return
+    refresh_session_summaries([instance.training_session_id])
+
+
+# Archived sets
+# ------------------------------------------------------------------------------
+
+
+def _archived_sets_moved(user_id, exercise_ids):
+    if exercise_ids:
+        record_set_changes(user_id, exercise_ids)
+        bump_user_training_version(user_id)
+
+
+@receiver(post_save, sender=TrainingSessionRecord)
+def move_archived_sets_on_session_save(sender, instance, **kwargs):
+    # Runs before the calendar receiver resets ``loaded_date``.
+    loaded_date = getattr(instance, "loaded_date", None)
+    if loaded_date is None or loaded_date == instance.date:
+        return
+    _archived_sets_moved(
+        instance.user_id,
+        move_archived_session(
+            instance.user_id,
+            instance.pk,
+            loaded_date,
+            instance.date,
+        ),
+    )
+
+
+@receiver(post_delete, sender=TrainingSessionRecord)
+def delete_archived_sets_on_session_delete(sender, instance, origin=None, **kwargs):
+    # The archives of a deleted user cascade.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    _archived_sets_moved(
+        instance.user_id,
+        move_archived_session(instance.user_id, instance.pk, instance.date),
+    )
+
+
+# Training calendar
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=TrainingSessionRecord)
+def update_calendar_on_session_save(sender, instance, **kwargs):
+    refresh_calendar_days(
+        instance.user_id,
+        [instance.date, getattr(instance, "loaded_date", None)],
+    )
+    instance.loaded_date = instance.date
+
+
+@receiver(post_delete, sender=TrainingSessionRecord)
+def update_calendar_on_session_delete(sender, instance, origin=None, **kwargs):
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    refresh_calendar_days(instance.user_id, [instance.date])
+
+
+# Cached training data
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=ExerciseRecord)
+def bump_training_version_on_set_save(sender, instance, **kwargs):
+    bump_user_training_version(instance.user_id)
+
+
+@receiver(post_delete, sender=ExerciseRecord)
+def bump_training_version_on_set_delete(sender, instance, origin=None, **kwargs):
+    # Archival only moves old sets, and a deleted user has nothing to cache.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if is_archiving() or origin_model is User:
+        return
+    bump_user_training_version(instance.user_id)
+
+
+@receiver(post_save, sender=TrainingSessionRecord)
+@receiver(post_delete, sender=TrainingSessionRecord)
+def bump_training_version_on_session_change(
+    sender,
+    instance,
+    origin=None,
+    **kwargs,
+):
+    # Team dashboards count the sessions, sets or not.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    bump_user_training_version(instance.user_id)
+
+
+@receiver(post_save, sender=Weight)
+@receiver(post_delete, sender=Weight)
+def bump_training_version_on_bodyweight_change(sender, instance, origin=None, **kwargs):
+    # Relative strength depends on the bodyweights.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    bump_user_training_version(instance.user_id)
+
+
+# Leaderboards and exercise statistics
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=ExerciseRecord)
+def record_outbox_event_on_set_save(sender, instance, created, **kwargs):
+    if created:
+        record_set_changes(instance.user_id, [], created=[instance])
+    else:
+        loaded_exercise_id = getattr(instance, "loaded_exercise_id", None)
+        for exercise_id in {instance.exercise_id, loaded_exercise_id} - {None}:
+            record_event(instance.user_id, SET_CHANGED, exercise_id=exercise_id)
+    instance.loaded_exercise_id = instance.exercise_id
+
+
+@receiver(post_delete, sender=ExerciseRecord)
+def record_outbox_event_on_set_delete(sender, instance, origin=None, **kwargs):
+    # Archival keeps the sets, and deleted users leave the boards as a whole.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if is_archiving() or origin_model is User:
+        return
+    record_event(instance.user_id, SET_CHANGED, exercise_id=instance.exercise_id)
+
+
+@receiver(post_save, sender=Weight)
+@receiver(post_delete, sender=Weight)
+def record_outbox_event_on_bodyweight_change(sender, instance, origin=None, **kwargs):
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    record_event(instance.user_id, BODYWEIGHT_CHANGED)
+
+
+@receiver(pre_delete, sender=User)
+def remove_user_from_leaderboards(sender, instance, **kwargs):
+    remove_user(instance.pk, user_exercise_ids(instance.pk))
+
+
+# Delta sync
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_delete, sender=TrainingSessionRecord)
+@receiver(post_delete, sender=ExerciseRecord)
+@receiver(post_delete, sender=Weight)
+@receiver(post_delete, sender=TrainingSessionTemplate)
+def record_sync_tombstone(sender, instance, origin=None, **kwargs):
+    # Archival keeps the sets, deleted users don't sync anymore and clients
+    # drop a deleted session's sets along with it.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if is_archiving() or origin_model is User:
+        return
+    if sender is ExerciseRecord and origin_model is TrainingSessionRecord:
+        return
+    record_tombstone(instance, instance.user_id)
+
+
+@receiver(post_save, sender=ExerciseTemplate)
+@receiver(post_delete, sender=ExerciseTemplate)
+def touch_template_on_exercise_change(sender, instance, **kwargs):
+    # Templates sync with their exercises.
+    TrainingSessionTemplate.objects.filter(pk=instance.template_id).update(
+        updated_at=timezone.now(),
+    )
+
+
+# Live session updates
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=ExerciseRecord)
+def publish_set_save(sender, instance, **kwargs):
+    publish_sets(instance.training_session_id, saved=[instance])
+
+
+@receiver(post_delete, sender=ExerciseRecord)
+def publish_set_delete(sender, instance, origin=None, **kwargs):
+    # Archived sessions and deleted sessions or users have no one watching.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if is_archiving() or origin_model in (TrainingSessionRecord, User):
+        return
+    publish_sets(instance.training_session_id, deleted=[instance])
+
+
+# Team dashboards
+# ------------------------------------------------------------------------------
+
+
+@receiver(m2m_changed, sender=Team.athletes.through)
+def touch_team_on_athletes_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # Changed from the athlete's side: pk_set holds the teams, and clears
+        # only tell them before they happen.
+        if action == "pre_clear":
+            teams = Team.objects.filter(athletes=instance)
+        elif action in ("post_add", "post_remove"):
+            teams = Team.objects.filter(pk__in=pk_set)
+        else:
+            return
+    elif action in ("post_add", "post_remove", "post_clear"):
+        teams = Team.objects.filter(pk=instance.pk)
+    else:
+        return
+    teams.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=TemplateAssignment)
+@receiver(post_delete, sender=TemplateAssignment)
+def touch_team_on_assignment_change(sender, instance, **kwargs):
+    Team.objects.filter(pk=instance.team_id).update(updated_at=timezone.now())
+
+
+# Catalog cache
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+def invalidate_exercise_catalog(sender, **kwargs):
+    local_cache.invalidate(EXERCISES)
+    # Deleted exercises take their closure rows along.
+    local_cache.invalidate(FACETS)
+
+
+@receiver(post_save, sender=MuscularGroup)
+@receiver(post_delete, sender=MuscularGroup)
+@receiver(post_delete, sender=Muscle)
+@receiver(post_delete, sender=SubMuscle)
+@receiver(m2m_changed, sender=Exercise.submuscles.through)
+@receiver(m2m_changed, sender=Exercise.muscles.through)
+@receiver(m2m_changed, sender=Exercise.muscular_group.through)
+@receiver(m2m_changed, sender=Muscle.submuscles.through)
+@receiver(m2m_changed, sender=MuscularGroup.muscles.through)
+def invalidate_muscular_group_facets(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        local_cache.invalidate(FACETS)
+
+
+@receiver(post_save, sender=TrainingSessionTemplate)
+@receiver(post_delete, sender=TrainingSessionTemplate)
+def invalidate_template_choices(sender, **kwargs):
+    # Shared templates are in everyone's list, and templates change hands in
+    # the admin: template edits are rare enough to drop every list.
+    local_cache.invalidate(TEMPLATES)
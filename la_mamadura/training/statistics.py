@@ -0,0 +1,201 @@
+"""
+Derived per-exercise statistics (personal records, volume, set counts) of
+every user, kept in ``ExerciseStatistics``.
+
+They are recomputed in full by a sharded workflow: a recomputation splits the
+users into chunks of ``TRAINING_STATISTICS_CHUNK_SIZE`` consecutive ids, and
+each chunk, run as its own Celery task, reads the sets of all its users with
+one query (plus one for their archives) and replaces their statistics in
+bulk. Done chunks are checkpoints, so an interrupted recomputation is resumed
+by running only the chunks still pending. In between, ``add_user_sets`` adds
+the newly logged sets to the statistics.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from la_mamadura.training.archive import unpack_entries
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseRecordArchive
+from la_mamadura.training.models import ExerciseStatistics
+from la_mamadura.training.models import StatisticsRecomputation
+from la_mamadura.training.models import StatisticsRecomputationChunk
+from la_mamadura.users.models import User
+
+
+def estimated_one_rep_max(load, repetitions):
+    """
+    Epley's estimate of the one repetition maximum.
+    """
+    if not repetitions or load <= 0:
+        return 0
+    if repetitions == 1:
+        return load
+    return load * (1 + repetitions / 30)
+
+
+def _add_set(statistics, day, load, repetitions):
+    statistics.set_count += 1
+    statistics.total_volume += load * repetitions
+    if repetitions and (
+        load > statistics.best_load
+        or (load == statistics.best_load and day < statistics.best_load_date)
+    ):
+        statistics.best_load = load
+        statistics.best_load_date = day
+    statistics.best_estimated_1rm = max(
+        statistics.best_estimated_1rm,
+        estimated_one_rep_max(load, repetitions),
+    )
+    statistics.first_date = min(statistics.first_date, day)
+    statistics.last_date = max(statistics.last_date, day)
+
+
+def recompute_user_statistics(first_user_id, last_user_id, exercise_ids=None):
+    """
+    Replace the statistics of the users with ids between ``first_user_id``
+    and ``last_user_id`` (inclusive), of all their exercises or only of
+    ``exercise_ids``. Returns the number of statistics rows.
+    """
+    computed_at = timezone.now()
+    statistics = {}
+
+    def add(user_id, exercise_id, day, load, repetitions):
+        key = (user_id, exercise_id)
+        if key not in statistics:
+            statistics[key] = ExerciseStatistics(
+                user_id=user_id,
+                exercise_id=exercise_id,
+                best_load_date=day,
+                first_date=day,
+                last_date=day,
+                computed_at=computed_at,
+            )
+        _add_set(statistics[key], day, load, repetitions)
+
+    scope = {"user_id__gte": first_user_id, "user_id__lte": last_user_id}
+    if exercise_ids is not None:
+        scope["exercise_id__in"] = exercise_ids
+    for values in (
+        ExerciseRecord.objects.filter(**scope)
+        .order_by()
+        .values_list("user_id", "exercise_id", "date", "load", "repetitions")
+        .iterator(chunk_size=10_000)
+    ):
+        add(*values)
+    for user_id, exercise_id, data in (
+        ExerciseRecordArchive.objects.filter(**scope)
+        .order_by()
+        .values_list("user_id", "exercise_id", "data")
+    ):
+        for entry in unpack_entries(data):
+            add(user_id, exercise_id, entry.date, entry.load, entry.repetitions)
+
+    for exercise_statistics in statistics.values():
+        if not exercise_statistics.best_load:
+            exercise_statistics.best_load_date = None
+    with transaction.atomic():
+        ExerciseStatistics.objects.filter(**scope).delete()
+        ExerciseStatistics.objects.bulk_create(statistics.values(), batch_size=1000)
+    return len(statistics)
+
+
+def add_user_sets(user_id, exercise_id, sets):
+    """
+    Add newly logged ``(logged_at, day, load, repetitions)`` sets to the
+    user's statistics of an exercise, without reading their other sets. Sets
+    logged before the statistics were last computed in full are in them
+    already.
+    """
+    with transaction.atomic():
+        statistics = (
+            ExerciseStatistics.objects.select_for_update()
+            .filter(user_id=user_id, exercise_id=exercise_id)
+            .first()
+        )
+        for logged_at, day, load, repetitions in sets:
+            if statistics is None:
+                statistics = ExerciseStatistics(
+                    user_id=user_id,
+                    exercise_id=exercise_id,
+                    first_date=day,
+                    last_date=day,
+                    computed_at=logged_at,
+                )
+            elif logged_at < statistics.computed_at:
+                continue
+            if statistics.best_load_date is None:
+                statistics.best_load_date = day
+            _add_set(statistics, day, load, repetitions)
+        if statistics is not None:
+            if not statistics.best_load:
+                statistics.best_load_date = None
+            statistics.save()
+
+
+def start_recomputation(chunk_size=None):
+    """
+    Create a recomputation with one pending chunk per ``chunk_size`` users.
+    """
+    chunk_size = chunk_size or settings.TRAINING_STATISTICS_CHUNK_SIZE
+    user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+    with transaction.atomic():
+        recomputation = StatisticsRecomputation.objects.create(chunk_size=chunk_size)
+        StatisticsRecomputationChunk.objects.bulk_create(
+            StatisticsRecomputationChunk(
+                recomputation=recomputation,
+                first_user_id=user_ids[start],
+                last_user_id=user_ids[min(start + chunk_size, len(user_ids)) - 1],
+            )
+            for start in range(0, len(user_ids), chunk_size)
+        )
+    finish_recomputation(recomputation.pk)
+    return recomputation
+
+
+def unfinished_recomputation():
+    return (
+        StatisticsRecomputation.objects.filter(
+            status=StatisticsRecomputation.STATUS_RUNNING,
+        )
+        .order_by("-started_at")
+        .first()
+    )
+
+
+def recompute_chunk(chunk_id):
+    """
+    Recompute a chunk's users and check the chunk off, atomically. Returns
+    the number of statistics rows of the chunk.
+    """
+    with transaction.atomic():
+        chunk = StatisticsRecomputationChunk.objects.select_for_update().get(
+            pk=chunk_id,
+        )
+        if not chunk.done:
+            chunk.n_statistics = recompute_user_statistics(
+                chunk.first_user_id,
+                chunk.last_user_id,
+            )
+            chunk.done = True
+            chunk.finished_at = timezone.now()
+            chunk.save(update_fields=["n_statistics", "done", "finished_at"])
+    return chunk.n_statistics
+
+
+def finish_recomputation(recomputation_id):
+    """
+    Mark the recomputation finished if none of its chunks is pending.
+    """
+    return bool(
+        StatisticsRecomputation.objects.filter(
+            pk=recomputation_id,
+            status=StatisticsRecomputation.STATUS_RUNNING,
+        )
+        .exclude(chunks__done=False)
+        .update(
+            status=StatisticsRecomputation.STATUS_FINISHED,
+            finished_at=timezone.now(),
+        ),
+    )
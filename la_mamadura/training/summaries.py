@@ -0,0 +1,101 @@
+"""
+Denormalized summary columns of ``TrainingSessionRecord``.
+
+Every write to an ``ExerciseRecord`` re-aggregates the sets of the touched
+sessions inside the same transaction (see ``la_mamadura.training.signals``),
+so session lists, calendars and dashboards can render from the session table
+alone. Code writing sets in bulk (``bulk_create``, ``QuerySet.update``) must
+call ``refresh_session_summaries`` itself. The archived sets of old sessions
+(see ``la_mamadura.training.archive``) count too.
+"""
+
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Sum
+from django.db.models.functions import Now
+
+from la_mamadura.training.archive import archived_session_entries
+from la_mamadura.training.calendar import refresh_calendar_days
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import TrainingSessionRecord
+
+# Same rule as the session page: a set is done once it has load and reps.
+COMPLETED_SET = Q(repetitions__gt=0) & ~Q(load=0)
+
+
+def session_status(set_count, completed_set_count):
+    if not completed_set_count:
+        return TrainingSessionRecord.STATUS_PENDING
+    if completed_set_count == set_count:
+        return TrainingSessionRecord.STATUS_FINISHED
+    return TrainingSessionRecord.STATUS_STARTED
+
+
+def refresh_session_summaries(session_ids):
+    """
+    Recompute the summary columns of ``session_ids`` from their sets, with
+    one grouped aggregate and row locks taken in id order, bump their
+    version and refresh their days in the training calendar.
+    """
+    session_ids = sorted({pk for pk in session_ids if pk is not None})
+    if not session_ids:
+        return
+
+    with transaction.atomic():
+        sessions = list(
+            TrainingSessionRecord.objects.filter(pk__in=session_ids)
+            .select_for_update()
+            .order_by("pk")
+            .values_list("pk", "user_id", "date"),
+        )
+        aggregates = {
+            row.pop("training_session_id"): row
+            for row in ExerciseRecord.objects.filter(
+                training_session_id__in=session_ids,
+            )
+            .order_by()
+            .values("training_session_id")
+            .annotate(
+                set_count=Count("id"),
+                exercise_ids=ArrayAgg("exercise_id", distinct=True),
+                completed_set_count=Count("id", filter=COMPLETED_SET),
+                total_volume=Sum(F("load") * F("repetitions")),
+            )
+        }
+        for session_id, user_id, day in sessions:
+            summary = aggregates.get(session_id, {})
+            set_count = summary.get("set_count", 0)
+            exercise_ids = set(summary.get("exercise_ids", ()))
+            completed_set_count = summary.get("completed_set_count", 0)
+            total_volume = summary.get("total_volume") or 0
+            for exercise_id, entry in archived_session_entries(
+                user_id,
+                session_id,
+                day,
+            ):
+                set_count += 1
+                exercise_ids.add(exercise_id)
+                if entry.repetitions > 0 and entry.load:
+                    completed_set_count += 1
+                total_volume += entry.load * entry.repetitions
+            TrainingSessionRecord.objects.filter(pk=session_id).update(
+                version=F("version") + 1,
+                updated_at=Now(),
+                set_count=set_count,
+                exercise_count=len(exercise_ids),
+                completed_set_count=completed_set_count,
+                total_volume=total_volume,
+                status=session_status(set_count, completed_set_count),
+            )
+
+        # The volumes of the sessions' days changed too.
+        days_by_user = defaultdict(set)
+        for _session_id, user_id, day in sessions:
+            days_by_user[user_id].add(day)
+        for user_id, days in days_by_user.items():
+            refresh_calendar_days(user_id, days)
@@ -0,0 +1,134 @@
+"""
+Delta sync for offline-first clients.
+
+Synced rows carry an ``updated_at`` timestamp and deletions leave a
+``SyncTombstone``, so a client holding a sync token only downloads what
+changed since the token was issued. Tokens are signed server timestamps;
+rows changed up to ``TRAINING_SYNC_OVERLAP_SECONDS`` before them are sent
+again, since a transaction can commit after a later sync read its snapshot,
+and clients upsert by id. Tokens older than ``TRAINING_SYNC_RETENTION_DAYS``,
+when tombstones are purged, ask the client for a full download.
+
+Offline writes are uploaded with client idempotency keys. An applied key is
+stored with its result in ``SyncOperation``, so a retried upload never writes
+twice.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from la_mamadura.training.models import SyncOperation
+from la_mamadura.training.models import SyncTombstone
+
+SIGNING_SALT = "la_mamadura.training.sync"
+
+
+class InvalidSyncTokenError(ValueError):
+    pass
+
+
+def make_token(moment=None):
+    return signing.dumps((moment or timezone.now()).isoformat(), salt=SIGNING_SALT)
+
+
+def read_token(token):
+    try:
+        return datetime.datetime.fromisoformat(signing.loads(token, salt=SIGNING_SALT))
+    except (signing.BadSignature, TypeError, ValueError) as error:
+        msg = "Invalid sync token."
+        raise InvalidSyncTokenError(msg) from error
+
+
+def retention_horizon():
+    return timezone.now() - datetime.timedelta(
+        days=settings.TRAINING_SYNC_RETENTION_DAYS,
+    )
+
+
+def changes_window(token):
+    """
+    The moment rows have to be newer than to be sent for ``token``, None for
+    a full download. Returns ``(since, reset)``, ``reset`` telling the client
+    to drop its local copy first.
+    """
+    if not token:
+        return None, False
+    issued_at = read_token(token)
+    if issued_at < retention_horizon():
+        return None, True
+    overlap = datetime.timedelta(seconds=settings.TRAINING_SYNC_OVERLAP_SECONDS)
+    return issued_at - overlap, False
+
+
+def deleted_since(user, since):
+    """
+    Model label -> ids of the user's (and shared) rows deleted after
+    ``since``.
+    """
+    deleted: dict[str, list[int]] = {}
+    for model, object_id in (
+        SyncTombstone.objects.filter(
+            Q(user=user) | Q(user__isnull=True),
+            deleted_at__gt=since,
+        )
+        .order_by("deleted_at")
+        .values_list("model", "object_id")
+    ):
+        deleted.setdefault(model, []).append(object_id)
+    return deleted
+
+
+def record_tombstone(instance, user_id):
+    SyncTombstone.objects.create(
+        user_id=user_id,
+        model=instance._meta.label_lower,  # noqa: SLF001
+        object_id=instance.pk,
+    )
+
+
+def applied_result(user, key):
+    return (
+        SyncOperation.objects.filter(user=user, key=key)
+        .values_list("result", flat=True)
+        .first()
+    )
+
+
+def run_once(user, key, operation):
+    """
+    Run ``operation`` unless ``key`` was already applied. Returns
+    ``(result, duplicate)``; only successful results, those without
+    ``errors``, are remembered.
+    """
+    result = applied_result(user, key)
+    if result is not None:
+        return result, True
+    try:
+        with transaction.atomic():
+            result = operation()
+            if "errors" not in result:
+                SyncOperation.objects.create(user=user, key=key, result=result)
+    except IntegrityError:
+        # The same upload raced us and won.
+        result = applied_result(user, key)
+        if result is None:
+            raise
+        return result, True
+    return result, False
+
+
+def purge_sync_records():
+    """
+    Drop the tombstones and idempotency keys past the retention. Returns the
+    number of rows deleted.
+    """
+    horizon = retention_horizon()
+    n_tombstones, _ = SyncTombstone.objects.filter(deleted_at__lt=horizon).delete()
+    n_operations, _ = SyncOperation.objects.filter(created_at__lt=horizon).delete()
+    return n_tombstones + n_operations
@@ -0,0 +1,82 @@
+from celery import chord
+from celery import shared_task
+
+from .archive import archive_exercise_records
+from .models import StatisticsRecomputationChunk
+from .outbox import drain_outbox
+from .outbox import drain_user_outbox
+from .partitions import ensure_partitions
+from .statistics import finish_recomputation
+from .statistics import recompute_chunk
+from .statistics import start_recomputation
+from .statistics import unfinished_recomputation
+from .sync import purge_sync_records
+
+
+@shared_task()
+def create_exercise_record_partitions():
+    """Pre-create the ExerciseRecord partitions of the coming intervals."""
+    return ensure_partitions()
+
+
+@shared_task()
+def archive_old_exercise_records():
+    """Move sets older than TRAINING_ARCHIVE_AFTER_DAYS to the archive."""
+    return archive_exercise_records()
+
+
+@shared_task()
+def recompute_training_statistics(chunk_size=None):
+    """
+    Resume the unfinished statistics recomputation, or start a new one.
+    """
+    recomputation = unfinished_recomputation() or start_recomputation(chunk_size)
+    return resume_statistics_recomputation(recomputation.pk)
+
+
+@shared_task()
+def resume_statistics_recomputation(recomputation_id):
+    """
+    Run the pending chunks of a recomputation in parallel, then close it.
+    """
+    chunk_ids = list(
+        StatisticsRecomputationChunk.objects.filter(
+            recomputation_id=recomputation_id,
+            done=False,
+        ).values_list("pk", flat=True),
+    )
+    if chunk_ids:
+        chord(recompute_statistics_chunk.si(chunk_id) for chunk_id in chunk_ids)(
+            finish_statistics_recomputation.si(recomputation_id),
+        )
+    return len(chunk_ids)
+
+
+@shared_task()
+def recompute_statistics_chunk(chunk_id):
+    """Recompute the statistics of one chunk of users."""
+    return recompute_chunk(chunk_id)
+
+
+@shared_task()
+def finish_statistics_recomputation(recomputation_id):
+    """Close the recomputation once all its chunks are done."""
+    return finish_recomputation(recomputation_id)
+
+
+@shared_task()
+def purge_old_sync_records():
+    """Drop the sync tombstones and idempotency keys past their retention."""
+    return purge_sync_records()
+
+
+@shared_task()
+def drain_training_outbox():
+    """Apply the pending training outbox events."""
+    return drain_outbox()
+
+
+@shared_task()
+def drain_user_training_outbox(user_id):
+    """Apply the pending training outbox events of one user."""
+    return drain_user_outbox(user_id)
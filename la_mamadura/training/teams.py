@@ -0,0 +1,163 @@
+"""
+Coach dashboard: the recent training of every athlete of a team.
+
+The whole team is read with a fixed number of grouped queries, whatever its
+size: the athletes, their weekly session counts and volumes (with the
+sessions trained from the team's assigned templates, for the adherence),
+their latest sessions of the period through a window query and their recent
+PRs from the ``ExerciseStatistics`` rollups, as of their last recomputation.
+The dashboard is cached per team for the team's ``updated_at`` and its
+athletes' training data versions, read in one cache round trip. After any
+change to a member's training or to the team, one request rebuilds it while
+the others are served the previous one (see
+``la_mamadura.training.cache.get_or_refresh``).
+"""
+
+import datetime
+import hashlib
+from dataclasses import dataclass
+from dataclasses import field
+
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Sum
+from django.db.models import Window
+from django.db.models.functions import RowNumber
+from django.db.models.functions import TruncWeek
+
+from la_mamadura.training.cache import get_or_refresh
+from la_mamadura.training.cache import user_training_versions
+from la_mamadura.training.models import ExerciseStatistics
+from la_mamadura.training.models import TrainingSessionRecord
+
+CACHE_TIMEOUT = 60 * 60
+DEFAULT_WEEKS = 4
+RECENT_SESSIONS = 3
+
+
+@dataclass
+class AthleteSummary:
+    id: int
+    name: str
+    # ``(sessions, volume)`` of each dashboard week, oldest first.
+    weeks: list = field(default_factory=list)
+    recent_sessions: list = field(default_factory=list)
+    # ``(exercise name, best load, date)`` of the PRs set in the period.
+    prs: list = field(default_factory=list)
+    # Share of the assigned sessions trained, None without assignments.
+    adherence: float | None = None
+
+    @property
+    def last_session_date(self):
+        return self.recent_sessions[0]["date"] if self.recent_sessions else None
+
+
+def dashboard_weeks(today, weeks=DEFAULT_WEEKS):
+    """
+    Mondays of the last ``weeks`` weeks, the current one included.
+    """
+    monday = today - datetime.timedelta(days=today.weekday())
+    return [monday - datetime.timedelta(weeks=n) for n in reversed(range(weeks))]
+
+
+def _weekly_totals(athlete_ids, start, template_ids):
+    rows = (
+        TrainingSessionRecord.objects.filter(user_id__in=athlete_ids, date__gte=start)
+        .annotate(week=TruncWeek("date"))
+        .order_by()
+        .values("user_id", "week")
+        .annotate(
+            n_sessions=Count("id"),
+            volume=Sum("total_volume"),
+            n_assigned=Count("id", filter=Q(template_id__in=template_ids)),
+        )
+    )
+    return {(row["user_id"], row["week"]): row for row in rows}
+
+
+def _recent_sessions(athlete_ids, start):
+    # Bounded by the dashboard weeks, so the window only ranks their sessions.
+    rows = (
+        TrainingSessionRecord.objects.filter(user_id__in=athlete_ids, date__gte=start)
+        .annotate(
+            row=Window(
+                RowNumber(),
+                partition_by=[F("user_id")],
+                order_by=[F("date").desc(), F("id").desc()],
+            ),
+        )
+        .filter(row__lte=RECENT_SESSIONS)
+        .order_by("user_id", "row")
+        .values("id", "user_id", "date", "status", "exercise_count", "total_volume")
+    )
+    sessions: dict[int, list[dict]] = {athlete_id: [] for athlete_id in athlete_ids}
+    for row in rows:
+        sessions[row.pop("user_id")].append(row)
+    return sessions
+
+
+def _recent_prs(athlete_ids, start):
+    rows = (
+        ExerciseStatistics.objects.filter(
+            user_id__in=athlete_ids,
+            best_load_date__gte=start,
+        )
+        .order_by("user_id", "-best_load_date", "exercise__name")
+        .values_list("user_id", "exercise__name", "best_load", "best_load_date")
+    )
+    prs: dict[int, list[tuple]] = {athlete_id: [] for athlete_id in athlete_ids}
+    for athlete_id, *pr in rows:
+        prs[athlete_id].append(tuple(pr))
+    return prs
+
+
+def _build_dashboard(team, athletes, weeks):
+    athlete_ids = [athlete.id for athlete in athletes]
+    assignments = list(team.assignments.values_list("template_id", "sessions_per_week"))
+    per_week = sum(sessions for _template_id, sessions in assignments)
+    totals = _weekly_totals(
+        athlete_ids,
+        weeks[0],
+        [template_id for template_id, _sessions in assignments],
+    )
+    recent_sessions = _recent_sessions(athlete_ids, weeks[0])
+    prs = _recent_prs(athlete_ids, weeks[0])
+
+    summaries = []
+    for athlete in athletes:
+        summary = AthleteSummary(
+            id=athlete.id,
+            name=athlete.name or athlete.email,
+            recent_sessions=recent_sessions[athlete.id],
+            prs=prs[athlete.id],
+        )
+        trained = 0
+        for week in weeks:
+            row = totals.get((athlete.id, week), {})
+            summary.weeks.append((row.get("n_sessions", 0), row.get("volume") or 0))
+            trained += min(row.get("n_assigned", 0), per_week)
+        if per_week:
+            summary.adherence = trained / (per_week * len(weeks))
+        summaries.append(summary)
+    return summaries
+
+
+def team_dashboard(team, today, weeks=DEFAULT_WEEKS):
+    """
+    ``AthleteSummary`` of every athlete of the team over the last ``weeks``
+    weeks, from the cache when none of them trained since.
+    """
+    weeks = dashboard_weeks(today, weeks)
+    athletes = list(team.athletes.order_by("name", "id").only("id", "name", "email"))
+    versions = user_training_versions([athlete.id for athlete in athletes])
+    digest = hashlib.blake2b(
+        repr(sorted(versions.items())).encode(),
+        digest_size=16,
+    ).hexdigest()
+    return get_or_refresh(
+        f"training:team-dashboard:{team.pk}:{today}:{len(weeks)}",
+        lambda: _build_dashboard(team, athletes, weeks),
+        CACHE_TIMEOUT,
+        version=f"{team.updated_at.timestamp()}:{digest}",
+    )
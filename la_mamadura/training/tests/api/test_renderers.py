@@ -0,0 +1,111 @@
+import datetime
+from http import HTTPStatus
+
+import msgpack
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.training.tests.factories import WeightFactory
+from la_mamadura.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def sets(user):
+    session = TrainingSessionRecordFactory.create(
+        user=user,
+        date=datetime.date(2026, 3, 1),
+    )
+    return ExerciseRecordFactory.create_batch(
+        3,
+        training_session=session,
+        user=user,
+        date=session.date,
+        load=100,
+        repetitions=5,
+    )
+
+
+def test_columnar_layout_has_one_array_per_field(api_client, sets):
+    response = api_client.get(
+        reverse("api:exerciserecord-list"),
+        HTTP_ACCEPT="application/vnd.lamamadura.columnar+json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()["results"]
+    assert results["id"] == sorted((record.pk for record in sets), reverse=True)
+    assert results["date"] == ["2026-03-01"] * 3
+    assert results["repetitions"] == [5] * 3
+
+
+def test_sparse_fieldsets(api_client, sets):
+    response = api_client.get(
+        reverse("api:exerciserecord-list"),
+        {"fields": "date,load,repetitions", "format": "columnar"},
+    )
+
+    assert set(response.json()["results"]) == {"date", "load", "repetitions"}
+
+
+def test_sparse_fieldsets_leave_writes_alone(api_client, user):
+    response = api_client.post(
+        f"{reverse('api:weight-list')}?fields=id",
+        {"date": "2026-03-01", "weight": 80},
+        format="json",
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()["weight"] == 80  # noqa: PLR2004
+
+
+def test_messagepack_round_trip(api_client, user):
+    WeightFactory.create(user=user, date=datetime.date(2026, 3, 1), weight=80.5)
+
+    response = api_client.get(
+        reverse("api:weight-list"),
+        {"fields": "date,weight"},
+        HTTP_ACCEPT="application/msgpack",
+    )
+
+    assert response["Content-Type"] == "application/msgpack"
+    data = msgpack.unpackb(response.content)
+    assert data["results"] == [{"date": "2026-03-01", "weight": 80.5}]
+
+    response = api_client.post(
+        reverse("api:weight-list"),
+        msgpack.packb({"date": "2026-03-02", "weight": 81}),
+        content_type="application/msgpack",
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+
+@pytest.mark.parametrize("body", [b"\xc1", b"\x92\x01", b"\x01\x02"])
+def test_malformed_messagepack_is_a_bad_request(api_client, body):
+    response = api_client.post(
+        reverse("api:weight-list"),
+        body,
+        content_type="application/msgpack",
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_compact_formats_are_smaller(api_client, sets):
+    url = reverse("api:exerciserecord-list")
+    json_size = len(api_client.get(url).content)
+    columnar_size = len(api_client.get(url, {"format": "columnar"}).content)
+    msgpack_size = len(api_client.get(url, {"format": "msgpack"}).content)
+
+    assert columnar_size < json_size
+    assert msgpack_size < json_size
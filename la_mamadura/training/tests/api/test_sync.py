@@ -0,0 +1,186 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import SyncTombstone
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.sync import make_token
+from la_mamadura.training.sync import purge_sync_records
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.training.tests.factories import WeightFactory
+from la_mamadura.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def no_overlap(settings):
+    settings.TRAINING_SYNC_OVERLAP_SECONDS = 0
+
+
+def _sync(api_client, token=None):
+    params = {"token": token} if token else {}
+    response = api_client.get(reverse("api:sync"), params)
+    assert response.status_code == HTTPStatus.OK, response.content
+    return response.json()
+
+
+def test_pull_sends_only_the_changes_since_the_token(api_client, user, no_overlap):
+    session = TrainingSessionRecordFactory.create(user=user)
+    doomed = ExerciseRecordFactory.create(training_session=session)
+    kept = ExerciseRecordFactory.create(training_session=session)
+    WeightFactory.create(user=user)
+    ExerciseRecordFactory.create()
+
+    full = _sync(api_client)
+    assert [row["id"] for row in full["changed"]["sets"]] == [doomed.id, kept.id]
+    assert len(full["changed"]["weights"]) == 1
+    assert full["deleted"] == {}
+
+    doomed_id = doomed.id
+    doomed.delete()
+    kept.load = 99
+    kept.save()
+    delta = _sync(api_client, full["token"])
+
+    assert delta["reset"] is False
+    assert [row["id"] for row in delta["changed"]["sets"]] == [kept.id]
+    # The session's summary changed with its sets.
+    assert [row["id"] for row in delta["changed"]["sessions"]] == [session.id]
+    assert delta["changed"]["weights"] == []
+    assert delta["deleted"] == {"sets": [doomed_id]}
+
+
+def test_deleted_session_tombstones_only_the_session(api_client, user, no_overlap):
+    session = TrainingSessionRecordFactory.create(user=user)
+    ExerciseRecordFactory.create_batch(2, training_session=session)
+    token = _sync(api_client)["token"]
+
+    session_id = session.id
+    session.delete()
+
+    assert _sync(api_client, token)["deleted"] == {"sessions": [session_id]}
+
+
+def test_expired_tokens_reset_the_client(api_client, user, settings):
+    TrainingSessionRecordFactory.create(user=user)
+    old_token = make_token(
+        timezone.now()
+        - datetime.timedelta(days=settings.TRAINING_SYNC_RETENTION_DAYS + 1),
+    )
+
+    pulled = _sync(api_client, old_token)
+
+    assert pulled["reset"] is True
+    assert len(pulled["changed"]["sessions"]) == 1
+    response = api_client.get(reverse("api:sync"), {"token": "forged"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_push_applies_offline_writes_once(api_client, user):
+    exercise = ExerciseFactory.create()
+    upload = {
+        "operations": [
+            {
+                "key": "session-1",
+                "entity": "sessions",
+                "action": "create",
+                "data": {"date": "2026-01-05"},
+            },
+            {
+                "key": "set-1",
+                "entity": "sets",
+                "action": "create",
+                "data": {
+                    "training_session_key": "session-1",
+                    "exercise": exercise.id,
+                    "load": 100,
+                    "repetitions": 5,
+                },
+            },
+            {
+                "key": "weight-1",
+                "entity": "weights",
+                "action": "create",
+                "data": {"weight": "not a number"},
+            },
+        ],
+    }
+    url = reverse("api:sync")
+
+    first = api_client.post(url, upload, format="json").json()["results"]
+    retried = api_client.post(url, upload, format="json").json()["results"]
+
+    assert [result["status"] for result in first] == ["applied", "applied", "invalid"]
+    assert [result["status"] for result in retried] == [
+        "duplicate",
+        "duplicate",
+        "invalid",
+    ]
+    assert [result.get("id") for result in retried[:2]] == [
+        first[0]["id"],
+        first[1]["id"],
+    ]
+    session = TrainingSessionRecord.objects.get(user=user)
+    record = ExerciseRecord.objects.get(user=user)
+    assert record.training_session == session
+    assert record.date == datetime.date(2026, 1, 5)
+    assert session.set_count == 1
+
+
+def test_push_updates_and_deletes(api_client, user):
+    record = ExerciseRecordFactory.create(
+        training_session=TrainingSessionRecordFactory.create(user=user),
+    )
+    foreign = ExerciseRecordFactory.create()
+    url = reverse("api:sync")
+
+    operations = [
+        {"action": "update", "id": record.id, "data": {"load": 70}},
+        {"action": "delete", "id": foreign.id},
+        {"action": "update", "id": foreign.id, "data": {"load": 1}},
+    ]
+    for key, operation in enumerate(operations):
+        operation.update(key=str(key), entity="sets")
+
+    results = api_client.post(
+        url,
+        {"operations": operations},
+        format="json",
+    ).json()["results"]
+
+    assert [result["status"] for result in results] == [
+        "applied",
+        "applied",
+        "not_found",
+    ]
+    record.refresh_from_db()
+    assert record.load == 70  # noqa: PLR2004
+    assert ExerciseRecord.objects.filter(pk=foreign.pk).exists()
+
+
+def test_purge_sync_records(settings):
+    SyncTombstone.objects.create(
+        model="training.weight",
+        object_id=1,
+        deleted_at=timezone.now()
+        - datetime.timedelta(days=settings.TRAINING_SYNC_RETENTION_DAYS + 1),
+    )
+    SyncTombstone.objects.create(model="training.weight", object_id=2)
+
+    assert purge_sync_records() == 1
+    assert list(SyncTombstone.objects.values_list("object_id", flat=True)) == [2]
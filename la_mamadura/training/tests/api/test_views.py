@@ -0,0 +1,192 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.training.tests.factories import WeightFactory
+from la_mamadura.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_sessions_are_cursor_paginated(api_client, user):
+    for n in range(5):
+        TrainingSessionRecordFactory.create(
+            user=user,
+            date=datetime.date(2026, 1, 1 + n),
+        )
+    TrainingSessionRecordFactory.create()
+    url = reverse("api:trainingsessionrecord-list")
+
+    first = api_client.get(url, {"page_size": 3}).json()
+    second = api_client.get(first["next"]).json()
+
+    dates = [session["date"] for session in first["results"] + second["results"]]
+    assert dates == [f"2026-01-0{n}" for n in (5, 4, 3, 2, 1)]
+    assert second["next"] is None
+
+
+def test_sets_are_paginated_on_date_and_id(api_client, user):
+    # Sets of a session share its date: pages must not skip or repeat them.
+    session = TrainingSessionRecordFactory.create(
+        user=user,
+        date=datetime.date(2026, 1, 2),
+    )
+    records = ExerciseRecordFactory.create_batch(5, training_session=session)
+    session = TrainingSessionRecordFactory.create(
+        user=user,
+        date=datetime.date(2026, 1, 1),
+    )
+    records += ExerciseRecordFactory.create_batch(2, training_session=session)
+    url = reverse("api:exerciserecord-list")
+
+    first = api_client.get(url, {"page_size": 3}).json()
+    second = api_client.get(first["next"]).json()
+    third = api_client.get(second["next"]).json()
+    previous = api_client.get(third["previous"]).json()
+
+    ids = [
+        record["id"]
+        for page in (first, second, third)
+        for record in page["results"]
+    ]
+    expected = [*reversed(records[:5]), *reversed(records[5:])]
+    assert ids == [record.pk for record in expected]
+    assert first["previous"] is None
+    assert third["next"] is None
+    assert previous["results"] == second["results"]
+
+
+def test_session_detail_includes_its_sets(
+    api_client,
+    user,
+    django_assert_max_num_queries,
+):
+    session = TrainingSessionRecordFactory.create(user=user)
+    ExerciseRecordFactory.create_batch(3, training_session=session)
+
+    with django_assert_max_num_queries(4):
+        response = api_client.get(
+            reverse("api:trainingsessionrecord-detail", kwargs={"pk": session.pk}),
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["set_count"] == 3  # noqa: PLR2004
+    assert len(response.json()["sets"]) == 3  # noqa: PLR2004
+
+
+def test_batch_creates_and_updates_a_sessions_sets(
+    api_client,
+    user,
+    django_assert_max_num_queries,
+):
+    session = TrainingSessionRecordFactory.create(user=user)
+    existing = ExerciseRecordFactory.create(
+        training_session=session,
+        load=0,
+        repetitions=0,
+    )
+    squat = ExerciseFactory.create()
+    url = reverse("api:trainingsessionrecord-batch-sets", kwargs={"pk": session.pk})
+    payload = {
+        "sets": [
+            {
+                "id": existing.id,
+                "exercise": existing.exercise_id,
+                "load": 60,
+                "repetitions": 8,
+            },
+            *({"exercise": squat.id, "load": 100, "repetitions": 5} for _ in range(10)),
+        ],
+    }
+
+    # As many queries for 11 sets as for one, outbox events included.
+    with django_assert_max_num_queries(20):
+        response = api_client.post(url, payload, format="json")
+
+    assert response.status_code == HTTPStatus.OK, response.json()
+    assert len(response.json()) == 11  # noqa: PLR2004
+    assert response.json()[0]["load"] == 60  # noqa: PLR2004
+    assert response.json()[1]["exercise_name"] == squat.name
+    session.refresh_from_db()
+    assert session.set_count == 11  # noqa: PLR2004
+    assert session.completed_set_count == 11  # noqa: PLR2004
+    assert ExerciseRecord.objects.filter(date=session.date).count() == 11  # noqa: PLR2004
+
+
+def test_batch_rejects_sets_of_other_sessions(api_client, user):
+    session = TrainingSessionRecordFactory.create(user=user)
+    other = ExerciseRecordFactory.create()
+    url = reverse("api:trainingsessionrecord-batch-sets", kwargs={"pk": session.pk})
+
+    response = api_client.post(
+        url,
+        {
+            "sets": [
+                {
+                    "id": other.id,
+                    "exercise": other.exercise_id,
+                    "load": 1,
+                    "repetitions": 1,
+                },
+            ],
+        },
+        format="json",
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    other.refresh_from_db()
+    assert other.load != 1
+
+
+def test_sets_are_scoped_to_the_user(api_client, user):
+    own = ExerciseRecordFactory.create(
+        training_session=TrainingSessionRecordFactory.create(user=user),
+    )
+    ExerciseRecordFactory.create()
+    foreign_session = TrainingSessionRecordFactory.create()
+
+    listed = api_client.get(reverse("api:exerciserecord-list")).json()["results"]
+    created = api_client.post(
+        reverse("api:exerciserecord-list"),
+        {
+            "training_session": foreign_session.id,
+            "exercise": own.exercise_id,
+            "load": 1,
+            "repetitions": 1,
+        },
+    )
+
+    assert [entry["id"] for entry in listed] == [own.id]
+    assert created.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_weights(api_client, user):
+    WeightFactory.create(user=user, weight=80)
+    WeightFactory.create()
+    url = reverse("api:weight-list")
+
+    created = api_client.post(url, {"date": "2026-01-01", "weight": 81})
+
+    assert created.status_code == HTTPStatus.CREATED
+    assert len(api_client.get(url).json()["results"]) == 2  # noqa: PLR2004
+
+
+def test_schema_documents_the_training_api(admin_client):
+    response = admin_client.get(reverse("api-schema"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert b"/api/sessions/{id}/sets/batch/" in response.content
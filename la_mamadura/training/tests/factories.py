@@ -0,0 +1,69 @@
+from factory import LazyAttribute
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import Muscle
+from la_mamadura.training.models import MuscularGroup
+from la_mamadura.training.models import SubMuscle
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.models import Weight
+from la_mamadura.users.tests.factories import UserFactory
+
+
+class SubMuscleFactory(DjangoModelFactory[SubMuscle]):
+    name = Sequence(lambda n: f"Submuscle {n}")
+
+    class Meta:
+        model = SubMuscle
+
+
+class MuscleFactory(DjangoModelFactory[Muscle]):
+    name = Sequence(lambda n: f"Muscle {n}")
+
+    class Meta:
+        model = Muscle
+
+
+class MuscularGroupFactory(DjangoModelFactory[MuscularGroup]):
+    name = Sequence(lambda n: f"Muscular group {n}")
+
+    class Meta:
+        model = MuscularGroup
+
+
+class ExerciseFactory(DjangoModelFactory[Exercise]):
+    name = Sequence(lambda n: f"Exercise {n}")
+    load_units = "KG"
+
+    class Meta:
+        model = Exercise
+
+
+class TrainingSessionRecordFactory(DjangoModelFactory[TrainingSessionRecord]):
+    user = SubFactory(UserFactory)
+
+    class Meta:
+        model = TrainingSessionRecord
+
+
+class ExerciseRecordFactory(DjangoModelFactory[ExerciseRecord]):
+    training_session = SubFactory(TrainingSessionRecordFactory)
+    user = LazyAttribute(lambda o: o.training_session.user)
+    date = LazyAttribute(lambda o: o.training_session.date)
+    exercise = SubFactory(ExerciseFactory)
+    repetitions = 10
+    load = 50.0
+
+    class Meta:
+        model = ExerciseRecord
+
+
+class WeightFactory(DjangoModelFactory[Weight]):
+    user = SubFactory(UserFactory)
+    weight = 80.0
+
+    class Meta:
+        model = Weight
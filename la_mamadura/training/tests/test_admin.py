@@ -0,0 +1,52 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.paginators import EstimatedCountPaginator
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestExerciseRecordAdmin:
+    def test_changelist(self, admin_client, django_assert_max_num_queries):
+        ExerciseRecordFactory.create_batch(5)
+        url = reverse("admin:training_exerciserecord_changelist")
+        with django_assert_max_num_queries(12):
+            response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_date_range_filter(self, admin_client):
+        record = ExerciseRecordFactory.create()
+        record.refresh_from_db()
+        url = reverse("admin:training_exerciserecord_changelist")
+        response = admin_client.get(
+            url,
+            data={
+                "date__gte": record.date,
+                "date__lt": record.date + datetime.timedelta(days=1),
+            },
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert list(response.context["cl"].result_list) == [record]
+
+    def test_add(self, admin_client):
+        url = reverse("admin:training_exerciserecord_add")
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_estimated_count_paginator_small_table_is_exact():
+    ExerciseRecordFactory.create_batch(3)
+    paginator = EstimatedCountPaginator(ExerciseRecord.objects.all(), 2)
+    assert paginator.count == 3  # noqa: PLR2004
+    assert paginator.num_pages == 2  # noqa: PLR2004
+
+
+def test_estimated_count_paginator_uses_planner(monkeypatch):
+    monkeypatch.setattr(EstimatedCountPaginator, "exact_count_threshold", 0)
+    paginator = EstimatedCountPaginator(ExerciseRecord.objects.all(), 2)
+    assert paginator.count == paginator.estimated_count()
@@ -0,0 +1,177 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from la_mamadura.training.archive import archive_exercise_records
+from la_mamadura.training.archive import archive_horizon
+from la_mamadura.training.archive import archived_session_sets
+from la_mamadura.training.archive import exercise_history
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import ExerciseRecordArchive
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def history(user):
+    exercise = ExerciseFactory()
+    records = []
+    for day, load in [
+        (datetime.date(2020, 3, 1), 60.0),
+        (datetime.date(2020, 9, 1), 70.0),
+        (datetime.date(2021, 1, 1), 80.0),
+        (datetime.date(2030, 1, 1), 90.0),
+    ]:
+        session = TrainingSessionRecordFactory(user=user, date=day)
+        records.append(
+            ExerciseRecordFactory(
+                training_session=session,
+                exercise=exercise,
+                load=load,
+            ),
+        )
+    return exercise, records
+
+
+def test_archive_moves_old_sets(user, history):
+    exercise, records = history
+    before = datetime.date(2025, 1, 1)
+
+    assert archive_exercise_records(before) == 3  # noqa: PLR2004
+    records[0].training_session.refresh_from_db()
+    assert records[0].training_session.set_count == 1
+    assert list(ExerciseRecord.objects.values_list("pk", flat=True)) == [
+        records[-1].pk,
+    ]
+    assert list(
+        ExerciseRecordArchive.objects.order_by("year").values_list(
+            "year",
+            "n_records",
+        ),
+    ) == [(2020, 2), (2021, 1)]
+
+    # Archiving again is a no-op and appending to an existing blob keeps it
+    # sorted and deduplicated.
+    assert archive_exercise_records(before) == 0
+    session = TrainingSessionRecordFactory(user=user, date=datetime.date(2020, 5, 1))
+    ExerciseRecordFactory(training_session=session, exercise=exercise, load=65.0)
+    assert archive_exercise_records(before) == 1
+    entries = exercise_history(user, [exercise.pk])[exercise.pk]
+    assert [entry.load for entry in entries] == [60.0, 65.0, 70.0, 80.0, 90.0]
+
+
+def test_history_merges_hot_and_archived(user, history):
+    exercise, records = history
+    archive_exercise_records(datetime.date(2025, 1, 1))
+
+    entries = exercise_history(user, [exercise.pk])[exercise.pk]
+    assert [entry.id for entry in entries] == [record.pk for record in records]
+    assert [entry.archived for entry in entries] == [True, True, True, False]
+
+    entries = exercise_history(
+        user,
+        [exercise.pk],
+        start=datetime.date(2020, 6, 1),
+        end=datetime.date(2021, 1, 1),
+    )[exercise.pk]
+    assert [entry.load for entry in entries] == [70.0, 80.0]
+
+
+def test_archive_horizon(settings):
+    settings.TRAINING_ARCHIVE_AFTER_DAYS = 0
+    assert archive_horizon() is None
+    assert archive_exercise_records() == 0
+
+
+def test_graph_shows_archived_sets(client, user, history):
+    exercise, _ = history
+    archive_exercise_records(datetime.date(2025, 1, 1))
+    client.force_login(user)
+
+    response = client.get(
+        reverse("training:exercise_record_graph", kwargs={"id": exercise.pk}),
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["entries"]) == 4  # noqa: PLR2004
+    assert response.context["pr"] == 90.0  # noqa: PLR2004
+
+
+def test_archived_sets_follow_their_session(user, history):
+    exercise, records = history
+    archive_exercise_records(datetime.date(2025, 1, 1))
+    session = TrainingSessionRecord.objects.get(pk=records[0].training_session_id)
+
+    session.date = datetime.date(2021, 6, 1)
+    session.save()
+    assert list(
+        ExerciseRecordArchive.objects.order_by("year").values_list(
+            "year",
+            "n_records",
+        ),
+    ) == [(2020, 1), (2021, 2)]
+    assert [record.date for record in archived_session_sets(session)] == [
+        session.date,
+    ]
+
+    # Past the horizon, they are back in the table.
+    session.date = datetime.date(2030, 1, 1)
+    session.save()
+    assert ExerciseRecord.objects.filter(pk=records[0].pk, date=session.date).exists()
+
+    session.delete()
+    assert not archived_session_sets(session)
+    entries = exercise_history(user, [exercise.pk])[exercise.pk]
+    assert [entry.id for entry in entries] == [record.pk for record in records[1:]]
+
+    # Empty archives go away.
+    TrainingSessionRecord.objects.get(pk=records[1].training_session_id).delete()
+    assert list(ExerciseRecordArchive.objects.values_list("year", flat=True)) == [
+        2021,
+    ]
+
+
+def test_archived_sessions_show_their_sets(client, user, history):
+    exercise, records = history
+    archive_exercise_records(datetime.date(2025, 1, 1))
+    session = records[0].training_session
+    client.force_login(user)
+
+    response = client.get(
+        reverse(
+            "training:training_session_exercise_sets",
+            kwargs={"pk": session.pk, "exercise_id": exercise.pk},
+        ),
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert f'data-set-id="{records[0].pk}"' in response.content.decode()
+
+    response = client.get(
+        reverse("api:trainingsessionrecord-detail", kwargs={"pk": session.pk}),
+    )
+    assert [(set_["id"], set_["archived"]) for set_ in response.json()["sets"]] == [
+        (records[0].pk, True),
+    ]
+
+    response = client.get(
+        reverse("api:exerciserecord-list"),
+        {"training_session": session.pk},
+    )
+    assert [set_["id"] for set_ in response.json()["results"]] == [records[0].pk]
+
+
+def test_archived_sets_count_towards_their_session(user, history):
+    exercise, records = history
+    archive_exercise_records(datetime.date(2025, 1, 1))
+    session = records[0].training_session
+
+    ExerciseRecordFactory.create(training_session=session, load=0)
+    session.refresh_from_db()
+    assert (session.set_count, session.completed_set_count) == (2, 1)
+    assert session.exercise_count == 2  # noqa: PLR2004
+    assert session.total_volume == records[0].load * records[0].repetitions
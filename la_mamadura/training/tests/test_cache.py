@@ -0,0 +1,70 @@
+import pytest
+from django.core.cache import cache
+
+from la_mamadura.training import cache as training_cache
+from la_mamadura.training.cache import get_or_refresh
+
+KEY = "training:test-stats"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.delete_many([KEY, f"{KEY}:refresh-lock"])
+
+
+class Compute:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_values_are_cached_for_their_version():
+    compute = Compute()
+    assert get_or_refresh(KEY, compute, 60, version=1) == 1
+    assert get_or_refresh(KEY, compute, 60, version=1) == 1
+    assert get_or_refresh(KEY, compute, 60, version=2) == 2  # noqa: PLR2004
+    assert compute.calls == 2  # noqa: PLR2004
+
+
+def test_stale_values_are_served_during_the_refresh(monkeypatch):
+    compute = Compute()
+    get_or_refresh(KEY, compute, 60, version=1)
+
+    # Another request is refreshing it.
+    cache.add(f"{KEY}:refresh-lock", 1)
+    assert get_or_refresh(KEY, compute, 60, version=2) == 1
+    cache.delete(f"{KEY}:refresh-lock")
+    assert get_or_refresh(KEY, compute, 60, version=2) == 2  # noqa: PLR2004
+    assert compute.calls == 2  # noqa: PLR2004
+
+    # Missing values are computed once the wait for the refresh runs out.
+    cache.delete(KEY)
+    cache.add(f"{KEY}:refresh-lock", 1)
+    monkeypatch.setattr(training_cache, "REFRESH_WAIT", 0)
+    assert get_or_refresh(KEY, compute, 60, version=2) == 3  # noqa: PLR2004
+
+
+def test_refresh_keeps_the_lock_of_another_request():
+    lock_key = f"{KEY}:refresh-lock"
+
+    def compute():
+        # The lock expired during the computation and another request took it.
+        cache.delete(lock_key)
+        cache.add(lock_key, "another request")
+        return 1
+
+    assert get_or_refresh(KEY, compute, 60) == 1
+    assert cache.get(lock_key) == "another request"
+
+
+def test_values_are_refreshed_before_they_expire(monkeypatch):
+    compute = Compute()
+    monkeypatch.setattr(training_cache.random, "random", lambda: 0.5)
+    get_or_refresh(KEY, compute, 60)
+
+    assert get_or_refresh(KEY, compute, 60) == 1
+    # The computation looks slow enough to start before the expiry.
+    assert get_or_refresh(KEY, compute, 60, beta=1e12) == 2  # noqa: PLR2004
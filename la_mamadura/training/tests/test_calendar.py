@@ -0,0 +1,105 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from la_mamadura.training.calendar import get_calendar
+from la_mamadura.training.calendar import rebuild_calendar
+from la_mamadura.training.models import TrainingCalendar
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _days_ago(n):
+    return timezone.localdate() - datetime.timedelta(days=n)
+
+
+def _train(user, *days_ago):
+    return [
+        TrainingSessionRecordFactory(user=user, date=_days_ago(n)) for n in days_ago
+    ]
+
+
+def test_calendar_follows_session_writes(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        sessions = _train(user, 10, 9, 8, 4, 3, 1, 1)
+        ExerciseRecordFactory(training_session=sessions[-1], load=50, repetitions=10)
+
+    calendar = get_calendar(user.pk)
+    assert calendar.first_day == _days_ago(10)
+    assert calendar.day(_days_ago(1)) == (2, 500)
+    assert calendar.day(_days_ago(2)) == (0, 0)
+    assert calendar.longest_streak == 3  # noqa: PLR2004
+    assert calendar.current_streak(timezone.localdate()) == 1
+    assert calendar.current_streak(_days_ago(-2)) == 0
+
+    # Deleting the first day trims the calendar and shortens the streak.
+    with django_capture_on_commit_callbacks(execute=True):
+        sessions[0].delete()
+        sessions[3].date = _days_ago(2)
+        sessions[3].save()
+
+    calendar = get_calendar(user.pk)
+    assert calendar.first_day == _days_ago(9)
+    assert calendar.day(_days_ago(4)) == (0, 0)
+    assert calendar.longest_streak == 3  # noqa: PLR2004
+    assert calendar.last_streak == 3  # noqa: PLR2004
+
+
+def test_calendar_is_built_on_first_use(user):
+    _train(user, 5, 6)
+    TrainingCalendar.objects.filter(user=user).delete()
+
+    calendar = get_calendar(user.pk)
+
+    assert calendar.first_day == _days_ago(6)
+    assert calendar.longest_streak == 2  # noqa: PLR2004
+    assert TrainingCalendar.objects.filter(user=user).exists()
+
+
+def test_calendar_leaves_out_mistyped_years(user):
+    _train(user, 1)
+    TrainingSessionRecordFactory(user=user, date=datetime.date(202, 1, 1))
+    TrainingSessionRecordFactory(user=user, date=datetime.date(9202, 1, 1))
+
+    for calendar in (get_calendar(user.pk), rebuild_calendar(user.pk)):
+        assert calendar.first_day == _days_ago(1)
+        assert len(calendar.sessions) == 1
+
+
+def test_rebuild_calendar_matches_incremental_updates(user):
+    sessions = _train(user, 30, 20, 20, 3, 2)
+    sessions[1].delete()
+    incremental = TrainingCalendar.objects.get(user=user)
+
+    rebuilt = rebuild_calendar(user.pk)
+
+    assert bytes(rebuilt.sessions) == bytes(incremental.sessions)
+    assert bytes(rebuilt.volumes) == bytes(incremental.volumes)
+    assert rebuilt.first_day == incremental.first_day
+    assert rebuilt.longest_streak == incremental.longest_streak == 2  # noqa: PLR2004
+
+
+def test_calendar_page_reads_the_cached_calendar(
+    client,
+    user,
+    django_assert_max_num_queries,
+):
+    _train(user, 0, 1)
+    client.force_login(user)
+    url = reverse("training:training_calendar")
+    client.get(url)
+
+    with django_assert_max_num_queries(4):
+        response = client.get(url)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["current_streak"] == 2  # noqa: PLR2004
+    days = [cell for week in response.context["weeks"] for cell in week if cell]
+    assert len(days) == 365  # noqa: PLR2004
+    assert days[-1]["level"] == 1
+    assert days[0]["level"] == 0
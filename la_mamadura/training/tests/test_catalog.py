@@ -0,0 +1,97 @@
+import datetime
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from la_mamadura.training.forms import UpdateExerciseRecord
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _update_form_queries(client, exercise_record):
+    url = reverse("training:exercise_record_update", kwargs={"pk": exercise_record.pk})
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response, len(queries)
+
+
+def test_set_form_lists_the_selected_session_only(client, user):
+    session = TrainingSessionRecordFactory.create(
+        user=user,
+        date=datetime.date(2026, 3, 2),
+    )
+    exercise_record = ExerciseRecordFactory.create(training_session=session, load=50)
+    client.force_login(user)
+    # Fill the exercise catalog cache.
+    _update_form_queries(client, exercise_record)
+
+    response, n_queries = _update_form_queries(client, exercise_record)
+    TrainingSessionRecordFactory.create_batch(20, user=user)
+    assert _update_form_queries(client, exercise_record)[1] == n_queries
+
+    html = response.content.decode()
+    select = re.search(r'<select name="training_session".*?</select>', html, re.S)
+    assert select
+    assert select[0].count("<option") == 2  # noqa: PLR2004
+    assert f'<option value="{session.pk}" selected>{session}</option>' in select[0]
+    assert reverse("training:training_session_search") in select[0]
+
+
+@pytest.mark.parametrize("training_session", ["abc", "", "1.5"])
+def test_invalid_set_forms_render_again(training_session):
+    exercise_record = ExerciseRecordFactory.create()
+    form = UpdateExerciseRecord(
+        instance=exercise_record,
+        data={
+            "exercise": exercise_record.exercise_id,
+            "training_session": training_session,
+            "date": "2026-03-02",
+            "load": 50,
+            "repetitions": 5,
+        },
+    )
+
+    assert not form.is_valid()
+    html = str(form["training_session"])
+    assert html.count("<option") == 1
+
+
+def test_session_search(client, user):
+    march = TrainingSessionRecordFactory.create(
+        user=user,
+        date=datetime.date(2026, 3, 2),
+    )
+    april = TrainingSessionRecordFactory.create(
+        user=user,
+        date=datetime.date(2026, 4, 6),
+    )
+    TrainingSessionRecordFactory.create(date=datetime.date(2026, 3, 3))
+    url = reverse("training:training_session_search")
+    client.force_login(user)
+
+    results = client.get(url).json()["results"]
+    assert [result["id"] for result in results] == [april.pk, march.pk]
+    assert client.get(url, {"q": "2026-03"}).json()["results"] == [
+        {"id": march.pk, "text": str(march)},
+    ]
+
+    # Cached until the user's training changes.
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url, {"q": "2026-03"})
+    cached_queries = len(queries)
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url, {"q": "2026-04"})
+    assert len(queries) > cached_queries
+    TrainingSessionRecordFactory.create(user=user, date=datetime.date(2026, 3, 9))
+    assert len(client.get(url, {"q": "2026-03"}).json()["results"]) == 2  # noqa: PLR2004
+
+    client.force_login(UserFactory.create())
+    assert client.get(url, {"q": "2026-03"}).json()["results"] == []
@@ -0,0 +1,74 @@
+import pytest
+
+from la_mamadura.training.closure import muscular_group_facets
+from la_mamadura.training.closure import rebuild_exercise_closure
+from la_mamadura.training.models import Exercise
+from la_mamadura.training.models import ExerciseMuscleClosure
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import MuscleFactory
+from la_mamadura.training.tests.factories import MuscularGroupFactory
+from la_mamadura.training.tests.factories import SubMuscleFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def chest():
+    """Chest > Pectoralis > Upper pectoralis."""
+    submuscle = SubMuscleFactory.create(name="Upper pectoralis")
+    muscle = MuscleFactory.create(name="Pectoralis")
+    muscle.submuscles.add(submuscle)
+    group = MuscularGroupFactory.create(name="Chest")
+    group.muscles.add(muscle)
+    return group, muscle, submuscle
+
+
+def test_closure_reaches_ancestors(chest):
+    group, muscle, submuscle = chest
+    exercise = ExerciseFactory.create()
+    exercise.submuscles.add(submuscle)
+
+    assert list(Exercise.objects.targeting(submuscle)) == [exercise]
+    assert list(Exercise.objects.targeting(muscle)) == [exercise]
+    assert list(Exercise.objects.targeting(group)) == [exercise]
+    assert ExerciseMuscleClosure.objects.get(submuscle=submuscle).direct
+    assert not ExerciseMuscleClosure.objects.get(muscular_group=group).direct
+
+
+def test_closure_follows_taxonomy_changes(chest):
+    group, muscle, submuscle = chest
+    exercise = ExerciseFactory.create()
+    exercise.submuscles.add(submuscle)
+
+    group.muscles.clear()
+    assert not Exercise.objects.targeting(group).exists()
+
+    muscle.muscular_group.add(group)
+    assert Exercise.objects.targeting(group).exists()
+
+    muscle.delete()
+    assert not Exercise.objects.targeting(group).exists()
+    assert Exercise.objects.targeting(submuscle).exists()
+
+
+def test_closure_follows_reverse_exercise_changes(chest):
+    group, _, _ = chest
+    exercise = ExerciseFactory.create()
+    group.exercise.add(exercise)
+    assert Exercise.objects.targeting(group).exists()
+
+    group.exercise.clear()
+    assert not Exercise.objects.targeting(group).exists()
+
+
+def test_rebuild_and_facets(chest):
+    group, muscle, _ = chest
+    ExerciseFactory.create().muscles.add(muscle)
+    ExerciseFactory.create().muscular_group.add(group)
+    ExerciseFactory.create()
+
+    ExerciseMuscleClosure.objects.all().delete()
+    rebuild_exercise_closure()
+
+    facets = {g.name: g.n_exercises for g in muscular_group_facets()}
+    assert facets == {"Chest": 2}
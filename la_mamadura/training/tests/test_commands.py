@@ -0,0 +1,20 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("asgi", [False, True])
+def test_benchmark_db_connections(asgi):
+    out = StringIO()
+    call_command(
+        "benchmark_db_connections",
+        requests=10,
+        concurrency=2,
+        asgi=asgi,
+        stdout=out,
+    )
+    output = out.getvalue()
+    assert "Requests: 10 with concurrency 2" in output
+    assert "Server connections: peak" in output
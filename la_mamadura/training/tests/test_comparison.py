@@ -0,0 +1,99 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from la_mamadura.training import comparison
+from la_mamadura.training.archive import archive_user_records
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _log(user, exercise, day, load, repetitions=5):
+    ExerciseRecordFactory(
+        training_session=TrainingSessionRecordFactory(user=user, date=day),
+        exercise=exercise,
+        load=load,
+        repetitions=repetitions,
+    )
+
+
+def test_series_are_aligned_on_the_training_days(user):
+    squat, bench = ExerciseFactory.create_batch(2)
+    day = datetime.date(2026, 1, 1)
+    _log(user, squat, day, 100)
+    _log(user, squat, day, 120, repetitions=1)
+    _log(user, squat, day, 200, repetitions=0)
+    _log(user, bench, day + datetime.timedelta(days=2), 80)
+    _log(user, squat, day + datetime.timedelta(days=4), 110)
+    archive_user_records(user.pk, day + datetime.timedelta(days=1))
+
+    dates, series = comparison.comparison_series(user, [squat, bench])
+
+    assert dates == [day + datetime.timedelta(days=n) for n in (0, 2, 4)]
+    assert series == [(squat, [120, None, 110]), (bench, [None, 80, None])]
+
+
+def test_normalized_series(user):
+    squat = ExerciseFactory()
+    day = datetime.date(2026, 1, 1)
+    _log(user, squat, day, 100, repetitions=1)
+    _log(user, squat, day + datetime.timedelta(days=1), 90, repetitions=3)
+
+    _dates, [(_squat, percent_of_pr)] = comparison.comparison_series(
+        user,
+        [squat],
+        normalize=comparison.PERCENT_OF_PR,
+    )
+    _dates, [(_squat, percent_of_e1rm)] = comparison.comparison_series(
+        user,
+        [squat],
+        metric=comparison.LOAD,
+        normalize=comparison.PERCENT_OF_E1RM,
+    )
+
+    assert percent_of_pr == [100, 90]
+    assert percent_of_e1rm == [100, 90]
+
+
+def test_downsample_keeps_the_best_of_each_bucket():
+    dates, [values] = comparison.downsample(
+        [1, 2, 3, 4, 5],
+        [[1, None, 3, 5, 4]],
+        2,
+    )
+
+    assert dates == [2, 5]
+    assert values == [1, 5]
+
+
+def test_comparison_endpoint(client, user, django_assert_max_num_queries):
+    squat, bench = ExerciseFactory.create_batch(2)
+    for n in range(10):
+        _log(user, squat, datetime.date(2026, 1, 1 + n), 100 + n)
+        _log(user, bench, datetime.date(2026, 1, 1 + n), 60 + n)
+    client.force_login(user)
+    url = reverse("training:exercise_comparison")
+
+    with django_assert_max_num_queries(6):
+        response = client.get(
+            url,
+            {"exercise": [squat.id, bench.id], "metric": "e1rm", "points": 5},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data["metric"] == "e1rm"
+    assert len(data["dates"]) == 5  # noqa: PLR2004
+    assert [series["exercise"]["id"] for series in data["series"]] == sorted(
+        [squat.id, bench.id],
+        key=lambda pk: (squat if pk == squat.id else bench).name,
+    )
+
+    response = client.get(url, {"exercise": [squat.id], "normalize": "nope"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "normalize" in response.json()["errors"]
@@ -0,0 +1,196 @@
+import datetime
+import re
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def training(user):
+    return TrainingSessionRecordFactory.create(user=user)
+
+
+def test_create_set_returns_the_exercise_accordion_item(
+    client,
+    user,
+    training,
+    django_assert_max_num_queries,
+):
+    exercise = ExerciseFactory.create()
+    ExerciseRecordFactory.create(training_session=training, exercise=exercise, load=50)
+    client.force_login(user)
+    url = reverse("training:training_session_set_create", kwargs={"pk": training.id})
+
+    # Includes refreshing the day in the training calendar, recording the
+    # outbox event and looking up last time's sets.
+    with django_assert_max_num_queries(19):
+        response = client.post(
+            url,
+            {"exercise": exercise.id, "load": 60, "repetitions": 8},
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    content = response.content.decode()
+    assert f'id="exercise-{exercise.id}"' in content
+    assert "2 sets" in content
+    assert "<html" not in content
+    training.refresh_from_db()
+    assert training.set_count == 2  # noqa: PLR2004
+
+
+def test_set_fragment_shows_last_time(client, user, training):
+    exercise = ExerciseFactory.create()
+    ExerciseRecordFactory.create(
+        training_session=TrainingSessionRecordFactory.create(
+            user=user,
+            date=training.date - datetime.timedelta(days=2),
+        ),
+        exercise=exercise,
+        load=55,
+        repetitions=8,
+    )
+    client.force_login(user)
+
+    response = client.post(
+        reverse("training:training_session_set_create", kwargs={"pk": training.id}),
+        {"exercise": exercise.id, "load": 60, "repetitions": 8},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert re.search(r"55[.,]0\u00d78", response.content.decode())
+
+
+def test_create_set_as_json(client, user, training):
+    exercise = ExerciseFactory.create()
+    client.force_login(user)
+
+    response = client.post(
+        reverse("training:training_session_set_create", kwargs={"pk": training.id}),
+        {"exercise": exercise.id, "load": 60, "repetitions": 8},
+        headers={"accept": "application/json"},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    data = response.json()
+    assert data["exercise"]["id"] == exercise.id
+    assert data["status"] == "finished"
+    assert [entry["load"] for entry in data["entries"]] == [60]
+
+
+def test_create_set_rejects_invalid_data_and_other_users_sessions(
+    client,
+    user,
+    training,
+):
+    client.force_login(user)
+    url = reverse("training:training_session_set_create", kwargs={"pk": training.id})
+
+    response = client.post(url, {"load": 60}, headers={"accept": "application/json"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "exercise" in response.json()["errors"]
+
+    other_training = TrainingSessionRecordFactory.create()
+    response = client.post(
+        reverse(
+            "training:training_session_set_create",
+            kwargs={"pk": other_training.id},
+        ),
+        {"exercise": ExerciseFactory.create().id, "load": 60, "repetitions": 8},
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert not ExerciseRecord.objects.exists()
+
+
+def test_update_set(client, user, training):
+    exercise_record = ExerciseRecordFactory.create(
+        training_session=training,
+        load=0,
+        repetitions=0,
+    )
+    client.force_login(user)
+
+    response = client.post(
+        reverse("training:exercise_set_update", kwargs={"pk": exercise_record.pk}),
+        {"load": 70, "repetitions": 5},
+        headers={"accept": "application/json"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["status"] == "finished"
+    exercise_record.refresh_from_db()
+    assert (exercise_record.load, exercise_record.repetitions) == (70, 5)
+
+
+def test_session_page_renders_headers_without_sets(
+    client,
+    user,
+    training,
+    django_assert_max_num_queries,
+):
+    exercises = ExerciseFactory.create_batch(3)
+    for exercise in exercises:
+        ExerciseRecordFactory.create_batch(
+            4,
+            training_session=training,
+            exercise=exercise,
+        )
+    client.force_login(user)
+    training.refresh_from_db()
+
+    with django_assert_max_num_queries(9):
+        response = client.get(
+            reverse(
+                "training:training_records_create_exercise",
+                kwargs={"id": training.id},
+            ),
+        )
+
+    content = response.content.decode()
+    assert response.status_code == HTTPStatus.OK
+    assert content.count("4 sets") == len(exercises)
+    assert " reps" not in content
+    panel_url = reverse(
+        "training:training_session_exercise_sets",
+        kwargs={"pk": training.id, "exercise_id": exercises[0].id},
+    )
+    assert f"{panel_url}?v={training.version}" in content
+
+
+def test_exercise_sets_panel_is_cached_per_session_version(
+    client,
+    user,
+    training,
+    django_assert_num_queries,
+):
+    exercise_record = ExerciseRecordFactory.create(
+        training_session=training,
+        repetitions=7,
+    )
+    training.refresh_from_db()
+    client.force_login(user)
+    url = reverse(
+        "training:training_session_exercise_sets",
+        kwargs={"pk": training.id, "exercise_id": exercise_record.exercise_id},
+    )
+
+    response = client.get(url, {"v": training.version})
+    assert "x 7 reps" in response.content.decode()
+    assert "max-age" in response["Cache-Control"]
+    # The request savepoint, auth session, user and training session only:
+    # the render comes from the cache.
+    with django_assert_num_queries(5):
+        client.get(url, {"v": training.version})
+
+    exercise_record.repetitions = 9
+    exercise_record.save()
+    response = client.get(url, {"v": training.version})
+    assert "x 9 reps" in response.content.decode()
+    assert "no-cache" in response["Cache-Control"]
@@ -0,0 +1,129 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+import redis
+from django.urls import reverse
+
+from la_mamadura.training import leaderboards
+from la_mamadura.training.outbox import drain_outbox
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.training.tests.factories import WeightFactory
+from la_mamadura.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def leaderboard_prefix(settings):
+    try:
+        leaderboards.get_redis().ping()
+    except redis.RedisError:
+        pytest.skip("Redis is not available.")
+    settings.TRAINING_LEADERBOARD_KEY_PREFIX = f"test:leaderboard:{uuid.uuid4().hex}"
+    yield
+    client = leaderboards.get_redis()
+    keys = list(client.scan_iter(f"{settings.TRAINING_LEADERBOARD_KEY_PREFIX}:*"))
+    if keys:
+        client.delete(*keys)
+
+
+def _log_set(user, exercise, load, repetitions):
+    return ExerciseRecordFactory.create(
+        training_session=TrainingSessionRecordFactory.create(user=user),
+        exercise=exercise,
+        load=load,
+        repetitions=repetitions,
+    )
+
+
+def test_sets_update_the_boards_incrementally(django_capture_on_commit_callbacks):
+    exercise = ExerciseFactory.create()
+    strong, light = UserFactory.create_batch(2)
+    with django_capture_on_commit_callbacks(execute=True):
+        WeightFactory.create(user=strong, weight=100)
+        _log_set(strong, exercise, 150, 1)
+        _log_set(strong, exercise, 100, 3)
+        weak_set = _log_set(light, exercise, 120, 5)
+        drain_outbox()
+
+    assert leaderboards.top(exercise.id) == [(strong.id, 150), (light.id, 120)]
+    assert leaderboards.top(exercise.id, leaderboards.E1RM) == [
+        (strong.id, 150),
+        (light.id, 140),
+    ]
+    assert leaderboards.top(exercise.id, "load:bw") == [(strong.id, 1.5)]
+    assert leaderboards.rank(exercise.id, light.id) == (2, 120)
+    assert leaderboards.rank(exercise.id, UserFactory.create().id) == (None, None)
+
+    # Lowering or deleting a set recomputes the user's best.
+    with django_capture_on_commit_callbacks(execute=True):
+        weak_set.load = 90
+        weak_set.save()
+        drain_outbox()
+    assert leaderboards.rank(exercise.id, light.id) == (2, 90)
+    with django_capture_on_commit_callbacks(execute=True):
+        weak_set.delete()
+        drain_outbox()
+    assert leaderboards.top(exercise.id) == [(strong.id, 150)]
+
+    # A bodyweight change rescales the relative boards.
+    with django_capture_on_commit_callbacks(execute=True):
+        WeightFactory.create(user=strong, weight=75)
+        drain_outbox()
+    assert leaderboards.top(exercise.id, "load:bw") == [(strong.id, 2)]
+
+
+def test_only_kg_exercises_have_e1rm_and_relative_boards(
+    django_capture_on_commit_callbacks,
+):
+    plank = ExerciseFactory.create(load_units="SECONDS")
+    user = UserFactory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        WeightFactory.create(user=user, weight=80)
+        _log_set(user, plank, 90, 1)
+        drain_outbox()
+
+    assert leaderboards.top(plank.id) == [(user.id, 90)]
+    for board in leaderboards.BOARDS[1:]:
+        assert leaderboards.top(plank.id, board) == []
+
+    assert leaderboards.rebuild_leaderboards() == 1
+    assert leaderboards.top(plank.id) == [(user.id, 90)]
+    assert leaderboards.top(plank.id, "load:bw") == []
+
+
+def test_rebuild_leaderboards(django_capture_on_commit_callbacks):
+    exercise = ExerciseFactory.create()
+    user = UserFactory.create()
+    _log_set(user, exercise, 80, 10)
+    WeightFactory.create(user=user, weight=80)
+    leaderboards.get_redis().zadd(
+        leaderboards.board_key(exercise.id + 1, leaderboards.LOAD),
+        {"1": 1},
+    )
+
+    assert leaderboards.rebuild_leaderboards() == len(leaderboards.BOARDS)
+    assert leaderboards.top(exercise.id) == [(user.id, 80)]
+    assert leaderboards.top(exercise.id, "e1rm:bw") == [
+        (user.id, pytest.approx(1 + 10 / 30)),
+    ]
+    assert leaderboards.top(exercise.id + 1) == []
+
+
+def test_leaderboard_page(client, user, django_capture_on_commit_callbacks):
+    exercise = ExerciseFactory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        _log_set(user, exercise, 60, 5)
+        drain_outbox()
+    client.force_login(user)
+
+    response = client.get(
+        reverse("training:exercise_leaderboard", kwargs={"pk": exercise.pk}),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["boards"][0]["rank"] == 1
+    assert response.context["boards"][0]["top"] == [(1, user, 60)]
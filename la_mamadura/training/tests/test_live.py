@@ -0,0 +1,108 @@
+import asyncio
+import json
+import uuid
+from http import HTTPStatus
+
+import pytest
+import redis
+from django.urls import reverse
+
+from la_mamadura.training import live
+from la_mamadura.training.leaderboards import get_redis
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def live_channels(settings):
+    try:
+        get_redis().ping()
+    except redis.RedisError:
+        pytest.skip("Redis is not available.")
+    settings.TRAINING_LIVE_CHANNEL_PREFIX = f"test:live:{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def subscriber(live_channels):
+    pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+    yield pubsub
+    pubsub.close()
+
+
+def _next_delta(pubsub):
+    message = pubsub.get_message(timeout=1)
+    return json.loads(message["data"]) if message else None
+
+
+def test_set_writes_publish_deltas(subscriber, django_capture_on_commit_callbacks):
+    session = TrainingSessionRecordFactory.create()
+    subscriber.subscribe(live.channel(session.pk))
+    subscriber.get_message(timeout=1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        record = ExerciseRecordFactory.create(
+            training_session=session,
+            load=100,
+            repetitions=5,
+        )
+    delta = _next_delta(subscriber)
+    assert delta["sets"] == [
+        {
+            "id": record.pk,
+            "exercise": record.exercise_id,
+            "load": 100,
+            "repetitions": 5,
+            "notes": record.notes,
+        },
+    ]
+    assert delta["exercises"] == {str(record.exercise_id): {"sets": 1, "done": 1}}
+
+    record_id = record.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        record.delete()
+    delta = _next_delta(subscriber)
+    assert delta == {"sets": [], "deleted": [record_id], "exercises": {}}
+
+
+def test_session_deletion_publishes_nothing(
+    subscriber,
+    django_capture_on_commit_callbacks,
+):
+    session = ExerciseRecordFactory.create().training_session
+    subscriber.subscribe(live.channel(session.pk))
+    subscriber.get_message(timeout=1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        session.delete()
+
+    assert _next_delta(subscriber) is None
+
+
+def test_session_events_stream_the_deltas(live_channels):
+    async def read():
+        events = live.session_events(1)
+        try:
+            assert (await anext(events)).startswith("retry:")
+            await asyncio.to_thread(
+                get_redis().publish,
+                live.channel(1),
+                json.dumps({"sets": []}),
+            )
+            return await anext(events)
+        finally:
+            await events.aclose()
+
+    assert asyncio.run(read()) == 'event: sets\ndata: {"sets": []}\n\n'
+
+
+def test_events_are_only_for_the_owner(client, user):
+    url = reverse(
+        "training:training_session_events",
+        kwargs={"pk": TrainingSessionRecordFactory.create().pk},
+    )
+
+    assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+    client.force_login(user)
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
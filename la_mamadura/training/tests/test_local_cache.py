@@ -0,0 +1,105 @@
+import time
+
+import pytest
+import redis
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from la_mamadura.training import local_cache
+from la_mamadura.training.catalog import exercise_choices
+from la_mamadura.training.forms import CreateExerciseTemplateForm
+from la_mamadura.training.forms import CreateTrainingFromTemplateForm
+from la_mamadura.training.local_cache import LocalCache
+from la_mamadura.training.models import TrainingSessionTemplate
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.users.tests.factories import UserFactory
+
+
+def test_local_cache_is_bounded_in_size_and_age(monkeypatch):
+    lru = LocalCache(maxsize=2, timeout=60)
+    lru.set("ns", 1, "one")
+    lru.set("ns", 2, "two")
+    assert lru.get("ns", 1) == "one"
+    lru.set("ns", 3, "three")
+    # 2 was the least recently used.
+    assert lru.get("ns", 2) is None
+    assert len(lru) == 2  # noqa: PLR2004
+
+    now = time.monotonic()
+    monkeypatch.setattr(local_cache.time, "monotonic", lambda: now + 61)
+    assert lru.get("ns", 1) is None
+
+    lru.set("ns", 1, "one")
+    lru.set("other", 1, "one")
+    lru.invalidate("ns")
+    assert lru.get("ns", 1) is None
+    assert lru.get("other", 1) == "one"
+
+
+@pytest.mark.django_db
+def test_lookups_stay_in_the_process_until_the_rows_change():
+    squat = ExerciseFactory.create(name="Squat")
+    assert exercise_choices() == [(squat.id, "Squat")]
+    with CaptureQueriesContext(connection) as queries:
+        assert exercise_choices() == [(squat.id, "Squat")]
+    assert len(queries) == 0
+
+    squat.name = "Back squat"
+    squat.save()
+    assert exercise_choices() == [(squat.id, "Back squat")]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "form_class",
+    [CreateTrainingFromTemplateForm, CreateExerciseTemplateForm],
+)
+def test_template_choices_are_the_users(user, form_class):
+    shared = TrainingSessionTemplate.objects.create(name="Shared")
+    own = TrainingSessionTemplate.objects.create(name="Own", user=user)
+    others = TrainingSessionTemplate.objects.create(
+        name="Other's",
+        user=UserFactory.create(),
+    )
+
+    def rendered_choices():
+        form = form_class(user=user)
+        return [(value, label) for value, label in form.fields["template"].choices]
+
+    assert rendered_choices() == [
+        ("", "---------"),
+        (own.id, "Own"),
+        (shared.id, "Shared"),
+    ]
+    with CaptureQueriesContext(connection) as queries:
+        rendered_choices()
+    assert len(queries) == 0
+
+    # Still validated against the user's templates.
+    form = form_class(user=user, data={"template": own.id})
+    assert "template" not in form.errors
+    form = form_class(user=user, data={"template": others.id})
+    assert "template" in form.errors
+    shared.delete()
+    assert rendered_choices() == [("", "---------"), (own.id, "Own")]
+
+
+@pytest.mark.django_db
+def test_invalidations_reach_every_process(settings):
+    try:
+        local_cache.get_redis().ping()
+    except redis.RedisError:
+        pytest.skip("Redis is not available.")
+    settings.TRAINING_LOCAL_CACHE_CHANNEL = f"test:local-cache:{time.time_ns()}"
+    pubsub = local_cache.get_redis().pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(settings.TRAINING_LOCAL_CACHE_CHANNEL)
+    pubsub.get_message(timeout=1)
+
+    local_cache.local.set("ns", 1, "cached in another process")
+    local_cache._publish("ns", 1)  # noqa: SLF001
+
+    message = pubsub.get_message(timeout=1)
+    pubsub.close()
+    local_cache.local.set("ns", 1, "cached in another process")
+    local_cache._handle_message(message["data"])  # noqa: SLF001
+    assert local_cache.local.get("ns", 1) is None
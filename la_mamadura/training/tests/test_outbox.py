@@ -0,0 +1,211 @@
+import uuid
+from io import StringIO
+
+import pytest
+import redis
+from django.core.management import call_command
+from django.db import transaction
+
+from la_mamadura.training import outbox
+from la_mamadura.training.batch import save_session_sets
+from la_mamadura.training.models import ExerciseStatistics
+from la_mamadura.training.models import OutboxEvent
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.training.tests.factories import WeightFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _events():
+    return sorted(
+        (event.user_id, event.topic, event.payload.get("exercise_id"))
+        for event in OutboxEvent.objects.all()
+    )
+
+
+def test_writes_record_their_events(user):
+    session = TrainingSessionRecordFactory.create(user=user)
+    squat, bench = ExerciseFactory.create_batch(2)
+    record = ExerciseRecordFactory.create(training_session=session, exercise=squat)
+    record.refresh_from_db()
+    WeightFactory.create(user=user)
+    assert _events() == [
+        (user.id, outbox.BODYWEIGHT_CHANGED, None),
+        (user.id, outbox.SET_CREATED, squat.id),
+    ]
+    assert OutboxEvent.objects.get(topic=outbox.SET_CREATED).payload == {
+        "exercise_id": squat.id,
+        "date": record.date.isoformat(),
+        "load": record.load,
+        "repetitions": record.repetitions,
+    }
+
+    # Moving a set changes both exercises.
+    OutboxEvent.objects.all().delete()
+    record.exercise = bench
+    record.save()
+    assert _events() == [
+        (user.id, outbox.SET_CHANGED, squat.id),
+        (user.id, outbox.SET_CHANGED, bench.id),
+    ]
+
+    OutboxEvent.objects.all().delete()
+    save_session_sets(
+        session,
+        [
+            {"id": record.id, "exercise_id": squat.id},
+            *[{"exercise_id": squat.id, "load": 100, "repetitions": 5}] * 2,
+        ],
+    )
+    assert _events() == [
+        (user.id, outbox.SET_CHANGED, squat.id),
+        (user.id, outbox.SET_CHANGED, bench.id),
+        (user.id, outbox.SET_CREATED, squat.id),
+        (user.id, outbox.SET_CREATED, squat.id),
+    ]
+
+
+def test_rolled_back_writes_leave_no_events(user):
+    session = TrainingSessionRecordFactory.create(user=user)
+    with transaction.atomic():
+        ExerciseRecordFactory.create(training_session=session)
+        transaction.set_rollback(True)
+
+    assert not OutboxEvent.objects.exists()
+
+
+@pytest.fixture
+def leaderboard_calls(monkeypatch):
+    calls = []
+    names = ("record_sets", "refresh_user_exercise", "refresh_user_relative_scores")
+    for name in names:
+        monkeypatch.setattr(
+            outbox.leaderboards,
+            name,
+            lambda *args, name=name: calls.append((name, *args)),
+        )
+    return calls
+
+
+def test_drain_applies_the_events_once_per_user_and_exercise(user, leaderboard_calls):
+    exercise = ExerciseFactory.create()
+    session = TrainingSessionRecordFactory.create(user=user)
+    records = ExerciseRecordFactory.create_batch(
+        3,
+        training_session=session,
+        exercise=exercise,
+        load=80,
+        repetitions=5,
+    )
+    WeightFactory.create(user=user)
+
+    assert not ExerciseStatistics.objects.exists()
+    assert outbox.drain_outbox(batch_size=2) == 4  # noqa: PLR2004
+
+    statistics = ExerciseStatistics.objects.get(user=user, exercise=exercise)
+    assert statistics.set_count == 3  # noqa: PLR2004
+    assert statistics.best_load == 80  # noqa: PLR2004
+    # Two batches: the first two sets, then the last one and the bodyweight.
+    # New sets are applied as they are, without reading the others.
+    assert leaderboard_calls == [
+        ("record_sets", user.id, exercise.id, [(80, 5), (80, 5)]),
+        ("record_sets", user.id, exercise.id, [(80, 5)]),
+        ("refresh_user_relative_scores", user.id),
+    ]
+    assert not OutboxEvent.objects.exists()
+    assert outbox.drain_outbox() == 0
+
+    # Edits recompute the exercise from all its sets.
+    leaderboard_calls.clear()
+    records[0].load = 100
+    records[0].save()
+    ExerciseRecordFactory.create(training_session=session, exercise=exercise, load=90)
+    outbox.drain_outbox()
+    statistics = ExerciseStatistics.objects.get(user=user, exercise=exercise)
+    assert (statistics.set_count, statistics.best_load) == (4, 100)
+    assert leaderboard_calls == [("refresh_user_exercise", user.id, exercise.id)]
+
+
+def test_new_sets_add_to_the_statistics(user, leaderboard_calls):
+    exercise = ExerciseFactory.create()
+    session = TrainingSessionRecordFactory.create(user=user)
+    ExerciseRecordFactory.create(training_session=session, exercise=exercise, load=0)
+    outbox.drain_outbox()
+    statistics = ExerciseStatistics.objects.get(user=user, exercise=exercise)
+    assert (statistics.set_count, statistics.best_load_date) == (1, None)
+
+    ExerciseRecordFactory.create(
+        training_session=session,
+        exercise=exercise,
+        load=60,
+        repetitions=5,
+    )
+    outbox.drain_outbox()
+    statistics.refresh_from_db()
+    assert statistics.set_count == 2  # noqa: PLR2004
+    assert statistics.total_volume == 300  # noqa: PLR2004
+    assert statistics.best_load == 60  # noqa: PLR2004
+    session.refresh_from_db()
+    assert statistics.best_load_date == session.date
+
+
+@pytest.fixture
+def debounce(settings, monkeypatch):
+    try:
+        outbox.leaderboards.get_redis().ping()
+    except redis.RedisError:
+        pytest.skip("Redis is not available.")
+    settings.TRAINING_OUTBOX_KEY_PREFIX = f"test:outbox:{uuid.uuid4().hex}"
+    settings.TRAINING_OUTBOX_DEBOUNCE_SECONDS = 30
+    enqueued = []
+    monkeypatch.setattr(
+        outbox,
+        "_enqueue_user_drain",
+        lambda *args: enqueued.append(args),
+    )
+    yield enqueued
+    client = outbox.leaderboards.get_redis()
+    keys = list(client.scan_iter(f"{settings.TRAINING_OUTBOX_KEY_PREFIX}:*"))
+    if keys:
+        client.delete(*keys)
+
+
+def test_bursts_of_writes_enqueue_one_drain_per_user(
+    debounce,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    session = TrainingSessionRecordFactory.create(user=user)
+    other_session = TrainingSessionRecordFactory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        ExerciseRecordFactory.create(training_session=session)
+    with django_capture_on_commit_callbacks(execute=True):
+        ExerciseRecordFactory.create_batch(4, training_session=session)
+        ExerciseRecordFactory.create(training_session=other_session)
+    # Rolled back writes schedule nothing.
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        ExerciseRecordFactory.create(training_session=session)
+        transaction.set_rollback(True)
+
+    assert debounce == [(user.id, 30), (other_session.user_id, 30)]
+    assert outbox.drain_metrics() == {
+        outbox.SCHEDULED: 2,
+        outbox.COALESCED: 4,
+        "pending": 6,
+    }
+
+    # The drain applies the user's events only, and opens a new window.
+    assert outbox.drain_user_outbox(user.id) == 5  # noqa: PLR2004
+    assert list(OutboxEvent.objects.values_list("user_id", flat=True)) == [
+        other_session.user_id,
+    ]
+    with django_capture_on_commit_callbacks(execute=True):
+        ExerciseRecordFactory.create(training_session=session)
+    assert debounce[-1] == (user.id, 30)
+
+    out = StringIO()
+    call_command("outbox_metrics", stdout=out)
+    assert "Drains enqueued: 3" in out.getvalue()
+    assert "Writes coalesced: 4 (57%)" in out.getvalue()
@@ -0,0 +1,87 @@
+import datetime
+
+import pytest
+from django.db import connection
+
+from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.partitions import MONTH
+from la_mamadura.training.partitions import YEAR
+from la_mamadura.training.partitions import ensure_partitions
+from la_mamadura.training.partitions import existing_partitions
+from la_mamadura.training.partitions import is_partitioned
+from la_mamadura.training.partitions import iter_partition_bounds
+from la_mamadura.training.partitions import partition_bounds
+from la_mamadura.training.partitions import partition_table
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+
+def test_partition_bounds():
+    day = datetime.date(2024, 12, 15)
+    assert partition_bounds(day, MONTH) == (
+        datetime.date(2024, 12, 1),
+        datetime.date(2025, 1, 1),
+    )
+    assert partition_bounds(day, YEAR) == (
+        datetime.date(2024, 1, 1),
+        datetime.date(2025, 1, 1),
+    )
+
+
+def test_iter_partition_bounds():
+    bounds = list(
+        iter_partition_bounds(
+            datetime.date(2024, 11, 20),
+            datetime.date(2025, 1, 1),
+            MONTH,
+        ),
+    )
+    assert [start for start, _ in bounds] == [
+        datetime.date(2024, 11, 1),
+        datetime.date(2024, 12, 1),
+        datetime.date(2025, 1, 1),
+    ]
+
+
+@pytest.mark.django_db
+def test_partition_table(settings):
+    if is_partitioned():
+        pytest.skip("ExerciseRecord was already partitioned by the migrations.")
+    settings.TRAINING_EXERCISE_RECORD_PARTITIONING = MONTH
+    old_session = TrainingSessionRecordFactory.create(date=datetime.date(2023, 5, 10))
+    old = ExerciseRecordFactory.create(training_session=old_session)
+
+    assert partition_table()
+    assert is_partitioned()
+    assert not partition_table()
+
+    partitions = existing_partitions()
+    assert "training_exerciserecord_p2023_05" in partitions
+    assert "training_exerciserecord_default" in partitions
+    assert ExerciseRecord.objects.get(pk=old.pk).date == old_session.date
+
+    new = ExerciseRecordFactory.create()
+    assert new.pk > old.pk
+
+    # A set far in the future lands in the default partition until its
+    # partition is created, then it is moved there.
+    future_session = TrainingSessionRecordFactory.create(date=datetime.date(2099, 1, 2))
+    future = ExerciseRecordFactory.create(training_session=future_session)
+    created = ensure_partitions(
+        since=future_session.date,
+        until=future_session.date,
+    )
+    assert created == ["training_exerciserecord_p2099_01"]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM training_exerciserecord_p2099_01",
+        )
+        assert cursor.fetchall() == [(future.pk,)]
+
+
+@pytest.mark.django_db
+def test_ensure_partitions_noop_when_not_partitioned(settings):
+    if is_partitioned():
+        pytest.skip("ExerciseRecord was already partitioned by the migrations.")
+    settings.TRAINING_EXERCISE_RECORD_PARTITIONING = MONTH
+    assert ensure_partitions() == []
@@ -0,0 +1,107 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+
+from la_mamadura.training.performance import previous_sets
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _session(user, day, sets):
+    session = TrainingSessionRecordFactory.create(user=user, date=day)
+    for exercise, load, repetitions in sets:
+        ExerciseRecordFactory.create(
+            training_session=session,
+            exercise=exercise,
+            load=load,
+            repetitions=repetitions,
+        )
+    return session
+
+
+@pytest.fixture
+def exercises():
+    return ExerciseFactory.create_batch(2)
+
+
+def test_previous_sets_of_latest_earlier_session(
+    user,
+    exercises,
+    django_assert_num_queries,
+):
+    bench, squat = exercises
+    _session(user, datetime.date(2030, 1, 1), [(bench, 50, 10), (squat, 80, 5)])
+    _session(user, datetime.date(2030, 1, 3), [(bench, 55, 8), (bench, 55, 7)])
+    # Sets never filled in don't count as a previous performance.
+    _session(user, datetime.date(2030, 1, 4), [(bench, 0, 0)])
+    current = _session(
+        user,
+        datetime.date(2030, 1, 5),
+        [(bench, 60, 5), (squat, 0, 0)],
+    )
+    _session(user, datetime.date(2030, 1, 6), [(bench, 70, 3)])
+    TrainingSessionRecordFactory.create()
+
+    with django_assert_num_queries(2):
+        last_time = previous_sets(user.id, [bench.id, squat.id], current)
+    with django_assert_num_queries(1):
+        assert previous_sets(user.id, [bench.id, squat.id], current) == last_time
+
+    assert [(s.load, s.repetitions) for s in last_time[bench.id]] == [
+        (55, 8),
+        (55, 7),
+    ]
+    assert [(s.load, s.repetitions) for s in last_time[squat.id]] == [(80, 5)]
+    new_exercise = ExerciseFactory.create()
+    assert previous_sets(user.id, [new_exercise.id], current) == {new_exercise.id: []}
+
+
+def test_previous_sets_are_cached_per_previous_session(
+    user,
+    exercises,
+    django_assert_num_queries,
+):
+    bench, _ = exercises
+    previous = _session(user, datetime.date(2030, 1, 1), [(bench, 50, 10)])
+    current = _session(user, datetime.date(2030, 1, 2), [(bench, 0, 0)])
+    assert previous_sets(user.id, [bench.id], current)[bench.id][0].load == 50  # noqa: PLR2004
+
+    # Logging during the current session keeps the cached last time.
+    ExerciseRecordFactory.create(training_session=current, exercise=bench, load=60)
+    with django_assert_num_queries(1):
+        assert previous_sets(user.id, [bench.id], current)[bench.id][0].load == 50  # noqa: PLR2004
+
+    # Editing the previous session's sets changes its version.
+    record = previous.exercise_record.get()
+    record.load = 52
+    record.save()
+    assert previous_sets(user.id, [bench.id], current)[bench.id][0].load == 52  # noqa: PLR2004
+
+    _session(user, datetime.date(2030, 1, 1), [(bench, 54, 10)])
+    assert previous_sets(user.id, [bench.id], current)[bench.id][0].load == 54  # noqa: PLR2004
+
+
+def test_set_update_form_is_prefilled_from_last_time(client, user, exercises):
+    bench, _ = exercises
+    _session(user, datetime.date(2030, 1, 1), [(bench, 50, 10), (bench, 45, 12)])
+    current = _session(
+        user,
+        datetime.date(2030, 1, 2),
+        [(bench, 0, 0), (bench, 0, 0), (bench, 0, 0)],
+    )
+    second, third = list(current.exercise_record.order_by("id"))[1:]
+    client.force_login(user)
+
+    form = client.get(
+        reverse("training:exercise_record_update", kwargs={"pk": second.pk}),
+    ).context["form"]
+    assert (form["load"].value(), form["repetitions"].value()) == (45, 12)
+    # Sets beyond last time's repeat its final set.
+    form = client.get(
+        reverse("training:exercise_record_update", kwargs={"pk": third.pk}),
+    ).context["form"]
+    assert (form["load"].value(), form["repetitions"].value()) == (45, 12)
@@ -0,0 +1,124 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+
+from la_mamadura.training.relative import bodyweight_as_of
+from la_mamadura.training.relative import dots_score
+from la_mamadura.training.relative import relative_sets
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.training.tests.factories import WeightFactory
+from la_mamadura.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+JAN_1 = datetime.date(2026, 1, 1)
+
+
+def _day(n):
+    return JAN_1 + datetime.timedelta(days=n)
+
+
+def test_bodyweight_as_of():
+    dates = [_day(0), _day(10)]
+    weights = [80, 82]
+
+    assert bodyweight_as_of(dates, weights, _day(-1)) is None
+    assert bodyweight_as_of(dates, weights, _day(0)) == 80  # noqa: PLR2004
+    assert bodyweight_as_of(dates, weights, _day(9)) == 80  # noqa: PLR2004
+    assert bodyweight_as_of(dates, weights, _day(30)) == 82  # noqa: PLR2004
+
+
+def test_dots_score():
+    # A 100 kg lifter's DOTS coefficient is about 0.6155.
+    assert dots_score(500, 100, User.SEX_MALE) == pytest.approx(307.76, abs=0.01)
+    assert dots_score(500, 100, "") is None
+    # Bodyweights outside the formula's range are clamped.
+    assert dots_score(100, 30, User.SEX_FEMALE) == dots_score(
+        100,
+        40,
+        User.SEX_FEMALE,
+    )
+
+
+def test_relative_sets_join_the_bodyweight_of_the_day(
+    user,
+    django_assert_num_queries,
+):
+    user.sex = User.SEX_MALE
+    user.save()
+    exercise = ExerciseFactory.create()
+    WeightFactory.create(user=user, weight=80, date=_day(0))
+    WeightFactory.create(user=user, weight=100, date=_day(10))
+    for n in (-5, 5, 15):
+        ExerciseRecordFactory.create(
+            training_session=TrainingSessionRecordFactory.create(
+                user=user,
+                date=_day(n),
+            ),
+            exercise=exercise,
+            load=120,
+            repetitions=3,
+        )
+
+    # The bodyweights, the hot sets and the archived ones.
+    with django_assert_num_queries(3):
+        sets = relative_sets(user, exercise)
+    with django_assert_num_queries(0):
+        assert relative_sets(user, exercise) == sets
+
+    assert [entry.bodyweight for entry in sets] == [None, 80, 100]
+    assert [entry.relative_load for entry in sets] == [None, 1.5, 1.2]
+    assert sets[0].dots is None
+    assert sets[2].dots == pytest.approx(dots_score(120, 100, User.SEX_MALE))
+
+    # A new bodyweight invalidates the cached sets.
+    WeightFactory.create(user=user, weight=90, date=_day(12))
+    assert relative_sets(user, exercise)[2].bodyweight == 90  # noqa: PLR2004
+
+
+def test_progress_chart_shows_the_best_dots(client, user):
+    user.sex = User.SEX_FEMALE
+    user.save()
+    exercise = ExerciseFactory.create()
+    WeightFactory.create(user=user, weight=60, date=_day(0))
+    ExerciseRecordFactory.create(
+        training_session=TrainingSessionRecordFactory.create(user=user, date=_day(1)),
+        exercise=exercise,
+        load=100,
+        repetitions=1,
+    )
+    client.force_login(user)
+
+    response = client.get(
+        reverse("training:exercise_record_graph", kwargs={"id": exercise.id}),
+    )
+
+    assert response.context["best_dots"] == pytest.approx(
+        dots_score(100, 60, User.SEX_FEMALE),
+    )
+
+
+def test_no_relative_sets_without_kg(client, user, django_assert_num_queries):
+    user.sex = User.SEX_MALE
+    user.save()
+    exercise = ExerciseFactory.create(load_units="MINUTES")
+    WeightFactory.create(user=user, weight=80, date=_day(0))
+    ExerciseRecordFactory.create(
+        training_session=TrainingSessionRecordFactory.create(user=user, date=_day(1)),
+        exercise=exercise,
+        load=30,
+        repetitions=1,
+    )
+
+    with django_assert_num_queries(0):
+        assert relative_sets(user, exercise) == []
+
+    client.force_login(user)
+    response = client.get(
+        reverse("training:exercise_record_graph", kwargs={"id": exercise.id}),
+    )
+    assert response.context["relative_sets"] == []
+    assert response.context["best_dots"] is None
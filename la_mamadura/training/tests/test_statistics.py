@@ -0,0 +1,93 @@
+import datetime
+
+import pytest
+
+from la_mamadura.training.archive import archive_exercise_records
+from la_mamadura.training.models import ExerciseStatistics
+from la_mamadura.training.models import StatisticsRecomputation
+from la_mamadura.training.statistics import estimated_one_rep_max
+from la_mamadura.training.statistics import finish_recomputation
+from la_mamadura.training.statistics import recompute_chunk
+from la_mamadura.training.statistics import recompute_user_statistics
+from la_mamadura.training.statistics import start_recomputation
+from la_mamadura.training.statistics import unfinished_recomputation
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_estimated_one_rep_max():
+    assert estimated_one_rep_max(100, 1) == 100  # noqa: PLR2004
+    assert estimated_one_rep_max(100, 3) == pytest.approx(110)
+    assert estimated_one_rep_max(100, 0) == 0
+    assert estimated_one_rep_max(0, 10) == 0
+
+
+def _record(user, exercise, day, load, repetitions):
+    session = TrainingSessionRecordFactory.create(user=user, date=day)
+    return ExerciseRecordFactory.create(
+        training_session=session,
+        exercise=exercise,
+        load=load,
+        repetitions=repetitions,
+    )
+
+
+def test_recompute_includes_archived_sets(user):
+    exercise = ExerciseFactory.create()
+    _record(user, exercise, datetime.date(2020, 1, 1), 100, 5)
+    _record(user, exercise, datetime.date(2030, 1, 1), 90, 1)
+    _record(user, exercise, datetime.date(2030, 2, 1), 100, 2)
+    archive_exercise_records(before=datetime.date(2021, 1, 1))
+
+    assert recompute_user_statistics(user.pk, user.pk) == 1
+    statistics = ExerciseStatistics.objects.get(user=user, exercise=exercise)
+    assert statistics.set_count == 3  # noqa: PLR2004
+    assert statistics.total_volume == 500 + 90 + 200
+    assert statistics.best_load == 100  # noqa: PLR2004
+    assert statistics.best_load_date == datetime.date(2020, 1, 1)
+    assert statistics.best_estimated_1rm == pytest.approx(100 * (1 + 5 / 30))
+    assert statistics.first_date == datetime.date(2020, 1, 1)
+    assert statistics.last_date == datetime.date(2030, 2, 1)
+
+
+def test_recompute_replaces_stale_statistics(user):
+    exercise = ExerciseFactory.create()
+    record = _record(user, exercise, datetime.date(2030, 1, 1), 100, 5)
+    recompute_user_statistics(user.pk, user.pk)
+
+    record.delete()
+    assert recompute_user_statistics(user.pk, user.pk) == 0
+    assert not ExerciseStatistics.objects.filter(user=user).exists()
+
+
+def test_recomputation_chunks_checkpoint_and_finish():
+    users = UserFactory.create_batch(5)
+    exercise = ExerciseFactory.create()
+    for user in users:
+        _record(user, exercise, datetime.date(2030, 1, 1), 50, 10)
+
+    recomputation = start_recomputation(chunk_size=2)
+    chunks = list(recomputation.chunks.all())
+    assert [(chunk.first_user_id, chunk.last_user_id) for chunk in chunks] == [
+        (users[0].pk, users[1].pk),
+        (users[2].pk, users[3].pk),
+        (users[4].pk, users[4].pk),
+    ]
+
+    assert recompute_chunk(chunks[0].pk) == 2  # noqa: PLR2004
+    assert not finish_recomputation(recomputation.pk)
+    # An interrupted recomputation is resumed from its pending chunks.
+    assert unfinished_recomputation() == recomputation
+    assert list(recomputation.chunks.filter(done=False)) == chunks[1:]
+
+    for chunk in chunks:
+        recompute_chunk(chunk.pk)
+    assert finish_recomputation(recomputation.pk)
+    recomputation.refresh_from_db()
+    assert recomputation.status == StatisticsRecomputation.STATUS_FINISHED
+    assert ExerciseStatistics.objects.count() == len(users)
+    assert unfinished_recomputation() is None
@@ -0,0 +1,58 @@
+import pytest
+
+from la_mamadura.training.models import TrainingSessionRecord
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_summary_follows_set_writes():
+    session = TrainingSessionRecordFactory.create()
+    squat = ExerciseFactory.create()
+    first = ExerciseRecordFactory.create(
+        training_session=session,
+        exercise=squat,
+        load=100,
+        repetitions=5,
+    )
+    ExerciseRecordFactory.create(training_session=session, load=0, repetitions=0)
+
+    session.refresh_from_db()
+    assert session.set_count == 2  # noqa: PLR2004
+    assert session.exercise_count == 2  # noqa: PLR2004
+    assert session.completed_set_count == 1
+    assert session.total_volume == 500  # noqa: PLR2004
+    assert session.status == TrainingSessionRecord.STATUS_STARTED
+
+    first.delete()
+    session.refresh_from_db()
+    assert session.set_count == 1
+    assert session.total_volume == 0
+    assert session.status == TrainingSessionRecord.STATUS_PENDING
+
+
+def test_summary_follows_set_moved_between_sessions():
+    record = ExerciseRecordFactory.create(load=50, repetitions=10)
+    old_session = record.training_session
+    new_session = TrainingSessionRecordFactory.create(user=record.user)
+
+    record.training_session = new_session
+    record.save()
+
+    old_session.refresh_from_db()
+    new_session.refresh_from_db()
+    assert old_session.set_count == 0
+    assert new_session.set_count == 1
+    assert new_session.status == TrainingSessionRecord.STATUS_FINISHED
+
+
+def test_session_delete_cascades_without_refresh(django_assert_max_num_queries):
+    session = TrainingSessionRecordFactory.create()
+    ExerciseRecordFactory.create_batch(3, training_session=session)
+    # The sets' summaries aren't refreshed, only the session's calendar day,
+    # and only the session gets a sync tombstone. Each set still records its
+    # outbox event, for its exercise's statistics and leaderboards.
+    with django_assert_max_num_queries(10):
+        session.delete()
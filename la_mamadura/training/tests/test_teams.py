@@ -0,0 +1,124 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from la_mamadura.training.models import ExerciseStatistics
+from la_mamadura.training.models import Team
+from la_mamadura.training.models import TemplateAssignment
+from la_mamadura.training.models import TrainingSessionTemplate
+from la_mamadura.training.teams import team_dashboard
+from la_mamadura.training.tests.factories import ExerciseFactory
+from la_mamadura.training.tests.factories import ExerciseRecordFactory
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+# A Wednesday, the dashboard weeks start on Mondays 2 and 9.
+TODAY = datetime.date(2026, 3, 11)
+
+
+@pytest.fixture
+def template():
+    return TrainingSessionTemplate.objects.create(name="Full body")
+
+
+@pytest.fixture
+def team(user, template):
+    team = Team.objects.create(name="Club", coach=user)
+    TemplateAssignment.objects.create(team=team, template=template, sessions_per_week=2)
+    return team
+
+
+def _dashboard_queries(team):
+    with CaptureQueriesContext(connection) as queries:
+        team_dashboard(team, TODAY, weeks=2)
+    return len(queries)
+
+
+def test_dashboard_summarizes_every_athlete(team, template):
+    trained, idle = UserFactory.create_batch(2)
+    team.athletes.add(trained, idle)
+    for day in (3, 4):
+        TrainingSessionRecordFactory(
+            user=trained,
+            date=datetime.date(2026, 3, day),
+            template=template,
+        )
+    ExerciseRecordFactory(
+        training_session=TrainingSessionRecordFactory(
+            user=trained,
+            date=datetime.date(2026, 3, 10),
+        ),
+        load=100,
+        repetitions=5,
+    )
+    # Before the dashboard weeks.
+    TrainingSessionRecordFactory(user=idle, date=datetime.date(2026, 3, 1))
+    exercise = ExerciseFactory.create()
+    ExerciseStatistics.objects.create(
+        user=trained,
+        exercise=exercise,
+        best_load=100,
+        best_load_date=datetime.date(2026, 3, 10),
+        first_date=datetime.date(2025, 1, 1),
+        last_date=datetime.date(2026, 3, 10),
+    )
+    ExerciseStatistics.objects.create(
+        user=trained,
+        exercise=ExerciseFactory.create(),
+        best_load=200,
+        best_load_date=datetime.date(2025, 1, 1),
+        first_date=datetime.date(2025, 1, 1),
+        last_date=datetime.date(2025, 1, 1),
+    )
+    team.refresh_from_db()
+
+    summaries = {summary.id: summary for summary in team_dashboard(team, TODAY, 2)}
+
+    summary = summaries[trained.id]
+    assert summary.weeks == [(2, 0), (1, 500)]
+    assert summary.last_session_date == datetime.date(2026, 3, 10)
+    assert len(summary.recent_sessions) == 3  # noqa: PLR2004
+    assert summary.prs == [(exercise.name, 100, datetime.date(2026, 3, 10))]
+    # Both assigned sessions of the first week, none of the current one.
+    assert summary.adherence == 0.5  # noqa: PLR2004
+    assert summaries[idle.id].weeks == [(0, 0), (0, 0)]
+    assert summaries[idle.id].last_session_date is None
+    assert summaries[idle.id].adherence == 0
+
+
+def test_dashboard_queries_dont_grow_with_the_team(team):
+    for athlete in UserFactory.create_batch(2):
+        team.athletes.add(athlete)
+        TrainingSessionRecordFactory(user=athlete, date=TODAY)
+    team.refresh_from_db()
+    small_team_queries = _dashboard_queries(team)
+
+    for athlete in UserFactory.create_batch(10):
+        team.athletes.add(athlete)
+        TrainingSessionRecordFactory(user=athlete, date=TODAY)
+    team.refresh_from_db()
+
+    assert _dashboard_queries(team) == small_team_queries
+    # Cached until the team or one of its athletes changes, and then only the
+    # athletes are read.
+    assert _dashboard_queries(team) == 1
+    ExerciseRecordFactory(training_session__user=team.athletes.first())
+    assert _dashboard_queries(team) == small_team_queries
+
+
+def test_dashboard_is_for_the_coach_only(client, team, user):
+    url = reverse("training:team_dashboard", kwargs={"pk": team.pk})
+
+    client.force_login(UserFactory())
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    client.force_login(user)
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["team"] == team
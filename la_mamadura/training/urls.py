@@ -28,6 +28,11 @@ urlpatterns = [
         view=ExerciseRecordUpdateView.as_view(),
         name="exercise_record_update",
     ),
+    path(
+        "exercise-record/<int:pk>/set/",
+        view=views.UpdateExerciseSetFragment.as_view(),
+        name="exercise_set_update",
+    ),
     path(
         "exercise-record/",
         view=CreateExcerciseRecord.as_view(),
@@ -38,6 +43,16 @@ urlpatterns = [
         view=TrainingSessionsRecordsList.as_view(),
         name="training_records_list",
     ),
+    path(
+        "records/calendar/",
+        view=views.TrainingCalendarView.as_view(),
+        name="training_calendar",
+    ),
+    path(
+        "records/search/",
+        view=views.TrainingSessionSearch.as_view(),
+        name="training_session_search",
+    ),
     path(
         "records/create/",
         view=CreateTrainingSessionRecord.as_view(),
@@ -48,11 +63,36 @@ urlpatterns = [
         view=CreateExerciseRecordFromTrainingSession.as_view(),
         name="training_records_create_exercise",
     ),
+    path(
+        "records/<int:pk>/sets/",
+        view=views.CreateExerciseSetFragment.as_view(),
+        name="training_session_set_create",
+    ),
+    path(
+        "records/<int:pk>/events/",
+        view=views.TrainingSessionEvents.as_view(),
+        name="training_session_events",
+    ),
+    path(
+        "records/<int:pk>/exercises/<int:exercise_id>/sets/",
+        view=views.ExerciseSetsPanel.as_view(),
+        name="training_session_exercise_sets",
+    ),
     path(
         "exercises/<int:pk>/",
         view=ExerciseUpdateView.as_view(),
         name="exercises_update",
     ),
+    path(
+        "exercises/compare/",
+        view=views.ExerciseComparison.as_view(),
+        name="exercise_comparison",
+    ),
+    path(
+        "exercises/<int:pk>/leaderboard/",
+        view=views.ExerciseLeaderboard.as_view(),
+        name="exercise_leaderboard",
+    ),
     path(
         "exercises/",
         view=ExercisesListView.as_view(),
@@ -123,4 +163,14 @@ urlpatterns = [
         view=views.UpdateWeightRecord.as_view(),
         name="weight_record_update",
     ),
+    path(
+        "teams/",
+        view=views.TeamList.as_view(),
+        name="teams",
+    ),
+    path(
+        "teams/<int:pk>/",
+        view=views.TeamDashboard.as_view(),
+        name="team_dashboard",
+    ),
 ]
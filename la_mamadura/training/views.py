@@ -1,8 +1,15 @@
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Max
 from django.http import Http404
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
+from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.views.generic import (
@@ -14,25 +21,120 @@ from django.views.generic import (
     View,
 )
 from django.utils.translation import gettext_lazy as _
+from django.core.cache import cache
+from django.db.models import Count
 from django.db.models import Q
+from django.db import connection
+from django.db import transaction
 from django.utils import timezone
+from datetime import MAXYEAR
+from datetime import MINYEAR
+from datetime import date
 from datetime import timedelta
-
+import math
+
+import redis
+
+from config.db_router import ReplicaReadMixin
+from la_mamadura.training import comparison
+from la_mamadura.training import leaderboards
+from la_mamadura.training.archive import archived_session_sets
+from la_mamadura.training.archive import exercise_history
+from la_mamadura.training.archive import session_sets
+from la_mamadura.training.calendar import get_calendar
+from la_mamadura.training.catalog import cached_muscular_group_facets
+from la_mamadura.training.catalog import search_training_sessions
 from la_mamadura.training.forms import CreateExcerciseRecordForm
 from la_mamadura.training.forms import CreateExcerciseRecordFromTrainingForm
 from la_mamadura.training.forms import CreateExerciseForm
 from la_mamadura.training.forms import CreateTrainingRecordForm
 from la_mamadura.training.forms import UpdateExerciseRecord
+from la_mamadura.training.forms import UpdateExerciseSetForm
 from la_mamadura.training.forms import CreateExerciseTemplateForm
 from la_mamadura.training.forms import CreateTrainingSessionTemplateForm
 from la_mamadura.training.forms import CreateWeightRecordForm
 from la_mamadura.training.forms import CreateTrainingFromTemplateForm
+from la_mamadura.training.forms import ExerciseComparisonForm
+from la_mamadura.training.live import session_events
 from la_mamadura.training.models import Exercise
 from la_mamadura.training.models import ExerciseRecord
+from la_mamadura.training.models import Muscle
+from la_mamadura.training.models import MuscularGroup
+from la_mamadura.training.models import SubMuscle
 from la_mamadura.training.models import TrainingSessionRecord
 from la_mamadura.training.models import ExerciseTemplate
 from la_mamadura.training.models import TrainingSessionTemplate
 from la_mamadura.training.models import Weight
+from la_mamadura.training.models import Team
+from la_mamadura.training.performance import previous_sets
+from la_mamadura.training.relative import relative_sets
+from la_mamadura.training.teams import DEFAULT_WEEKS
+from la_mamadura.training.teams import dashboard_weeks
+from la_mamadura.training.teams import team_dashboard
+from la_mamadura.users.models import User
+from la_mamadura.training.summaries import refresh_session_summaries
+
+
+class TrainingCalendarView(LoginRequiredMixin, TemplateView):
+    """
+    A year of training days as a heatmap of weeks, shaded by volume, with the
+    streaks.
+    """
+
+    template_name = "training/training_calendar.html"
+    n_levels = 4
+
+    def get_year(self):
+        try:
+            year = int(self.request.GET.get("year", ""))
+        except ValueError:
+            return None
+        return year if MINYEAR <= year <= MAXYEAR else None
+
+    def get_weeks(self, calendar, start, end):
+        days = list(calendar.days(start, end))
+        max_volume = max((volume for _day, _n, volume in days), default=0)
+        # Weeks start on Monday, padded with None outside the range.
+        cells: list[dict | None] = [None] * start.weekday()
+        for day, n_sessions, volume in days:
+            level = 0
+            if n_sessions:
+                level = 1
+                if max_volume:
+                    level = max(1, math.ceil(self.n_levels * volume / max_volume))
+            cells.append(
+                {
+                    "date": day,
+                    "sessions": n_sessions,
+                    "volume": volume,
+                    "level": level,
+                },
+            )
+        cells += [None] * (-len(cells) % 7)
+        return [cells[i : i + 7] for i in range(0, len(cells), 7)]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        calendar = get_calendar(self.request.user.pk)
+        today = timezone.localdate()
+        year = self.get_year()
+        if year:
+            start = date(year, 1, 1)
+            end = date(year, 12, 31)
+        else:
+            end = today
+            start = end - timedelta(days=364)
+        first_year = calendar.first_day.year if calendar.first_day else today.year
+        context.update(
+            {
+                "year": year,
+                "years": range(today.year, first_year - 1, -1),
+                "weeks": self.get_weeks(calendar, start, end),
+                "current_streak": calendar.current_streak(today),
+                "longest_streak": calendar.longest_streak,
+            },
+        )
+        return context
 
 
 class CreateTrainingSessionRecord(LoginRequiredMixin, CreateView):
@@ -45,7 +147,7 @@ class CreateTrainingSessionRecord(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class TrainingSessionsRecordsList(LoginRequiredMixin, ListView):
+class TrainingSessionsRecordsList(LoginRequiredMixin, ReplicaReadMixin, ListView):
     template_name = "training/sessions_records.html"
 
     def get_queryset(self):
@@ -53,17 +155,90 @@ class TrainingSessionsRecordsList(LoginRequiredMixin, ListView):
             msg = f"User {self.user} not found."
             raise Http404(msg)
 
+        # Rendered from the session summary columns alone.
         return TrainingSessionRecord.objects.filter(
             user__pk=self.request.user.pk,
         ).order_by("-date")
 
     def get_context_data(self, *, object_list=..., **kwargs):
         context = super().get_context_data(object_list=object_list, **kwargs)
-        context["entries"] = self.get_queryset()
+        context["entries"] = self.object_list
 
         return context
 
 
+def exercise_status(n_entries, n_done):
+    """
+    An exercise of a session is finished once every set has load and reps.
+    """
+    if not n_done:
+        return "pending"
+    if n_done == n_entries:
+        return "finished"
+    return "started"
+
+
+def group_session_sets(exercise_records):
+    """
+    Group a session's sets by exercise, with their count and status, as the
+    exercise accordion of the session page renders them.
+    """
+    exercises: dict[Exercise, dict] = {}
+    for exercise_record in exercise_records:
+        exercise = exercise_record.exercise
+        e_record = exercises.get(exercise)
+        if not e_record:
+            exercises[exercise] = {
+                "n_entries": 1,
+                "entries": [exercise_record],
+            }
+        else:
+            exercises[exercise]["n_entries"] += 1
+            exercises[exercise]["entries"].append(exercise_record)
+
+    for exercise in exercises.values():
+        n_done = sum(
+            1 for entry in exercise["entries"] if entry.load * entry.repetitions
+        )
+        exercise["status"] = exercise_status(exercise["n_entries"], n_done)
+
+    return exercises
+
+
+def session_exercise_headers(training):
+    """
+    The session's exercises with their set count and status, from a single
+    aggregate of the hot sets plus the archived ones: the accordion headers,
+    without loading any hot set.
+    """
+    exercises = {
+        exercise: [exercise.n_entries, exercise.n_done]
+        for exercise in Exercise.objects.filter(
+            exercise_record__training_session=training,
+        ).annotate(
+            n_entries=Count("exercise_record"),
+            n_done=Count(
+                "exercise_record",
+                filter=~Q(exercise_record__load=0) & ~Q(exercise_record__repetitions=0),
+            ),
+        )
+    }
+    for exercise_record in archived_session_sets(training):
+        counts = exercises.setdefault(exercise_record.exercise, [0, 0])
+        counts[0] += 1
+        counts[1] += bool(exercise_record.load * exercise_record.repetitions)
+    return {
+        exercise: {
+            "n_entries": n_entries,
+            "status": exercise_status(n_entries, n_done),
+        }
+        for exercise, (n_entries, n_done) in sorted(
+            exercises.items(),
+            key=lambda item: item[0].name,
+        )
+    }
+
+
 class CreateExerciseRecordFromTrainingSession(LoginRequiredMixin, CreateView):
     form_class = CreateExcerciseRecordFromTrainingForm
     template_name = "training/exercise_record_from_training_form.html"
@@ -81,34 +256,15 @@ class CreateExerciseRecordFromTrainingSession(LoginRequiredMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["training"] = self.training
-        exercice_records = self.training.exercise_record.all()
-        exercises = {}
-        for exercise_record in exercice_records:
-            exercise = exercise_record.exercise
-            e_record = exercises.get(exercise)
-            if not e_record:
-                exercises[exercise] = {
-                    "n_entries": 1,
-                    "entries": [exercise_record],
-                }
-            else:
-                exercises[exercise]["n_entries"] += 1
-                exercises[exercise]["entries"].append(exercise_record)
-
-        for exercise in exercises.values():
-            status = "pending"
-            entries_values = []
-            for entry in exercise["entries"]:
-                entries_values.append(entry.load * entry.repetitions)
-
-            if any(entries_values):
-                status = "started"
-
-            if all(entries_values):
-                status = "finished"
-
-            exercise["status"] = status
-
+        # Sets load per panel, see ExerciseSetsPanel.
+        exercises = session_exercise_headers(self.training)
+        last_time = previous_sets(
+            self.request.user.id,
+            [exercise.id for exercise in exercises],
+            self.training,
+        )
+        for exercise, exercise_data in exercises.items():
+            exercise_data["last_time"] = last_time[exercise.id]
         context["exercises"] = exercises
         return context
 
@@ -119,6 +275,88 @@ class CreateExerciseRecordFromTrainingSession(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+class ExerciseSetsPanel(LoginRequiredMixin, View):
+    """
+    The sets of one exercise of a session, loaded when its accordion panel is
+    expanded. Renders are cached per session version, which changes with any
+    set of the session, and the page requests them with ``?v=<version>`` so
+    the browser can keep them too.
+    """
+
+    template_name = "training/partials/exercise_sets_panel.html"
+    cache_timeout = 60 * 60 * 24
+
+    def get(self, request, pk, exercise_id):
+        training = get_object_or_404(
+            TrainingSessionRecord.objects.only("id", "user_id", "date", "version"),
+            pk=pk,
+            user=request.user,
+        )
+        cache_key = (
+            f"training:session-panel:{training.id}:{training.version}:{exercise_id}"
+        )
+        html = cache.get(cache_key)
+        if html is None:
+            exercise = get_object_or_404(Exercise, id=exercise_id)
+            html = render_to_string(
+                self.template_name,
+                {
+                    "exercise": exercise,
+                    "entries": session_sets(training, exercise.id),
+                },
+                request=request,
+            )
+            cache.set(cache_key, html, self.cache_timeout)
+
+        response = HttpResponse(html)
+        if request.GET.get("v") == str(training.version):
+            patch_cache_control(response, private=True, max_age=self.cache_timeout)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+# Streams stay open for as long as the page, outside of any transaction.
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class TrainingSessionEvents(View):
+    """
+    Server-sent events with the set changes of a session, so every device
+    showing it updates in place. See ``la_mamadura.training.live``.
+    """
+
+    async def get(self, request, pk):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponseForbidden()
+        if not await TrainingSessionRecord.objects.filter(pk=pk, user=user).aexists():
+            raise Http404
+        # The stream only reads Redis: give the connection back to the pool
+        # rather than holding it for as long as the page is open.
+        await sync_to_async(connection.close)()
+        response = StreamingHttpResponse(
+            session_events(pk),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Tell nginx not to buffer the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class TrainingSessionSearch(LoginRequiredMixin, View):
+    """
+    The user's training sessions matching ``q``, for the session selects.
+    """
+
+    max_query_length = 50
+
+    def get(self, request):
+        query = request.GET.get("q", "").strip()[: self.max_query_length]
+        return JsonResponse(
+            {"results": search_training_sessions(request.user.pk, query)},
+        )
+
+
 class CreateExcerciseRecord(LoginRequiredMixin, CreateView):
     # Not being used, not finishing it now.
     form_class = CreateExcerciseRecordForm
@@ -128,7 +366,7 @@ class CreateExcerciseRecord(LoginRequiredMixin, CreateView):
         form = super().get_form()
         form.fields["training_session"].queryset = TrainingSessionRecord.objects.filter(
             user=self.request.user,
-        ).order_by("-date")
+        ).select_related("user")
         return form
 
     def form_valid(self, form):
@@ -139,7 +377,7 @@ class CreateExcerciseRecord(LoginRequiredMixin, CreateView):
         return super().get_success_url()
 
 
-class ExerciseRecordsGraph(LoginRequiredMixin, ListView):
+class ExerciseRecordsGraph(LoginRequiredMixin, ReplicaReadMixin, ListView):
     template_name = "training/exercise_records.html"
 
     def dispatch(self, request, *args, **kwargs):
@@ -156,23 +394,124 @@ class ExerciseRecordsGraph(LoginRequiredMixin, ListView):
             msg = f"Exercise {self.exercise} not found."
             raise Http404(msg)
 
-        return ExerciseRecord.objects.filter(
-            user__pk=self.request.user.pk,
-            exercise__id=self.exercise.id,
-        ).order_by("date")
+        # Hot and archived sets alike, see la_mamadura.training.archive.
+        return exercise_history(self.request.user, [self.exercise.id])[
+            self.exercise.id
+        ]
 
     def get_context_data(self, *, object_list=..., **kwargs):
-        qs = self.get_queryset()
         context = super().get_context_data(object_list=object_list, **kwargs)
+        entries = self.object_list
         context["exercise"] = self.exercise.name
-        context["entries"] = qs
+        context["exercise_id"] = self.exercise.id
+        context["entries"] = entries
         context["units"] = self.exercise.load_units
         context["exercises"] = Exercise.objects.all()
-        context["pr"] = qs.aggregate(Max("load")).get("load__max") if qs.exists() else 0
+        context["pr"] = max((entry.load for entry in entries), default=0)
+        context["relative_sets"] = []
+        context["best_dots"] = None
+        # Relative loads and DOTS only make sense for loads in kg.
+        if self.exercise.load_units == Exercise.LOAD_UNITS_KG:
+            context["relative_sets"] = relative_sets(self.request.user, self.exercise)
+            context["best_dots"] = max(
+                (entry.dots for entry in context["relative_sets"] if entry.dots),
+                default=None,
+            )
 
         return context
 
 
+class ExerciseComparison(LoginRequiredMixin, ReplicaReadMixin, View):
+    """
+    Aligned, downsampled progress series of several exercises, as JSON.
+    """
+
+    def get(self, request, *args, **kwargs):
+        form = ExerciseComparisonForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        data = form.cleaned_data
+        metric = data["metric"] or comparison.LOAD
+        dates, series = comparison.comparison_series(
+            request.user,
+            list(data["exercise"]),
+            metric=metric,
+            normalize=data["normalize"] or None,
+            start=data["start"],
+            end=data["end"],
+            max_points=data["points"] or comparison.DEFAULT_MAX_POINTS,
+        )
+        return JsonResponse(
+            {
+                "metric": metric,
+                "normalize": data["normalize"] or None,
+                "dates": dates,
+                "series": [
+                    {
+                        "exercise": {
+                            "id": exercise.id,
+                            "name": exercise.name,
+                            "units": exercise.load_units,
+                        },
+                        "values": values,
+                    }
+                    for exercise, values in series
+                ],
+            },
+        )
+
+
+class ExerciseLeaderboard(LoginRequiredMixin, TemplateView):
+    template_name = "training/exercise_leaderboard.html"
+    board_labels = {
+        leaderboards.LOAD: _("Best load"),
+        leaderboards.E1RM: _("Estimated 1RM"),
+        f"{leaderboards.LOAD}{leaderboards.RELATIVE_SUFFIX}": _(
+            "Best load / bodyweight",
+        ),
+        f"{leaderboards.E1RM}{leaderboards.RELATIVE_SUFFIX}": _(
+            "Estimated 1RM / bodyweight",
+        ),
+    }
+
+    def get_boards(self, exercise, n=10):
+        user_id = self.request.user.id
+        boards = []
+        for board in leaderboards.exercise_boards(exercise.load_units):
+            label = self.board_labels[board]
+            rank, score = leaderboards.rank(exercise.id, user_id, board)
+            boards.append(
+                {
+                    "label": label,
+                    "relative": board.endswith(leaderboards.RELATIVE_SUFFIX),
+                    "top": leaderboards.top(exercise.id, board, n),
+                    "rank": rank,
+                    "score": score,
+                },
+            )
+
+        users = User.objects.in_bulk(
+            {user_id for board in boards for user_id, _score in board["top"]},
+        )
+        for board in boards:
+            board["top"] = [
+                (position, users.get(user_id), score)
+                for position, (user_id, score) in enumerate(board["top"], 1)
+            ]
+        return boards
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        exercise = get_object_or_404(Exercise, pk=kwargs.get("pk"))
+        context["exercise"] = exercise
+        try:
+            context["boards"] = self.get_boards(exercise)
+        except redis.RedisError:
+            context["boards"] = None
+        return context
+
+
 class ExerciseRecordUpdateView(LoginRequiredMixin, UpdateView):
     form_class = UpdateExerciseRecord
     template_name = "training/update_exercise_record_form.html"
@@ -184,6 +523,35 @@ class ExerciseRecordUpdateView(LoginRequiredMixin, UpdateView):
         self.exercise_record = get_object_or_404(ExerciseRecord, pk=kwargs.get("pk"))
         return super().dispatch(request, *args, **kwargs)
 
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        form.fields["training_session"].queryset = TrainingSessionRecord.objects.filter(
+            user_id=self.exercise_record.user_id,
+        ).select_related("user")
+        return form
+
+    def get_initial(self):
+        initial = super().get_initial()
+        exercise_record = self.exercise_record
+        if exercise_record.load or exercise_record.repetitions:
+            return initial
+
+        # A set created from a template: pre-fill the same set of last time.
+        last_time = previous_sets(
+            exercise_record.user_id,
+            [exercise_record.exercise_id],
+            exercise_record.training_session,
+        )[exercise_record.exercise_id]
+        if last_time:
+            position = ExerciseRecord.objects.filter(
+                training_session_id=exercise_record.training_session_id,
+                exercise_id=exercise_record.exercise_id,
+                id__lt=exercise_record.id,
+            ).count()
+            previous = last_time[min(position, len(last_time) - 1)]
+            initial.update(load=previous.load, repetitions=previous.repetitions)
+        return initial
+
     def get_success_url(self):
         return reverse(
             "training:training_records_create_exercise",
@@ -191,6 +559,98 @@ class ExerciseRecordUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
+class ExerciseSetFragmentMixin(View):
+    """
+    Answers a single set create/update from the session page with just the
+    affected exercise's accordion item, or its data as JSON when the client
+    prefers it, instead of a redirect and a full page load.
+    """
+
+    fragment_template_name = "training/partials/exercise_accordion_item.html"
+
+    def wants_json(self):
+        preferred = self.request.get_preferred_type(["text/html", "application/json"])
+        return preferred == "application/json"
+
+    def render_fragment(self, training, exercise, status=200):
+        exercise_data = group_session_sets(session_sets(training, exercise.id)).get(
+            exercise,
+            {"n_entries": 0, "entries": [], "status": "pending"},
+        )
+        exercise_data["last_time"] = previous_sets(
+            training.user_id,
+            [exercise.id],
+            training,
+        )[exercise.id]
+
+        if self.wants_json():
+            return JsonResponse(
+                {
+                    "exercise": {
+                        "id": exercise.id,
+                        "name": exercise.name,
+                        "load_units": exercise.load_units,
+                    },
+                    "n_entries": exercise_data["n_entries"],
+                    "status": exercise_data["status"],
+                    "entries": [
+                        {
+                            "id": entry.id,
+                            "load": entry.load,
+                            "repetitions": entry.repetitions,
+                            "notes": entry.notes,
+                            "archived": entry.archived,
+                        }
+                        for entry in exercise_data["entries"]
+                    ],
+                },
+                status=status,
+            )
+        html = render_to_string(
+            self.fragment_template_name,
+            {"exercise": exercise, "exercise_data": exercise_data},
+            request=self.request,
+        )
+        return HttpResponse(html, status=status)
+
+    def fragment_form_invalid(self, form):
+        if self.wants_json():
+            return JsonResponse({"errors": form.errors}, status=400)
+        return HttpResponse(form.errors.as_ul(), status=400)
+
+
+class CreateExerciseSetFragment(LoginRequiredMixin, ExerciseSetFragmentMixin, View):
+    def post(self, request, pk):
+        training = get_object_or_404(TrainingSessionRecord, pk=pk, user=request.user)
+        form = CreateExcerciseRecordFromTrainingForm(request.POST)
+        if not form.is_valid():
+            return self.fragment_form_invalid(form)
+
+        form.instance.user = request.user
+        form.instance.date = training.date
+        form.instance.training_session = training
+        exercise_record = form.save()
+        return self.render_fragment(training, exercise_record.exercise, status=201)
+
+
+class UpdateExerciseSetFragment(LoginRequiredMixin, ExerciseSetFragmentMixin, View):
+    def post(self, request, pk):
+        exercise_record = get_object_or_404(
+            ExerciseRecord.objects.select_related("training_session", "exercise"),
+            pk=pk,
+            user=request.user,
+        )
+        form = UpdateExerciseSetForm(request.POST, instance=exercise_record)
+        if not form.is_valid():
+            return self.fragment_form_invalid(form)
+
+        form.save()
+        return self.render_fragment(
+            exercise_record.training_session,
+            exercise_record.exercise,
+        )
+
+
 class ExerciseUpdateView(LoginRequiredMixin, UpdateView):
     form_class = CreateExerciseForm
     template_name = "training/exercise_update_form.html"
@@ -211,13 +671,31 @@ class ExerciseUpdateView(LoginRequiredMixin, UpdateView):
 
 class ExercisesListView(LoginRequiredMixin, ListView):
     template_name = "training/exercises_list.html"
+    body_area_models = {
+        "submuscle": SubMuscle,
+        "muscle": Muscle,
+        "muscular_group": MuscularGroup,
+    }
+
+    def get_body_area(self):
+        for param, model in self.body_area_models.items():
+            pk = self.request.GET.get(param)
+            if pk and pk.isdigit():
+                return get_object_or_404(model, pk=pk)
+        return None
 
     def get_queryset(self):
-        return Exercise.objects.all().order_by("name")
+        qs = Exercise.objects.all().order_by("name")
+        self.body_area = self.get_body_area()
+        if self.body_area is not None:
+            qs = qs.targeting(self.body_area)
+        return qs
 
     def get_context_data(self, *, object_list=..., **kwargs):
         context = super().get_context_data(object_list=object_list, **kwargs)
-        context["entries"] = self.get_queryset()
+        context["entries"] = self.object_list
+        context["body_area"] = self.body_area
+        context["muscular_groups"] = cached_muscular_group_facets()
 
         return context
 
@@ -240,10 +718,13 @@ class CreateExerciseTemplate(LoginRequiredMixin, CreateView):
     form_class = CreateExerciseTemplateForm
     template_name = "training/exercise_template_create_form.html"
 
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), "user": self.request.user}
+
     def form_valid(self, form):
         response = super().form_valid(form)
         messages.success(
-            self.request, message=_("Exercise Template created succesfully!")
+            self.request, message=_("Exercise Template created succesfully!"),
         )
 
         return response
@@ -260,17 +741,20 @@ class UpdateExerciseTemplate(LoginRequiredMixin, UpdateView):
     template_name = "training/exercise_template_create_form.html"
     model = ExerciseTemplate
 
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), "user": self.request.user}
+
     def form_valid(self, form):
         response = super().form_valid(form)
         messages.success(
-            self.request, message=_("Exercise Template updated succesfully!")
+            self.request, message=_("Exercise Template updated succesfully!"),
         )
 
         return response
 
     def get_success_url(self):
         return reverse(
-            "training:exercise_templates_update", kwargs={"pk": self.object.pk}
+            "training:exercise_templates_update", kwargs={"pk": self.object.pk},
         )
 
 
@@ -288,14 +772,14 @@ class CreateTrainingSessionTemplate(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         response = super().form_valid(form)
         messages.success(
-            self.request, message=_("Exercise Template created succesfully!")
+            self.request, message=_("Exercise Template created succesfully!"),
         )
 
         return response
 
     def get_success_url(self):
         return reverse(
-            "training:training_session_templates_update", kwargs={"pk": self.object.pk}
+            "training:training_session_templates_update", kwargs={"pk": self.object.pk},
         )
 
 
@@ -308,14 +792,14 @@ class UpdateTrainingSessionTemplate(LoginRequiredMixin, UpdateView):
     def form_valid(self, form):
         response = super().form_valid(form)
         messages.success(
-            self.request, message=_("Training Session Template updated succesfully!")
+            self.request, message=_("Training Session Template updated succesfully!"),
         )
 
         return response
 
     def get_success_url(self):
         return reverse(
-            "training:training_session_templates_update", kwargs={"pk": self.object.pk}
+            "training:training_session_templates_update", kwargs={"pk": self.object.pk},
         )
 
 
@@ -336,27 +820,36 @@ class TemplatesView(LoginRequiredMixin, TemplateView):
 class CreateTrainingRecordFromTemplate(LoginRequiredMixin, FormView):
     template_name = "training/create_training_from_template.html"
 
-    def create_training_from_template(self):
-        training_session = TrainingSessionRecord.objects.create(user=self.request.user)
+    def create_training_from_template(self, template: TrainingSessionTemplate):
+        training_session = TrainingSessionRecord.objects.create(
+            user=self.request.user, template=template,
+        )
 
         return training_session
 
     def create_exercise_records_from_template(
-        self, template: TrainingSessionTemplate, training_session: TrainingSessionRecord
+        self,
+        template: TrainingSessionTemplate,
+        training_session: TrainingSessionRecord,
     ):
-        for exercise in template.exercise_template.all():
-            for i in range(exercise.sets):
-                ExerciseRecord.objects.create(
-                    user=training_session.user,
-                    exercise=exercise.exercise,
-                    repetitions=0,
-                    load=0,
-                    training_session=training_session,
-                )
+        ExerciseRecord.objects.bulk_create(
+            ExerciseRecord(
+                user=training_session.user,
+                date=training_session.date,
+                exercise_id=exercise.exercise_id,
+                repetitions=0,
+                load=0,
+                training_session=training_session,
+            )
+            for exercise in template.exercise_template.all()
+            for _ in range(exercise.sets)
+        )
+        # bulk_create skips the signals keeping the summary up to date.
+        refresh_session_summaries([training_session.pk])
 
     def get_form(self):
         return CreateTrainingFromTemplateForm(
-            user=self.request.user, **self.get_form_kwargs()
+            user=self.request.user, **self.get_form_kwargs(),
         )
 
     def get_success_url(self):
@@ -367,13 +860,13 @@ class CreateTrainingRecordFromTemplate(LoginRequiredMixin, FormView):
 
     def form_valid(self, form):
         template = form.cleaned_data.get("template")
-        training_session = self.create_training_from_template()
+        training_session = self.create_training_from_template(template)
         self.create_exercise_records_from_template(
-            template=template, training_session=training_session
+            template=template, training_session=training_session,
         )
         self.training_session_id = training_session.id
         messages.success(
-            self.request, message=_("Training Session created succesfully!")
+            self.request, message=_("Training Session created succesfully!"),
         )
 
         return super().form_valid(form)
@@ -397,7 +890,7 @@ class GetOrCreateLatestTrainigRecord(LoginRequiredMixin, View):
         )
 
 
-class WeightRecordGraph(LoginRequiredMixin, ListView):
+class WeightRecordGraph(LoginRequiredMixin, ReplicaReadMixin, ListView):
     template_name = "training/weight_records.html"
 
     def get_queryset(self):
@@ -445,3 +938,44 @@ class UpdateWeightRecord(LoginRequiredMixin, UpdateView):
 
     def get_success_url(self):
         return reverse("training:weight_record_graph")
+
+
+class TeamList(LoginRequiredMixin, ListView):
+    template_name = "training/teams.html"
+    context_object_name = "teams"
+
+    def get_queryset(self):
+        assert self.request.user.is_authenticated  # type guard
+        return Team.objects.filter(coach=self.request.user).annotate(
+            n_athletes=Count("athletes"),
+        )
+
+
+class TeamDashboard(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    """
+    The recent sessions, weekly volume, PRs and template adherence of every
+    athlete of one of the coach's teams. See ``la_mamadura.training.teams``.
+    """
+
+    template_name = "training/team_dashboard.html"
+    max_weeks = 12
+
+    def get_n_weeks(self):
+        weeks = self.request.GET.get("weeks", "")
+        if weeks.isdigit() and 1 <= int(weeks) <= self.max_weeks:
+            return int(weeks)
+        return DEFAULT_WEEKS
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        team = get_object_or_404(Team, pk=self.kwargs["pk"], coach=self.request.user)
+        today = timezone.localdate()
+        n_weeks = self.get_n_weeks()
+        context.update(
+            {
+                "team": team,
+                "weeks": dashboard_weeks(today, n_weeks),
+                "athletes": team_dashboard(team, today, n_weeks),
+            },
+        )
+        return context
@@ -0,0 +1,47 @@
+from django.core.exceptions import ValidationError
+from django.forms import Select
+from django.forms.models import ModelChoiceIterator
+
+
+class RemoteSearchSelect(Select):
+    """
+    Select of a ``ModelChoiceField`` rendering only the selected option, for
+    tables too big to list. The other options are searched for at
+    ``search_url`` as the user types (see ``static/js/project.js``), which
+    answers ``{"results": [{"id": ..., "text": ...}]}`` for a ``q``.
+    """
+
+    def __init__(self, search_url, attrs=None):
+        super().__init__(attrs)
+        self.search_url = search_url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-search-url"] = str(self.search_url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        assert isinstance(iterator, ModelChoiceIterator)  # type guard
+        # An invalid bound form is rendered with whatever was submitted, so
+        # the values that aren't pks are left out.
+        pk_field = iterator.queryset.model._meta.pk  # noqa: SLF001
+        selected = []
+        for pk in value:
+            try:
+                selected.append(pk_field.to_python(pk))
+            except ValidationError:
+                continue
+        choices = []
+        if iterator.field.empty_label is not None:
+            choices.append(("", iterator.field.empty_label))
+        if selected:
+            choices.extend(
+                (obj.pk, iterator.field.label_from_instance(obj))
+                for obj in iterator.queryset.filter(pk__in=selected)
+            )
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
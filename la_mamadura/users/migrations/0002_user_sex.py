@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='sex',
+            field=models.CharField(blank=True, choices=[('M', 'Male'), ('F', 'Female')], help_text='Picks the coefficients of the DOTS strength score.', max_length=1, verbose_name='Sex'),
+        ),
+    ]
@@ -22,6 +22,15 @@ class User(AbstractUser):
     last_name = None  # type: ignore[assignment]
     email = EmailField(_("email address"), unique=True)
     username = None  # type: ignore[assignment]
+    SEX_MALE = "M"
+    SEX_FEMALE = "F"
+    sex = CharField(
+        _("Sex"),
+        max_length=1,
+        choices=[(SEX_MALE, _("Male")), (SEX_FEMALE, _("Female"))],
+        blank=True,
+        help_text=_("Picks the coefficients of the DOTS strength score."),
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
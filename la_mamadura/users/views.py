@@ -21,7 +21,7 @@ user_detail_view = UserDetailView.as_view()
 
 class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = User
-    fields = ["name"]
+    fields = ["name", "sex"]
     success_message = _("Information successfully updated")
 
     def get_success_url(self) -> str:
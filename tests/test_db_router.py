@@ -0,0 +1,106 @@
+import time
+
+import pytest
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.views import View
+
+from config.db_router import PRIMARY_COOKIE_NAME
+from config.db_router import PrimaryReplicaRouter
+from config.db_router import ReplicaReadMixin
+from config.db_router import ReplicaStickinessMiddleware
+from config.db_router import read_from_replica
+from la_mamadura.training.tests.factories import TrainingSessionRecordFactory
+from la_mamadura.users.tests.factories import UserFactory
+
+router = PrimaryReplicaRouter()
+
+
+class ReadAliasView(ReplicaReadMixin, View):
+    def get(self, request):
+        return HttpResponse(router.db_for_read(None))
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+def test_reads_go_to_primary_by_default():
+    assert router.db_for_read(None) == "default"
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+def test_replica_reads_and_primary_writes():
+    with read_from_replica():
+        assert router.db_for_read(None) == "replica1"
+        assert router.db_for_write(None) == "default"
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+def test_one_replica_per_block():
+    for _ in range(10):
+        with read_from_replica():
+            assert len({router.db_for_read(None) for _ in range(10)}) == 1
+
+
+@override_settings(DATABASE_REPLICAS=[])
+def test_without_replicas_reads_stay_on_primary():
+    with read_from_replica():
+        assert router.db_for_read(None) == "default"
+
+
+def test_only_primary_is_migrated():
+    assert router.allow_migrate("default", "training")
+    assert not router.allow_migrate("replica1", "training")
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+def test_mixin_reads_from_replica(rf: RequestFactory):
+    response = ReadAliasView.as_view()(rf.get("/"))
+    assert response.content == b"replica1"
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+def test_mixin_is_pinned_to_primary_after_a_write(rf: RequestFactory):
+    request = rf.get("/")
+    request.COOKIES[PRIMARY_COOKIE_NAME] = str(time.time() + 10)
+    assert ReadAliasView.as_view()(request).content == b"default"
+
+    request.COOKIES[PRIMARY_COOKIE_NAME] = str(time.time() - 10)
+    assert ReadAliasView.as_view()(request).content == b"replica1"
+
+
+def test_mixin_views_skip_the_request_transaction():
+    assert "default" in ReadAliasView.as_view()._non_atomic_requests  # noqa: SLF001
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], DATABASE_REPLICA_STICKY_SECONDS=5)
+def test_stickiness_middleware_pins_after_unsafe_requests(rf: RequestFactory):
+    middleware = ReplicaStickinessMiddleware(lambda request: HttpResponse())
+
+    assert PRIMARY_COOKIE_NAME not in middleware(rf.get("/")).cookies
+    cookie = middleware(rf.post("/")).cookies[PRIMARY_COOKIE_NAME]
+    assert cookie["max-age"] == 5  # noqa: PLR2004
+    assert float(cookie.value) > time.time()
+
+
+# The mirror alias has a connection of its own: it only sees committed rows.
+@pytest.mark.django_db(transaction=True, databases=["default", "replica1"])
+@override_settings(DATABASE_REPLICAS=["replica1"])
+def test_replica_views_query_the_replica(client):
+    user = UserFactory()
+    session = TrainingSessionRecordFactory(user=user)
+    client.force_login(user)
+
+    with (
+        CaptureQueriesContext(connections["default"]) as primary,
+        CaptureQueriesContext(connections["replica1"]) as replica,
+    ):
+        response = client.get(reverse("training:training_records_list"))
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert list(response.context["entries"]) == [session]
+    assert len(replica) > 0
+    # Only the session and user lookups of the middlewares.
+    assert all("training_" not in query["sql"] for query in primary)